@@ -1,31 +1,42 @@
+import csv
+import json
+import os
 from abc import ABC, abstractmethod
-from typing import List
-from citas import Cita
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from citas import Cita, parsear_fecha_hora
 from paciente import Paciente
+from almacen_citas import AlmacenCitas
+from conflictos_citas import MotorConflictos
+from huecos_citas import MapaOcupacion
+from archivo_citas import ArchivoCitas
+from triaje import ColaTriaje
 
 class CitaPresencial(Cita):
 
     """ Clase que hereada directamente de la clase abstracta Cita dentro de
     nuestra base de datos """
 
-    def __init__(self, id_cita: int, paciente: Paciente, medico : str, fecha : str, hora: str, centro: str):
+    __slots__ = ('centro',)
+
+    def __init__(self, id_cita: int, paciente: Paciente, medico : str, fecha_hora: Union[str, datetime], motivo: str, centro: str):
 
         """ Parámetros:
             -----------
              - Id_cita -> Id unico que identifica cada cita pedida
              - Paciente -> El paciente que pide o recibe esta cita
              - medico -> Medico asociado a dicha cita
-             - fecha -> Fecha de la cita
-             - hora -> Hora de la cita
+             - fecha_hora -> Fecha y hora de la cita ('YYYY MM DD HH:MM' o un datetime)
+             - motivo -> Motivo de la cita
              - centro -> Centro de la cita
         """
 
-        super().__init__(id_cita, paciente, medico,fecha,hora)
+        super().__init__(id_cita, paciente, medico, fecha_hora, motivo)
         self.centro = centro
 
     def cancelar_cita(self) -> str:
         self.estado = 'Cancelada'
-        return f'La cita presencial {self.id_cita} el dia {self.fecha} en el centro{self.centro} y ha sido cancelada'
+        return f'La cita presencial {self.id_cita} el dia {self.fecha_hora_dt:%Y-%m-%d} en el centro{self.centro} y ha sido cancelada'
 
     def ser_atendido(self):
         self.atendido = True
@@ -36,19 +47,21 @@ class CitaTelefonica(Cita):
 
     """ Clase que hereda directamente de la clase abstracta Cita dentro de la base de datos creada"""
 
-    def __init__(self, id_cita: int, paciente: Paciente, medico: str, fecha: str, hora: str, telefono_contacto: str):
+    __slots__ = ('telefono_contacto',)
+
+    def __init__(self, id_cita: int, paciente: Paciente, medico: str, fecha_hora: Union[str, datetime], motivo: str, telefono_contacto: str):
 
         """ Parametros:
             -----------
              - Id_cita -> Id unico que identifica cada cita pedida
              - Paciente -> El paciente que pide o recibe esta cita
              - medico -> Medico asociado a dicha cita
-             - fecha -> Fecha de la cita
-             - hora -> Hora de la cita
+             - fecha_hora -> Fecha y hora de la cita ('YYYY MM DD HH:MM' o un datetime)
+             - motivo -> Motivo de la cita
              - telefono_contacto -> Telefono de contacto para la llamada
 
         """
-        super().__init__(id_cita, paciente, medico, fecha, hora)
+        super().__init__(id_cita, paciente, medico, fecha_hora, motivo)
         self.telefono_contacto = telefono_contacto
 
     def cancelar_cita(self) -> str:
@@ -66,18 +79,20 @@ class CitaUrgencias(Cita):
     """ Esta nueva clase vuelve a heredar de la clase base Cita (creada en la base de datos)
     pero en este caso se representan las citas de urgencias dentro del hospital """
 
-    def __init__(self, id_cita: int, paciente: Paciente, medico: str, fecha: str, hora: str, nivel_prioridad: str):
+    __slots__ = ('nivel_prioridad',)
+
+    def __init__(self, id_cita: int, paciente: Paciente, medico: str, fecha_hora: Union[str, datetime], motivo: str, nivel_prioridad: str):
 
         """ Parametros:
             -----------
              - Id_cita -> Id unico que identifica cada cita pedida
              - Paciente -> El paciente que pide o recibe esta cita
              - medico -> Medico asociado a dicha cita
-             - fecha -> Fecha de la cita
-             - hora -> Hora de la cita
+             - fecha_hora -> Fecha y hora de la cita ('YYYY MM DD HH:MM' o un datetime)
+             - motivo -> Motivo de la cita
              - nivel_prioridad -> Nivel de la urgencia
              """
-        super().__init__(id_cita, paciente, medico, fecha, hora)
+        super().__init__(id_cita, paciente, medico, fecha_hora, motivo)
         self.nivel_prioridad = nivel_prioridad
 
     def cancelar_cita(self) -> str:
@@ -90,13 +105,62 @@ class CitaUrgencias(Cita):
         return f'El paciente {self.paciente.nombre} esta siendo atendido de urgencia debido a que su prioridad es {self.nivel_prioridad}'
 
 
+# Tipo de cita en el fichero de importación -> (clase, columna con el dato propio de ese tipo)
+TIPOS_CITA = {
+    'presencial': (CitaPresencial, 'centro'),
+    'telefonica': (CitaTelefonica, 'telefono_contacto'),
+    'urgencias': (CitaUrgencias, 'nivel_prioridad'),
+}
+
+
+def leer_filas_citas(ruta: str, formato: Optional[str] = None) -> Iterator[dict]:
+
+    """ Lee un fichero CSV (con cabecera) o JSONL fila a fila, sin cargarlo entero en memoria.
+    Si no se indica el formato se deduce de la extensión """
+
+    formato = formato or os.path.splitext(ruta)[1].lstrip('.').lower()
+    with open(ruta, encoding='utf-8', newline='') as fichero:
+        if formato == 'csv':
+            yield from csv.DictReader(fichero)
+        elif formato in ('jsonl', 'ndjson'):
+            for linea in fichero:
+                if linea.strip():
+                    yield json.loads(linea)
+        else:
+            raise ValueError(f'Formato de importación no soportado: {formato}')
+
+
+def crear_cita_desde_fila(fila: dict, pacientes: Optional[Dict] = None) -> Cita:
+
+    """ Construye la cita del tipo indicado en la fila. La fecha se convierte con parsear_fecha_hora, que evita
+    strptime y reutiliza el resultado para horas repetidas.
+
+    Columnas: tipo (presencial, telefonica o urgencias), id_cita, paciente, medico, fecha_hora ('YYYY MM DD HH:MM'),
+    motivo y la columna propia del tipo (centro, telefono_contacto o nivel_prioridad). Si se pasa `pacientes`,
+    el valor de la columna paciente se usa como clave para obtener el objeto Paciente """
+
+    tipo = str(fila['tipo']).strip().lower()
+    if tipo not in TIPOS_CITA:
+        raise ValueError(f'Tipo de cita no válido: {fila["tipo"]}')
+    clase, columna_extra = TIPOS_CITA[tipo]
+    id_cita = fila['id_cita']
+    if isinstance(id_cita, str) and id_cita.isdigit():
+        id_cita = int(id_cita)
+    paciente = fila['paciente']
+    if pacientes is not None:
+        paciente = pacientes.get(paciente, paciente)
+    fecha_hora = parsear_fecha_hora(fila['fecha_hora'])
+    return clase(id_cita=id_cita, paciente=paciente, medico=fila['medico'], fecha_hora=fecha_hora,
+                 motivo=fila.get('motivo', ''), **{columna_extra: fila.get(columna_extra)})
+
+
 class GestorCitas:
 
     """
         Gestiona la creación, almacenamiento y control de citas médicas.
         """
 
-    def __init__(self):
+    def __init__(self, rechazar_solapamientos: bool = False):
         """
         Inicializa un nuevo gestor de citas.
 
@@ -113,39 +177,174 @@ class GestorCitas:
                 - centro -> Centro de la cita
                 - telefono_contacto -> Telefono de contacto para la llamada
                 - nivel_prioridad: Nivel de la urgencia (aplicable a citas de urgencias).
+        almacen : AlmacenCitas
+            Almacén indexado por id_cita, médico, paciente y día en el que se guardan las citas.
+        conflictos : MotorConflictos
+            Agendas ordenadas por médico para detectar solapamientos en O(log n).
+        ocupacion : MapaOcupacion
+            Máscaras de huecos ocupados por médico y día, para buscar huecos libres.
+        archivo : ArchivoCitas
+            Citas cerradas congeladas en columnas de NumPy para los informes.
+        triaje : ColaTriaje
+            Cola de prioridad de los pacientes con cita de urgencias pendientes de atender.
+        rechazar_solapamientos : bool
+            Si es True, añadir_cita rechaza las citas que se solapan con otra del mismo médico.
         """
 
-        self.lista_citas: List[Cita] = []
+        self.almacen = AlmacenCitas()
+        self.conflictos = MotorConflictos()
+        self.ocupacion = MapaOcupacion()
+        self.archivo = ArchivoCitas()
+        self.triaje = ColaTriaje()
+        self.rechazar_solapamientos = rechazar_solapamientos
+
+    @property
+    def lista_citas(self) -> List[Cita]:
+
+        """ Lista de las citas en orden de inserción (se construye a partir del almacén) """
+
+        return list(self.almacen)
 
     def añadir_cita(self, cita:Cita) -> None:
 
-        """ Añade una nueva cita"""
+        """ Añade una nueva cita. Si el gestor rechaza solapamientos, lanza ValueError cuando el médico ya
+        tiene una cita que choca con ella """
+
+        if self.rechazar_solapamientos:
+            id_conflicto = self.conflictos.conflicto(cita.medico, cita.fecha_hora_dt)
+            if id_conflicto is not None:
+                raise ValueError(f'La cita {cita.id_cita} se solapa con la cita {id_conflicto} del médico {cita.medico}')
+        self.almacen.añadir(cita)
+        self.conflictos.registrar(cita)
+        self.ocupacion.registrar(cita)
+        # Solo se encolan pacientes como objeto (las importaciones pueden traer solo su identificador)
+        if isinstance(cita, CitaUrgencias) and hasattr(cita.paciente, 'id') and cita.paciente not in self.triaje:
+            self.triaje.añadir(cita.paciente, cita)
 
-        self.lista_citas.append(cita)
+    def importar_citas(self, ruta: str, formato: Optional[str] = None, pacientes: Optional[Dict] = None) -> int:
+
+        """ Importa citas de un fichero CSV o JSONL leyéndolo fila a fila y las añade al gestor.
+        Devuelve el número de citas importadas """
+
+        importadas = 0
+        for fila in leer_filas_citas(ruta, formato):
+            self.añadir_cita(crear_cita_desde_fila(fila, pacientes))
+            importadas += 1
+        return importadas
+
+    def buscar_cita(self, id_cita: int):
+
+        """ Devuelve la cita con ese ID o None si no existe """
+
+        return self.almacen.obtener(id_cita)
 
     def cancelar_cita(self, id_cita : int) -> str:
 
         """ Cancela una cita dependiendo de su ID """
 
-        for cita in self.lista_citas:
-            if cita.id_cita == id_cita:
-                return cita.cancelar_cita()
-        return 'Cita no encontrada'
+        cita = self.almacen.obtener(id_cita)
+        if cita is None:
+            return 'Cita no encontrada'
+        if not cita.cancelada:
+            self.conflictos.retirar(cita)
+            self.ocupacion.retirar(cita)
+        self._salir_de_triaje(cita)
+        return cita.cancelar_cita()
+
+    def archivar_citas(self, hasta: Optional[datetime] = None) -> int:
+
+        """ Mueve al archivo en columnas las citas cerradas (atendidas o canceladas), opcionalmente solo las
+        anteriores a `hasta`. Las citas pendientes siguen en el almacén. Devuelve el número de citas archivadas """
+
+        cerradas = [cita for cita in self.almacen
+                    if (cita.atendido or cita.cancelada) and (hasta is None or cita.fecha_hora_dt < hasta)]
+        self.archivo.añadir(cerradas)
+        for cita in cerradas:
+            self.almacen.eliminar(cita.id_cita)
+            if not cita.cancelada:
+                self.conflictos.retirar(cita)
+                self.ocupacion.retirar(cita)
+        return len(cerradas)
 
     def atender_cita(self, id_cita: int) -> str:
 
         """ Marca que una cita ha sido atentdida dependiendo de su id"""
 
-        for cita in self.lista_citas:
-            if cita.id_cita == id_cita:
-                return cita.ser_atendido()
-        return 'Cita no encontrada'
+        cita = self.almacen.obtener(id_cita)
+        if cita is None:
+            return 'Cita no encontrada'
+        self._salir_de_triaje(cita)
+        return cita.ser_atendido()
+
+    def _salir_de_triaje(self, cita: Cita) -> None:
+
+        """ Quita al paciente de la cola de triaje si estaba esperando por esta cita de urgencias """
+
+        if isinstance(cita, CitaUrgencias) and hasattr(cita.paciente, 'id'):
+            entrada = self.triaje.entradas.get(cita.paciente.id)
+            if entrada is not None and entrada.cita is cita:
+                self.triaje.retirar(cita.paciente)
+
+    def siguiente_urgencia(self):
+
+        """ Saca de la cola de triaje al siguiente paciente de urgencias (mayor prioridad y, a igualdad,
+        el que llegó antes). Devuelve su EntradaTriaje o None si no hay nadie esperando """
+
+        return self.triaje.sacar_siguiente()
+
+    def hay_solapamiento(self, medico, fecha_hora: datetime) -> bool:
+
+        """ Indica si un hueco de 30 minutos que empieza en fecha_hora choca con la agenda del médico """
+
+        return self.conflictos.conflicto(medico, fecha_hora) is not None
+
+    def citas_solapadas(self, medico=None) -> List[Tuple[int, int]]:
+
+        """ Devuelve los pares de IDs de citas solapadas de un médico (o de todos) para el barrido de consistencia """
+
+        return self.conflictos.pares_solapados(medico)
+
+    def proximos_huecos(self, medico=None, especialidad: Optional[str] = None, medicos: Iterable = (),
+                        desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                        n: int = 5) -> List[Tuple[object, datetime]]:
+
+        """ Devuelve los n primeros huecos libres de 30 minutos de un médico, o de cualquiera de los médicos
+        de `medicos` con la especialidad indicada, entre `desde` (por defecto ahora) y `hasta`
+        (por defecto una semana después). Cada elemento es (id del médico, inicio del hueco) """
+
+        desde = desde if desde is not None else datetime.now()
+        hasta = hasta if hasta is not None else desde + timedelta(days=7)
+        if medico is not None:
+            candidatos = [medico]
+        elif especialidad is not None:
+            candidatos = [m for m in medicos if getattr(m, 'especialidad', '').lower() == especialidad.lower()]
+        else:
+            raise ValueError('Debe indicar un médico o una especialidad')
+        return self.ocupacion.proximos_huecos(candidatos, desde, hasta, n)
+
+    def citas_de_medico(self, medico) -> List[Cita]:
+
+        """ Devuelve las citas de un médico ordenadas por fecha """
+
+        return self.almacen.citas_de_medico(medico)
+
+    def citas_de_paciente(self, paciente) -> List[Cita]:
+
+        """ Devuelve las citas de un paciente ordenadas por fecha """
+
+        return self.almacen.citas_de_paciente(paciente)
+
+    def citas_del_dia(self, dia: date) -> List[Cita]:
+
+        """ Devuelve las citas de un día ordenadas por hora """
+
+        return self.almacen.citas_del_dia(dia)
 
     def mostrar_citas(self) -> None:
 
         """ Muestra todas las citas """
 
-        for cita in self.lista_citas:
+        for cita in self.almacen:
             if cita.atendido:
                 estado = "Atendido"
             else:
@@ -1,8 +1,105 @@
 # manejo_habitaciones.py
+from bisect import bisect_left, insort
 from habitacion import Habitacion
+from ocupacion_habitaciones import HistorialOcupacion
 from enfermero import Enfermero
 from paciente import Paciente
-from typing import Dict, Optional, List, Union
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Tuple, Union
+
+CRITERIOS_HABITACION = ('ajuste', 'holgura')
+PRIORIDAD_ESTADO = {'grave': 0, 'moderado': 1, 'leve': 2}  # Orden de ingreso en bloque; otros estados van al final
+
+
+class IndiceCamasLibres:
+    """Índice incremental de habitaciones por camas libres, separado en limpias y sucias.
+
+    Cada habitación está en un cubo según (limpia, camas libres). Los cubos de cada estado tienen sus
+    claves (camas libres) en una lista ordenada, así que la mejor habitación con al menos n camas libres
+    se encuentra con una búsqueda binaria, sin recorrer las habitaciones.
+
+    Attributes:
+        camas_libres_totales (Dict[bool, int]): Camas libres en habitaciones limpias (True) y sucias (False).
+    """
+    def __init__(self) -> None:
+        self._cubos: Dict[bool, Dict[int, Dict[str, Habitacion]]] = {True: {}, False: {}}
+        self._claves: Dict[bool, List[int]] = {True: [], False: []}
+        self._estado: Dict[str, Tuple[bool, int]] = {}
+        self.camas_libres_totales: Dict[bool, int] = {True: 0, False: 0}
+
+    def __len__(self) -> int:
+        return len(self._estado)
+
+    def retirar(self, numero_habitacion: str) -> None:
+        """Quita una habitación del índice (si estaba)."""
+        estado = self._estado.pop(numero_habitacion, None)
+        if estado is None:
+            return
+        limpia, libres = estado
+        cubo = self._cubos[limpia][libres]
+        del cubo[numero_habitacion]
+        if not cubo:
+            del self._cubos[limpia][libres]
+            claves = self._claves[limpia]
+            del claves[bisect_left(claves, libres)]
+        self.camas_libres_totales[limpia] -= max(libres, 0)
+
+    def actualizar(self, habitacion: Habitacion) -> None:
+        """Coloca la habitación en el cubo que corresponde a su limpieza y camas libres actuales."""
+        limpia, libres = bool(habitacion.limpia), habitacion.camas_libres
+        if self._estado.get(habitacion.numero_habitacion) == (limpia, libres):
+            return
+        self.retirar(habitacion.numero_habitacion)
+        cubo = self._cubos[limpia].get(libres)
+        if cubo is None:
+            cubo = self._cubos[limpia][libres] = {}
+            insort(self._claves[limpia], libres)
+        cubo[habitacion.numero_habitacion] = habitacion
+        self._estado[habitacion.numero_habitacion] = (limpia, libres)
+        self.camas_libres_totales[limpia] += max(libres, 0)
+
+    def mejor(self, camas: int = 1, limpia: bool = True, criterio: str = 'ajuste') -> Optional[Habitacion]:
+        """Devuelve la mejor habitación con al menos `camas` camas libres, o None si no hay ninguna.
+
+        Args:
+            camas (int): Camas libres necesarias. Por defecto 1.
+            limpia (bool): Buscar entre las limpias (True) o las sucias (False). Por defecto True.
+            criterio (str): 'ajuste' elige la que menos camas libres deja sin usar (reserva las habitaciones
+                grandes); 'holgura' la que más camas libres tiene. Por defecto 'ajuste'.
+
+        Raises:
+            ValueError: Si el criterio no es válido o se piden menos de 1 camas.
+        """
+        if criterio not in CRITERIOS_HABITACION:
+            raise ValueError(f"Criterio no válido: {criterio}")
+        if camas < 1:
+            raise ValueError(f"Hay que pedir al menos 1 cama libre (se han pedido {camas})")
+        claves = self._claves[limpia]
+        if criterio == 'ajuste':
+            posicion = bisect_left(claves, camas)
+            if posicion == len(claves):
+                return None
+            libres = claves[posicion]
+        else:
+            if not claves or claves[-1] < camas:
+                return None
+            libres = claves[-1]
+        return next(iter(self._cubos[limpia][libres].values()))
+
+    def con_camas_libres(self, camas: int = 1, limpia: bool = True) -> Iterator[Habitacion]:
+        """Recorre las habitaciones con al menos `camas` camas libres, de menos a más camas libres.
+
+        Raises:
+            ValueError: Si se piden menos de 1 camas (se comprueba al llamar, no al empezar a recorrer).
+        """
+        if camas < 1:
+            raise ValueError(f"Hay que pedir al menos 1 cama libre (se han pedido {camas})")
+        return self._recorrer(camas, limpia)
+
+    def _recorrer(self, camas: int, limpia: bool) -> Iterator[Habitacion]:
+        claves = self._claves[limpia]
+        for libres in claves[bisect_left(claves, camas):]:
+            yield from list(self._cubos[limpia][libres].values())
+
 
 class ManejoHabitaciones:
     """Clase para gestionar habitaciones, su asignación a enfermeros y pacientes.
@@ -13,6 +110,14 @@ class ManejoHabitaciones:
     Attributes:
         habitaciones (Dict[str, Habitacion]): Diccionario que mapea números de habitación a objetos Habitacion.
         enfermeros (Dict[str, Enfermero]): Diccionario que mapea números de habitación a enfermeros asignados.
+        camas_libres (IndiceCamasLibres): Índice de habitaciones por camas libres, limpias y sucias. Se actualiza solo
+            cada vez que una habitación añade o elimina pacientes o cambia su limpieza.
+        habitaciones_por_enfermero (Dict[Enfermero, Dict[str, Habitacion]]): Índice inverso de `enfermeros`: habitaciones
+            asignadas a cada enfermero. Ambos se mantienen con asignar_habitacion_a_enfermero.
+        pacientes_ingresados (Dict[Any, Habitacion]): Habitación en la que está cada paciente (por id). Se actualiza
+            solo con cada ingreso o alta en las habitaciones del sistema.
+        historial_ocupacion (HistorialOcupacion): Ingresos y altas de cada habitación con su instante, para consultar
+            la ocupación en cualquier momento pasado por habitación, planta o centro.
     """
     def __init__(self) -> None:
         """Inicializa una nueva instancia de ManejoHabitaciones.
@@ -21,12 +126,20 @@ class ManejoHabitaciones:
         """
         self.habitaciones: Dict[str, Habitacion] = {}  # Diccionario para almacenar habitaciones: {numero_habitacion: Habitacion}
         self.enfermeros: Dict[str, Enfermero] = {}     # Diccionario para almacenar enfermeros asignados: {numero_habitacion: Enfermero}
+        self.camas_libres = IndiceCamasLibres()
+        self.habitaciones_por_enfermero: Dict[Enfermero, Dict[str, Habitacion]] = {}
+        self._orden: Dict[str, int] = {}  # Orden en que se agregaron las habitaciones, para listarlas siempre igual
+        self.historial_ocupacion = HistorialOcupacion()
+        self.pacientes_ingresados: Dict[Any, Habitacion] = {}
+        self._ids_por_habitacion: Dict[str, set] = {}  # Ocupantes conocidos de cada habitación, para ver qué cambia
 
-    def agregar_habitacion(self, habitacion: Habitacion) -> None:
-        """Agrega una habitación al sistema.
+    def agregar_habitacion(self, habitacion: Habitacion, planta: Optional[Any] = None, centro: Optional[Any] = None) -> None:
+        """Agrega una habitación al sistema y empieza a registrar su ocupación.
 
         Args:
             habitacion (Habitacion): Objeto de tipo Habitacion a agregar al sistema.
+            planta (Any, optional): Planta a la que pertenece, para consultar la ocupación por planta.
+            centro (Centro, optional): Centro (o su id) al que pertenece, para consultar la ocupación por centro.
 
         Raises:
             ValueError: Si el objeto no es una instancia de Habitacion o si la habitación ya está registrada.
@@ -42,10 +155,34 @@ class ManejoHabitaciones:
         if habitacion.numero_habitacion in self.habitaciones:
             raise ValueError(f"La habitación {habitacion.numero_habitacion} ya está registrada")
         self.habitaciones[habitacion.numero_habitacion] = habitacion
+        self._orden[habitacion.numero_habitacion] = len(self._orden)
+        self.camas_libres.actualizar(habitacion)
+        habitacion.observar(self.camas_libres.actualizar)
+        self.historial_ocupacion.observar(habitacion, planta, centro)
+        self._ids_por_habitacion[habitacion.numero_habitacion] = set()
+        self._actualizar_ingresados(habitacion)
+        habitacion.observar(self._actualizar_ingresados)
         print(f"Habitación {habitacion.numero_habitacion} agregada al sistema")
 
+    def _actualizar_ingresados(self, habitacion: Habitacion) -> None:
+        """Actualiza `pacientes_ingresados` con los pacientes que han entrado o salido de la habitación."""
+        anteriores = self._ids_por_habitacion[habitacion.numero_habitacion]
+        actuales = {paciente.id: paciente for paciente in habitacion.pacientes}
+        if anteriores == actuales.keys():
+            return
+        for id_paciente in anteriores - actuales.keys():
+            if self.pacientes_ingresados.get(id_paciente) is habitacion:
+                del self.pacientes_ingresados[id_paciente]
+        for id_paciente in actuales.keys() - anteriores:
+            self.pacientes_ingresados[id_paciente] = habitacion
+        self._ids_por_habitacion[habitacion.numero_habitacion] = set(actuales)
+
+    def habitacion_de_paciente(self, paciente: Paciente) -> Optional[Habitacion]:
+        """Devuelve la habitación del sistema en la que está ingresado el paciente, o None si no está en ninguna."""
+        return self.pacientes_ingresados.get(paciente.id)
+
     def asignar_habitacion_a_enfermero(self, numero_habitacion: str, enfermero: Enfermero) -> None:
-        """Asigna una habitación a un enfermero.
+        """Asigna una habitación a un enfermero (si ya tenía otro, deja de estar asignada a ese).
 
         Args:
             numero_habitacion (str): Número de la habitación a asignar.
@@ -68,9 +205,42 @@ class ManejoHabitaciones:
             raise ValueError("El objeto debe ser una instancia de la clase Enfermero")
         if numero_habitacion not in self.habitaciones:
             raise ValueError(f"La habitación {numero_habitacion} no está registrada en el sistema")
+        anterior: Optional[Enfermero] = self.enfermeros.get(numero_habitacion)
+        if anterior is not None:
+            del self.habitaciones_por_enfermero[anterior][numero_habitacion]
+            if not self.habitaciones_por_enfermero[anterior]:
+                del self.habitaciones_por_enfermero[anterior]
         self.enfermeros[numero_habitacion] = enfermero
+        self.habitaciones_por_enfermero.setdefault(enfermero, {})[numero_habitacion] = self.habitaciones[numero_habitacion]
         print(f"Habitación {numero_habitacion} asignada al enfermero {enfermero.nombre} {enfermero.apellido}")
 
+    def _habitacion_del_enfermero(self, numero_habitacion: str, enfermero: Enfermero) -> Habitacion:
+        """Devuelve la habitación si está registrada y asignada al enfermero (consulta O(1) en el índice inverso).
+
+        Raises:
+            ValueError: Si la habitación no está registrada o no está asignada al enfermero.
+        """
+        habitacion: Optional[Habitacion] = self.buscar_habitacion(numero_habitacion)
+        if habitacion is None:  # `not habitacion` sería cierto para una habitación vacía (Habitacion define __len__)
+            raise ValueError(f"La habitación {numero_habitacion} no está registrada")
+        if numero_habitacion not in self.habitaciones_por_enfermero.get(enfermero, {}):
+            raise ValueError(f"La habitación {numero_habitacion} no está asignada al enfermero {enfermero.nombre}")
+        return habitacion
+
+    def habitaciones_de(self, enfermero: Enfermero) -> List[Habitacion]:
+        """Devuelve las habitaciones asignadas a un enfermero, en el orden en que se agregaron al sistema.
+
+        Solo recorre las habitaciones de ese enfermero, no todas las del sistema.
+
+        Args:
+            enfermero (Enfermero): Enfermero cuyas habitaciones se buscan.
+
+        Returns:
+            List[Habitacion]: Habitaciones asignadas (lista vacía si no tiene ninguna).
+        """
+        asignadas: Dict[str, Habitacion] = self.habitaciones_por_enfermero.get(enfermero, {})
+        return sorted(asignadas.values(), key=lambda habitacion: self._orden[habitacion.numero_habitacion])
+
     def limpiar_habitacion(self, numero_habitacion: str, enfermero: Enfermero) -> None:
         """Limpia una habitación específica, verificando que el enfermero esté asignado.
 
@@ -91,11 +261,7 @@ class ManejoHabitaciones:
             >>> manejo.asignar_habitacion_a_enfermero("101", enfermero)
             >>> manejo.limpiar_habitacion("101", enfermero)
         """
-        habitacion: Optional[Habitacion] = self.buscar_habitacion(numero_habitacion)
-        if not habitacion:
-            raise ValueError(f"La habitación {numero_habitacion} no está registrada")
-        if numero_habitacion not in self.enfermeros or self.enfermeros[numero_habitacion] != enfermero:
-            raise ValueError(f"La habitación {numero_habitacion} no está asignada al enfermero {enfermero.nombre}")
+        habitacion: Habitacion = self._habitacion_del_enfermero(numero_habitacion, enfermero)
         habitacion.limpiar()
 
     def asignar_paciente_a_habitacion(self, paciente: Paciente, numero_habitacion: str, enfermero: Enfermero) -> None:
@@ -124,11 +290,7 @@ class ManejoHabitaciones:
             >>> manejo.asignar_paciente_a_habitacion(paciente, "101", enfermero)
             Paciente Juan Pérez asignado a la habitación 101
         """
-        habitacion: Optional[Habitacion] = self.buscar_habitacion(numero_habitacion)
-        if not habitacion:
-            raise ValueError(f"La habitación {numero_habitacion} no está registrada")
-        if numero_habitacion not in self.enfermeros or self.enfermeros[numero_habitacion] != enfermero:
-            raise ValueError(f"La habitación {numero_habitacion} no está asignada al enfermero {enfermero.nombre}")
+        habitacion: Habitacion = self._habitacion_del_enfermero(numero_habitacion, enfermero)
 
         # Verificar si la habitación está limpia
         if not habitacion.limpia:
@@ -136,6 +298,7 @@ class ManejoHabitaciones:
 
         # Asignar el paciente a la habitación
         habitacion.añadir_pacientes(paciente)
+        paciente.asignar_habitacion(habitacion)
         print(f"Paciente {paciente.nombre} asignado a la habitación {numero_habitacion}")
 
         # Asignar el paciente al enfermero si no está asignado
@@ -167,12 +330,10 @@ class ManejoHabitaciones:
             >>> manejo.asignar_paciente_a_habitacion(paciente, "101", enfermero)
             >>> manejo.eliminar_paciente_de_habitacion(paciente, "101", enfermero)
         """
-        habitacion: Optional[Habitacion] = self.buscar_habitacion(numero_habitacion)
-        if not habitacion:
-            raise ValueError(f"La habitación {numero_habitacion} no está registrada")
-        if numero_habitacion not in self.enfermeros or self.enfermeros[numero_habitacion] != enfermero:
-            raise ValueError(f"La habitación {numero_habitacion} no está asignada al enfermero {enfermero.nombre}")
+        habitacion: Habitacion = self._habitacion_del_enfermero(numero_habitacion, enfermero)
         habitacion.eliminar_paciente(paciente)
+        if paciente.habitacion_asginada is habitacion and paciente not in habitacion:
+            paciente.habitacion_asginada = None
 
     def buscar_habitacion(self, numero_habitacion: str) -> Optional[Habitacion]:
         """Busca una habitación por su número.
@@ -193,6 +354,119 @@ class ManejoHabitaciones:
         """
         return self.habitaciones.get(numero_habitacion)
 
+    def buscar_habitacion_libre(self, camas: int = 1, limpia: bool = True, criterio: str = 'ajuste') -> Optional[Habitacion]:
+        """Busca la mejor habitación con camas libres usando el índice de camas (O(log n), sin recorrer las habitaciones).
+
+        Args:
+            camas (int): Camas libres necesarias. Por defecto 1.
+            limpia (bool): Si la habitación debe estar limpia. Por defecto True.
+            criterio (str): 'ajuste' (la que menos camas libres deja sin usar) u 'holgura' (la que más tiene). Por defecto 'ajuste'.
+
+        Returns:
+            Optional[Habitacion]: La habitación encontrada, o None si no hay ninguna.
+
+        Raises:
+            ValueError: Si el criterio no es válido o se piden menos de 1 camas.
+
+        Example:
+            >>> manejo = ManejoHabitaciones()
+            >>> manejo.agregar_habitacion(Habitacion(numero_habitacion="101", capacidad=2, limpia=True))
+            Habitación 101 agregada al sistema
+            >>> manejo.buscar_habitacion_libre().numero_habitacion
+            '101'
+        """
+        return self.camas_libres.mejor(camas, limpia, criterio)
+
+    def ingresar_en_bloque(self, pacientes: Iterable[Paciente], habitaciones: Optional[Iterable[Union[str, Habitacion]]] = None,
+                           aplicar: bool = True) -> Dict[str, Any]:
+        """Reparte muchos pacientes entre las habitaciones limpias con camas libres en una sola pasada.
+
+        Primero se ordenan los pacientes por gravedad (grave, moderado, leve y el resto; a igual estado, en el orden
+        recibido) y después se llenan las habitaciones de menos a más camas libres, que es el reparto de mejor ajuste
+        con pacientes de una cama: se completan las habitaciones casi llenas y se reservan las grandes. Si faltan camas,
+        se quedan sin cama los pacientes menos graves.
+
+        El reparto se aplica de forma atómica: o ingresan todos los pacientes del plan o, si algo falla, ninguno. Tras
+        ingresar, cada paciente queda con su habitación asignada y, si la habitación tiene enfermero y el paciente aún
+        no tiene uno, también con ese enfermero. No se imprime nada por paciente.
+
+        Args:
+            pacientes (Iterable[Paciente]): Pacientes a ingresar (los repetidos, por id, se cuentan una vez).
+            habitaciones (Iterable[Union[str, Habitacion]], optional): Habitaciones disponibles (número u objeto). Por
+                defecto, todas las limpias con camas libres del sistema. Las no registradas, sucias o llenas se ignoran.
+            aplicar (bool): Si es False solo se calcula el plan, sin ingresar a nadie. Por defecto True.
+
+        Returns:
+            Dict[str, Any]: Informe con 'asignados' ({id de paciente: número de habitación}), 'sin_cama' (ids de los
+                pacientes que no caben), 'ya_ingresados' (ids de los que ya estaban en una habitación del sistema),
+                'habitaciones_usadas' y 'camas_libres_restantes' (en las habitaciones disponibles).
+
+        Raises:
+            ValueError: Si falla algún ingreso (en ese caso se deshacen todos los del bloque).
+        """
+        vistos = set()
+        por_ingresar: List[Paciente] = []
+        ya_ingresados: List[Any] = []
+        for paciente in pacientes:
+            # Por id de paciente: el repositorio puede devolver copias distintas del mismo paciente
+            if paciente.id in vistos:
+                continue
+            vistos.add(paciente.id)
+            if paciente.id in self.pacientes_ingresados:
+                ya_ingresados.append(paciente.id)
+            else:
+                por_ingresar.append(paciente)
+        por_ingresar.sort(key=lambda paciente: PRIORIDAD_ESTADO.get(str(paciente.estado).lower(), len(PRIORIDAD_ESTADO)))
+
+        if habitaciones is None:
+            disponibles: List[Habitacion] = list(self.camas_libres.con_camas_libres(1, limpia=True))
+        else:
+            disponibles = []
+            for habitacion in habitaciones:
+                numero = habitacion.numero_habitacion if isinstance(habitacion, Habitacion) else habitacion
+                registrada: Optional[Habitacion] = self.habitaciones.get(numero)
+                if registrada is not None and registrada.limpia and registrada.camas_libres > 0:
+                    disponibles.append(registrada)
+            disponibles = sorted(dict.fromkeys(disponibles), key=lambda habitacion: habitacion.camas_libres)
+
+        plan: List[Tuple[Paciente, Habitacion]] = []
+        siguiente = 0
+        for habitacion in disponibles:
+            if siguiente == len(por_ingresar):
+                break
+            cupo = min(habitacion.camas_libres, len(por_ingresar) - siguiente)
+            plan.extend((paciente, habitacion) for paciente in por_ingresar[siguiente:siguiente + cupo])
+            siguiente += cupo
+
+        if aplicar:
+            aplicados: List[Tuple[Paciente, Habitacion]] = []
+            try:
+                for paciente, habitacion in plan:
+                    habitacion.añadir_pacientes(paciente)
+                    aplicados.append((paciente, habitacion))
+            except ValueError:
+                # Se deshace por habitación: su fichero de historial se reescribe como mucho una vez
+                por_habitacion: Dict[Habitacion, List[Paciente]] = {}
+                for paciente, habitacion in reversed(aplicados):
+                    por_habitacion.setdefault(habitacion, []).append(paciente)
+                for habitacion, deshacer in por_habitacion.items():
+                    habitacion.deshacer_ingresos(deshacer)
+                raise
+            for paciente, habitacion in plan:
+                paciente.asignar_habitacion(habitacion)
+                enfermero: Optional[Enfermero] = self.enfermeros.get(habitacion.numero_habitacion)
+                if enfermero is not None and paciente.enfermero_asignado is None:
+                    enfermero.asignar_paciente(paciente)
+
+        usadas = {id(habitacion) for _, habitacion in plan}
+        return {
+            'asignados': {paciente.id: habitacion.numero_habitacion for paciente, habitacion in plan},
+            'sin_cama': [paciente.id for paciente in por_ingresar[siguiente:]],
+            'ya_ingresados': ya_ingresados,
+            'habitaciones_usadas': len(usadas),
+            'camas_libres_restantes': sum(habitacion.camas_libres for habitacion in disponibles) - (0 if aplicar else len(plan)),
+        }
+
     def mostrar_habitaciones(self, enfermero: Enfermero) -> str:
         """Muestra información de las habitaciones asignadas a un enfermero.
 
@@ -214,10 +488,7 @@ class ManejoHabitaciones:
             Habitaciones asignadas:
             Habitacion: 101 - Limpia: False - Capacidad: 2 - Pacientes asignados: [] - Cantidad de pacientes: 0
         """
-        habitaciones_asignadas: List[Habitacion] = [
-            habitacion for num, habitacion in self.habitaciones.items()
-            if num in self.enfermeros and self.enfermeros[num] == enfermero
-        ]
+        habitaciones_asignadas: List[Habitacion] = self.habitaciones_de(enfermero)
         if not habitaciones_asignadas:
             return "No hay habitaciones asignadas a este enfermero"
         info: str = "Habitaciones asignadas:\n"
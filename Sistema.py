@@ -2,8 +2,9 @@
 from ManejoHabitaciones import ManejoHabitaciones
 
 class SistemaProSalud:
-    def __init__(self):
-        self.personas = {}  # Diccionario para almacenar personas: {username: Persona}
+    def __init__(self, diario=None):
+        # Diccionario para almacenar personas: {username: Persona}. Con un Diario, los cambios quedan registrados
+        self.personas = diario.registro('personas') if diario is not None else {}
         self.manejo_habitaciones = ManejoHabitaciones()
 
     def agregar_persona(self, persona):
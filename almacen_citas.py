@@ -0,0 +1,148 @@
+from datetime import date
+from typing import Dict, Hashable, Iterator, List, Optional, Set
+from citas import Cita
+
+
+def clave_persona(persona) -> Hashable:
+    '''
+    Devuelve la clave con la que se indexa un paciente o un médico. Si el objeto tiene atributo `id`
+    se usa ese identificador; si no (por ejemplo, cuando el médico es un str) se usa el propio valor.
+
+    Parámetros
+    ----------
+    persona : object
+        Paciente, médico o cadena que lo identifica.
+
+    Devuelve
+    --------
+    Hashable
+        Clave usada en los índices secundarios.
+    '''
+    return getattr(persona, 'id', persona)
+
+
+class AlmacenCitas:
+    '''
+    Almacén de citas con un índice primario por `id_cita` y varios índices secundarios
+    (por médico, por paciente y por día) para que las consultas no tengan que recorrer todas las citas.
+
+    Atributos
+    ---------
+    citas : Dict[Hashable, Cita]
+        Índice primario: id_cita -> Cita. Mantiene el orden de inserción.
+    por_medico : Dict[Hashable, Set[Hashable]]
+        Índice secundario: clave del médico -> ids de sus citas.
+    por_paciente : Dict[Hashable, Set[Hashable]]
+        Índice secundario: clave del paciente -> ids de sus citas.
+    por_dia : Dict[date, Set[Hashable]]
+        Índice secundario: día -> ids de las citas de ese día.
+
+    Métodos
+    -------
+    añadir(cita) -> None
+        Registra una cita en todos los índices.
+    eliminar(id_cita) -> Optional[Cita]
+        Quita una cita de todos los índices y la devuelve.
+    obtener(id_cita) -> Optional[Cita]
+        Devuelve la cita con ese id en O(1).
+    citas_de_medico(medico) / citas_de_paciente(paciente) / citas_del_dia(dia) -> List[Cita]
+        Consultas por los índices secundarios.
+    '''
+
+    def __init__(self):
+        '''
+        Inicializa un almacén vacío.
+        '''
+        self.citas: Dict[Hashable, Cita] = {}
+        self.por_medico: Dict[Hashable, Set[Hashable]] = {}
+        self.por_paciente: Dict[Hashable, Set[Hashable]] = {}
+        self.por_dia: Dict[date, Set[Hashable]] = {}
+
+    def añadir(self, cita: Cita) -> None:
+        '''
+        Registra una cita en el índice primario y en los secundarios.
+
+        Parámetros
+        ----------
+        cita : Cita
+            Cita que se quiere almacenar.
+
+        Excepciones
+        -----------
+        ValueError
+            Si ya existe una cita con el mismo id_cita.
+        '''
+        if cita.id_cita in self.citas:
+            raise ValueError(f'Ya existe una cita con el ID {cita.id_cita}')
+        self.citas[cita.id_cita] = cita
+        self.por_medico.setdefault(clave_persona(cita.medico), set()).add(cita.id_cita)
+        self.por_paciente.setdefault(clave_persona(cita.paciente), set()).add(cita.id_cita)
+        self.por_dia.setdefault(cita.fecha_hora_dt.date(), set()).add(cita.id_cita)
+
+    def eliminar(self, id_cita) -> Optional[Cita]:
+        '''
+        Quita una cita de todos los índices.
+
+        Parámetros
+        ----------
+        id_cita : Hashable
+            Identificador de la cita.
+
+        Devuelve
+        --------
+        Optional[Cita]
+            La cita eliminada o None si no existía.
+        '''
+        cita = self.citas.pop(id_cita, None)
+        if cita is None:
+            return None
+        self._quitar_de_indice(self.por_medico, clave_persona(cita.medico), id_cita)
+        self._quitar_de_indice(self.por_paciente, clave_persona(cita.paciente), id_cita)
+        self._quitar_de_indice(self.por_dia, cita.fecha_hora_dt.date(), id_cita)
+        return cita
+
+    @staticmethod
+    def _quitar_de_indice(indice: dict, clave: Hashable, id_cita) -> None:
+        ids = indice.get(clave)
+        if ids is not None:
+            ids.discard(id_cita)
+            if not ids:
+                del indice[clave]
+
+    def obtener(self, id_cita) -> Optional[Cita]:
+        '''
+        Devuelve la cita con el id indicado, o None si no existe.
+        '''
+        return self.citas.get(id_cita)
+
+    def _resolver(self, ids: Optional[Set[Hashable]]) -> List[Cita]:
+        if not ids:
+            return []
+        return sorted((self.citas[i] for i in ids), key=lambda cita: cita.fecha_hora_dt)
+
+    def citas_de_medico(self, medico) -> List[Cita]:
+        '''
+        Devuelve las citas de un médico ordenadas por fecha y hora.
+        '''
+        return self._resolver(self.por_medico.get(clave_persona(medico)))
+
+    def citas_de_paciente(self, paciente) -> List[Cita]:
+        '''
+        Devuelve las citas de un paciente ordenadas por fecha y hora.
+        '''
+        return self._resolver(self.por_paciente.get(clave_persona(paciente)))
+
+    def citas_del_dia(self, dia: date) -> List[Cita]:
+        '''
+        Devuelve las citas de un día ordenadas por hora.
+        '''
+        return self._resolver(self.por_dia.get(dia))
+
+    def __contains__(self, id_cita) -> bool:
+        return id_cita in self.citas
+
+    def __len__(self) -> int:
+        return len(self.citas)
+
+    def __iter__(self) -> Iterator[Cita]:
+        return iter(self.citas.values())
@@ -3,16 +3,27 @@ API para la gestión de usuarios y SIPs en un sistema de salud.
 
 Esta API incluye:
 - Endpoints para gestionar SIPs (Sistema de Identificación de Pacientes).
-- Integración con la API RxNorm para obtener información sobre medicamentos.
+- Integración con la API RxNorm (cliente compartido con sesión y caché) para obtener información sobre medicamentos,
+  respondida desde un espejo local en disco si está configurado (PROSALUD_RXNORM_ESPEJO).
 - Gestión de usuarios (pacientes, médicos, enfermeros, auxiliares) con autenticación.
+- Sesiones: la contraseña (bcrypt) se verifica una vez y después se usa un token de sesión en caché.
+- Almacenamiento persistente en SQLite a través de la capa de repositorios (repositorio.py).
 - Endpoints para asignar médicos, habitaciones y listar pacientes/trabajadores.
+- Listado de pacientes paginado por cursor, filtrable por estado y médico, y en streaming NDJSON.
+- Endpoints para consultar los próximos huecos libres de cita de un médico o especialidad y para reservar una cita
+  (las citas solapadas con otra del mismo médico se rechazan).
+- Cola de triaje de urgencias: llegada de pacientes y siguiente paciente a atender.
 """
 
 # === Importaciones ===
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from functools import wraps
+import bcrypt
+import json
+import os
 import requests
 import uuid
+from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
 from auxiliar import Auxiliar
@@ -21,125 +32,110 @@ from medico import Medico
 from paciente import Paciente
 from habitacion import Habitacion
 from pdf_generator import generar_pdf_paciente
+from Gestorcitas import GestorCitas, TIPOS_CITA
+from repositorio import crear_repositorio
+from autenticacion import CacheSesiones
+from cliente_rxnorm import obtener_cliente
 
 # === Configuración de la Aplicación ===
 app = Flask(__name__)
 
-# URL de la API RxNorm para consultar medicamentos
-RXNORM_URL = "https://rxnav.nlm.nih.gov/REST/drugs.json"
-
-# === Base de Datos en Memoria ===
-# Diccionarios para almacenar datos en memoria (SIPs, pacientes, trabajadores)
-sips: Dict[str, str] = {}  # Almacena los SIPs de los pacientes
-pacientes: Dict[str, Any] = {}  # Almacena pacientes
-medicos: Dict[str, Any] = {}  # Almacena médicos
-enfermeros: Dict[str, Any] = {}  # Almacena enfermeros
-auxiliares: Dict[str, Any] = {}  # Almacena auxiliares
-
-# Diccionario para simular usuarios registrados (en lugar de una base de datos)
+# === Base de Datos ===
+# Repositorios con interfaz de diccionario (SIPs, pacientes, trabajadores). Por defecto usan SQLite
+# (PROSALUD_DB, 'prosalud.db'); con PROSALUD_ALMACENAMIENTO=diario se guardan en memoria con un diario
+# de operaciones e instantáneas (PROSALUD_DIARIO), y con PROSALUD_ALMACENAMIENTO=memoria solo en memoria.
+def _id_medico_asignado(paciente) -> Any:
+    medico = getattr(paciente, 'medico_asignado', None)
+    return getattr(medico, 'id', None) if medico else None
+
+# Índices secundarios de pacientes para filtrar el listado sin recorrer todo el registro
+INDICES_PACIENTES = {
+    'estado': lambda paciente: getattr(paciente, 'estado', None),
+    'medico': _id_medico_asignado,
+}
+LIMITE_PAGINA = 100  # Tamaño de página por defecto al paginar /pacientes
+LIMITE_PAGINA_MAXIMO = 1000
+MAX_MEDICAMENTOS_LOTE = 100  # Nombres por petición a /medicamentos/info
+MAX_DIAS_HUECOS = 366  # Ventana máxima de búsqueda de /citas/huecos
+MAX_HUECOS = 100  # Huecos máximos por petición a /citas/huecos
+
+sips: Dict[str, str] = crear_repositorio('sips')  # Almacena los SIPs de los pacientes
+pacientes: Dict[str, Any] = crear_repositorio('pacientes', indices=INDICES_PACIENTES)  # Almacena pacientes
+medicos: Dict[str, Any] = crear_repositorio('medicos')  # Almacena médicos
+enfermeros: Dict[str, Any] = crear_repositorio('enfermeros')  # Almacena enfermeros
+auxiliares: Dict[str, Any] = crear_repositorio('auxiliares')  # Almacena auxiliares
+gestor_citas = GestorCitas(rechazar_solapamientos=True)  # Citas indexadas por id, médico, paciente y día
+
+# Diccionario para simular usuarios registrados (en lugar de una base de datos).
+# Las contraseñas se guardan como hash bcrypt (pepe123, med123 y enf123).
 usuarios_registrados = {
-    "juan": {"password": "pepe123", "rol": "paciente"},
-    "ana": {"password": "med123", "rol": "medico"},
-    "luis": {"password": "enf123", "rol": "enfermero"}
+    "juan": {"password_hash": b"$2b$12$xZsgL7FrHhefL.bRiQxKU.pOci482IE/T1vpWsDbbqw9XOY2uwu/2", "rol": "paciente"},
+    "ana": {"password_hash": b"$2b$12$Oewuc/NhmfGy47Gik8lL0e8iw7r3aNBhfEZOPbnga.xMwJF0I8R8O", "rol": "medico"},
+    "luis": {"password_hash": b"$2b$12$b9rrcNI5bXsuaKGM3MjC2.6lLi1quNGdKF6yBMcGKTlUjkP7FBQK2", "rol": "enfermero"}
 }
 
+# Sesiones activas (15 minutos de validez); se revocan al dar de baja al usuario
+sesiones = CacheSesiones(duracion=900)
+
 # === Decorador de Autenticación ===
+def verificar_credenciales(username: str, password: str):
+    """
+    Comprueba usuario y contraseña con bcrypt (operación lenta a propósito).
+
+    Devuelve
+    --------
+    Tuple[str, None] o Tuple[None, str]
+        (rol, None) si las credenciales son válidas, o (None, mensaje de error).
+    """
+    usuario = usuarios_registrados.get(username)
+    if not usuario:
+        return None, "Usuario no encontrado"
+
+    # Verificar si el usuario existe en su diccionario correspondiente
+    if usuario["rol"] == "paciente" and username not in pacientes:
+        return None, "Paciente no registrado"
+    elif usuario["rol"] == "medico" and username not in medicos:
+        return None, "Médico no registrado"
+    elif usuario["rol"] == "enfermero" and username not in enfermeros:
+        return None, "Enfermero no registrado"
+
+    if not bcrypt.checkpw(password.encode('utf-8'), usuario["password_hash"]):
+        return None, "Contraseña incorrecta"
+    return usuario["rol"], None
+
 def requiere_autenticacion(f):
     """
-    Decorador que verifica la autenticación básica (usuario y contraseña) en la solicitud.
-    Usa un diccionario en memoria para validar los usuarios.
-    Si las credenciales son válidas, pasa un objeto usuario con el rol al endpoint.
+    Decorador que autentica la solicitud con un token de sesión (Authorization: Bearer <token>) o con
+    autenticación básica (usuario y contraseña).
+    Con autenticación básica la contraseña solo se verifica con bcrypt la primera vez; las siguientes
+    peticiones con las mismas credenciales reutilizan la sesión guardada en caché mientras no caduque.
+    Si la autenticación es válida, pasa la sesión (con username y rol) al endpoint.
     Si no, devuelve un error 401 (Unauthorized).
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        cabecera = request.headers.get('Authorization', '')
+        if cabecera[:7].lower() == 'bearer ':
+            sesion = sesiones.validar(cabecera[7:].strip())
+            if sesion is None:
+                return jsonify({"detail": "Sesión no válida o caducada"}), 401
+            return f(sesion, *args, **kwargs)
+
         # Obtener las credenciales de autenticación básica de la solicitud
         auth = request.authorization
         if not auth or not auth.username or not auth.password:
             return jsonify({"detail": "Autenticación requerida. Proporcione usuario y contraseña."}), 401
 
-        usuario = usuarios_registrados.get(auth.username)
-        if not usuario:
-            return jsonify({"detail": "Usuario no encontrado"}), 401
-        
-        # Verificar si el usuario existe en su diccionario correspondiente
-        if usuario["rol"] == "paciente" and auth.username not in pacientes:
-            return jsonify({"detail": "Paciente no registrado"}), 401
-        elif usuario["rol"] == "medico" and auth.username not in medicos:
-            return jsonify({"detail": "Médico no registrado"}), 401
-        elif usuario["rol"] == "enfermero" and auth.username not in enfermeros:
-            return jsonify({"detail": "Enfermero no registrado"}), 401
-        
-        if usuario["password"] != auth.password:
-            return jsonify({"detail": "Contraseña incorrecta"}), 401
-        
-        # Buscar el usuario en el diccionario de usuarios registrados
-        """usuario = usuarios_registrados.get(auth.username)
-        if not usuario:
-            return jsonify({"detail": "Usuario no encontrado."}), 401
-
-        # Verificar la contraseña
-        if usuario["password"] != auth.password:
-            return jsonify({"detail": "Contraseña incorrecta."}), 401""" 
-
-        # Crear un objeto usuario con el rol
-        class UsuarioTemporal:
-            def __init__(self, rol):
-                self.rol = rol
-                self.username = auth.username
-
-        usuario_obj = UsuarioTemporal(usuario["rol"])
-        return f(usuario_obj, *args, **kwargs)
+        sesion = sesiones.por_credencial(auth.username, auth.password)
+        if sesion is None:
+            rol, error = verificar_credenciales(auth.username, auth.password)
+            if error:
+                return jsonify({"detail": error}), 401
+            sesion = sesiones.emitir(auth.username, rol, auth.password)
+        return f(sesion, *args, **kwargs)
 
     return decorated_function
 
-# === Funciones de Utilidad para RxNorm ===
-def obtener_informacion_medicamento(medicamento: str) -> None:
-    """
-    Consulta información de un medicamento usando la API RxNorm y la imprime.
-
-    Parámetros
-    ----------
-    medicamento : str
-        Nombre del medicamento a consultar.
-
-    Ejemplo
-    -------
-    >>> obtener_informacion_medicamento("ibuprofeno")
-    Nombre: Ibuprofen
-    RXCUI: 5640
-    TTY: IN
-    Idioma: ENG
-    -------------------------------
-    """
-    try:
-        # Realizar la solicitud a la API RxNorm
-        response = requests.get(RXNORM_URL, params={'name': medicamento})
-        response.raise_for_status()  # Verifica si la solicitud fue exitosa
-
-        # Parsear la respuesta JSON
-        data = response.json()
-
-        # Verificar si hay información de medicamentos
-        if 'conceptGroup' not in data['drugGroup']:
-            raise NameError('El medicamento no existe o no se encuentra en la base de datos.')
-
-        medicamentos = data['drugGroup']['conceptGroup']
-        for med in medicamentos:
-            if 'conceptProperties' in med:
-                for propiedad in med['conceptProperties']:
-                    print(f"Nombre: {propiedad.get('name')}")
-                    print(f"RXCUI: {propiedad.get('rxcui')}")
-                    print(f"TTY: {propiedad.get('tty')}")
-                    print(f"Idioma: {propiedad.get('language')}")
-                    print("-------------------------------")
-                    print("")
-
-    except requests.exceptions.RequestException as error:
-        print(f"No se puede completar la solicitud: {error}")
-    except NameError as error:
-        print(f"Error: {error}")
-
 # === Funciones de Utilidad para SIPs ===
 def generar_sip(paciente_id: str) -> str:
     """
@@ -156,7 +152,7 @@ def generar_sip(paciente_id: str) -> str:
         SIP generado en formato 'SIP-<código_hexadecimal>'.
     """
     sip = f"SIP-{uuid.uuid4().hex[:10].upper()}"  # Genera un SIP único
-    sips[paciente_id] = sip
+    sips.registrar('crear_sip', paciente_id, sip)
     return sip
 
 # === Endpoints de SIPs ===
@@ -261,25 +257,96 @@ def menu_usuario(usuario):
     else:
         return jsonify({"detail": "Rol no reconocido"}), 403
 
-@app.route('/pacientes', methods=['GET'])
-def listar_pacientes() -> List[Dict[str, Any]]:
+def _paciente_a_dict(p) -> Dict[str, Any]:
+    return {
+        "id": p.id,
+        "nombre": p.nombre,
+        "apellido": p.apellido,
+        "estado": p.estado,
+        "medico_asignado": p.medico_asignado.nombre if hasattr(p, 'medico_asignado') and p.medico_asignado else "No asignado"
+    }
+
+# === Endpoints de Sesión ===
+@app.route('/login', methods=['POST'])
+@requiere_autenticacion
+def iniciar_sesion(usuario):
+    """
+    Devuelve el token de sesión del usuario autenticado, para usarlo en las siguientes peticiones
+    con la cabecera Authorization: Bearer <token>.
+
+    Devuelve
+    --------
+    jsonify
+        Token, rol y segundos de validez que le quedan.
+    """
+    return jsonify({
+        "token": usuario.token,
+        "rol": usuario.rol,
+        "expira_en": int(sesiones.restante(usuario))
+    })
+
+@app.route('/logout', methods=['POST'])
+@requiere_autenticacion
+def cerrar_sesion(usuario):
     """
-    Lista todos los pacientes activos.
+    Revoca la sesión actual.
 
     Devuelve
     --------
     jsonify
-        Lista de pacientes.
-    """
-    resultado = []
-    for p in pacientes.values():
-        resultado.append({
-            "nombre": p.nombre,
-            "apellido": p.apellido,
-            "estado": p.estado,
-            "medico_asignado": p.medico_asignado.nombre if hasattr(p, 'medico_asignado') and p.medico_asignado else "No asignado"
-        })
-    return jsonify(resultado)
+        Mensaje de confirmación.
+    """
+    sesiones.revocar(usuario.token)
+    return jsonify({"mensaje": "Sesión cerrada."})
+
+@app.route('/pacientes', methods=['GET'])
+def listar_pacientes():
+    """
+    Lista los pacientes activos en orden de ID.
+
+    Parámetros (query string)
+    -------------------------
+    estado : str, opcional
+        Solo pacientes con este estado.
+    medico : str, opcional
+        Solo pacientes asignados al médico con este ID.
+    limit : int, opcional
+        Tamaño de página (máximo 1000). Si se indica 'limit' o 'after' la respuesta se pagina.
+    after : str, opcional
+        Cursor: ID del último paciente de la página anterior (campo 'siguiente' de la respuesta).
+    formato : str, opcional
+        'ndjson' para recibir un paciente por línea según se van leyendo (también con
+        la cabecera Accept: application/x-ndjson).
+
+    Devuelve
+    --------
+    jsonify o Response
+        Lista de pacientes; con paginación, {"pacientes": [...], "siguiente": cursor o None};
+        en modo NDJSON, un objeto JSON por línea.
+    """
+    filtros = {campo: request.args[campo] for campo in INDICES_PACIENTES if request.args.get(campo)}
+    despues = request.args.get('after')
+    paginar = 'limit' in request.args or despues is not None
+    try:
+        limite = int(request.args.get('limit', LIMITE_PAGINA)) if paginar else None
+    except ValueError:
+        return jsonify({"error": "Parámetro 'limit' no válido"}), 400
+    if limite is not None and not 0 < limite <= LIMITE_PAGINA_MAXIMO:
+        return jsonify({"error": f"'limit' debe estar entre 1 y {LIMITE_PAGINA_MAXIMO}"}), 400
+
+    if request.args.get('formato') == 'ndjson' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        def generar():
+            for _, p in pacientes.consultar(filtros, despues, limite):
+                yield json.dumps(_paciente_a_dict(p), ensure_ascii=False) + '\n'
+        return Response(stream_with_context(generar()), mimetype='application/x-ndjson')
+
+    if not paginar:
+        return jsonify([_paciente_a_dict(p) for _, p in pacientes.consultar(filtros)])
+
+    # Se pide un paciente más de la cuenta para saber si hay otra página
+    pagina = [p for _, p in pacientes.consultar(filtros, despues, limite + 1)]
+    siguiente = pagina[limite - 1].id if len(pagina) > limite else None
+    return jsonify({"pacientes": [_paciente_a_dict(p) for p in pagina[:limite]], "siguiente": siguiente})
 
 @app.route('/pacientes/alta', methods=['POST'])
 def alta_paciente():
@@ -315,7 +382,12 @@ def baja_paciente(id_paciente: str):
         Mensaje de confirmación o error.
     """
     if id_paciente in pacientes:
+        paciente = pacientes[id_paciente]
         del pacientes[id_paciente]
+        # Las sesiones abiertas del paciente dejan de valer
+        sesiones.revocar_usuario(id_paciente)
+        if getattr(paciente, 'username', id_paciente) != id_paciente:
+            sesiones.revocar_usuario(paciente.username)
         return jsonify({"mensaje": f"Paciente con ID {id_paciente} dado de baja."})
     return jsonify({"error": "Paciente no encontrado"}), 404
 
@@ -340,6 +412,7 @@ def asignar_medico_paciente():
         return jsonify({"error": "Paciente o médico no encontrado"}), 404
 
     paciente.medico_asignado = medico
+    pacientes.registrar('asignar_medico', id_paciente, paciente)  # Se vuelve a guardar para persistir el cambio
     return jsonify({"mensaje": f"Paciente {paciente.nombre} asignado a médico {medico.nombre}."})
 
 @app.route('/pacientes/asignar_habitacion', methods=['POST'])
@@ -362,6 +435,7 @@ def asignar_habitacion_paciente():
 
     habitacion = Habitacion(numero=numero_habitacion)
     paciente.habitacion_asignada = habitacion
+    pacientes.registrar('asignar_habitacion', id_paciente, paciente)  # Se vuelve a guardar para persistir el cambio
     return jsonify({"mensaje": f"Paciente {paciente.nombre} asignado a la habitación {habitacion.numero}."})
 
 @app.route('/trabajadores/alta', methods=['POST'])
@@ -408,14 +482,17 @@ def baja_trabajador(id_trabajador: str):
     jsonify
         Mensaje de confirmación o error.
     """
-    if id_trabajador in medicos:
-        del medicos[id_trabajador]
-    elif id_trabajador in enfermeros:
-        del enfermeros[id_trabajador]
-    elif id_trabajador in auxiliares:
-        del auxiliares[id_trabajador]
+    for registro in (medicos, enfermeros, auxiliares):
+        if id_trabajador in registro:
+            trabajador = registro[id_trabajador]
+            del registro[id_trabajador]
+            break
     else:
         return jsonify({"error": "Trabajador no encontrado"}), 404
+    # Las sesiones abiertas del trabajador dejan de valer
+    sesiones.revocar_usuario(id_trabajador)
+    if getattr(trabajador, 'username', id_trabajador) != id_trabajador:
+        sesiones.revocar_usuario(trabajador.username)
     return jsonify({"mensaje": f"Trabajador con ID {id_trabajador} dado de baja."})
 
 @app.route('/trabajadores', methods=['GET'])
@@ -473,12 +550,302 @@ def descargar_pdf(usuario):
     except Exception as e:
         return jsonify({"error": f"Error al generar el PDF: {str(e)}"}), 500"""
 
+# === Endpoints de Citas ===
+@app.route('/citas/huecos', methods=['GET'])
+def huecos_libres():
+    """
+    Devuelve los próximos huecos libres de 30 minutos de un médico o de cualquier médico de una especialidad.
+
+    Parámetros (query string)
+    -------------------------
+    medico : str, opcional
+        ID del médico.
+    especialidad : str, opcional
+        Especialidad buscada (se usa si no se indica médico).
+    desde : str, opcional
+        Fecha de inicio en formato 'YYYY-MM-DD'. Por defecto, ahora.
+    dias : int, opcional
+        Número de días de la ventana de búsqueda, entre 1 y MAX_DIAS_HUECOS. Por defecto 7.
+    n : int, opcional
+        Número máximo de huecos devueltos, entre 0 y MAX_HUECOS. Por defecto 5.
+
+    Devuelve
+    --------
+    jsonify
+        Lista de huecos con el médico y la fecha/hora, o mensaje de error.
+    """
+    id_medico = request.args.get('medico')
+    especialidad = request.args.get('especialidad')
+    try:
+        desde = datetime.strptime(request.args['desde'], '%Y-%m-%d') if 'desde' in request.args else datetime.now()
+        dias = int(request.args.get('dias', 7))
+        n = int(request.args.get('n', 5))
+    except ValueError:
+        return jsonify({"error": "Parámetros 'desde', 'dias' o 'n' no válidos"}), 400
+    if not 0 < dias <= MAX_DIAS_HUECOS:
+        return jsonify({"error": f"'dias' debe estar entre 1 y {MAX_DIAS_HUECOS}"}), 400
+    if not 0 <= n <= MAX_HUECOS:
+        return jsonify({"error": f"'n' debe estar entre 0 y {MAX_HUECOS}"}), 400
+    try:
+        hasta = desde + timedelta(days=dias)
+    except OverflowError:
+        return jsonify({"error": "La ventana de búsqueda se sale del rango de fechas"}), 400
+
+    if id_medico:
+        if id_medico not in medicos:
+            return jsonify({"error": "Médico no encontrado"}), 404
+    elif not especialidad:
+        return jsonify({"error": "Debe indicar 'medico' o 'especialidad'"}), 400
+
+    huecos = gestor_citas.proximos_huecos(
+        medico=id_medico or None,
+        especialidad=especialidad,
+        medicos=medicos.values(),
+        desde=desde,
+        hasta=hasta,
+        n=n
+    )
+    return jsonify({
+        "huecos": [
+            {"medico": medico, "fecha_hora": inicio.strftime('%Y-%m-%d %H:%M')}
+            for medico, inicio in huecos
+        ]
+    })
+
+@app.route('/citas', methods=['POST'])
+@requiere_autenticacion
+def reservar_cita(usuario):
+    """
+    Reserva una cita con un médico. Un paciente solo puede pedir citas para sí mismo; médicos y enfermeros
+    pueden pedirlas para cualquier paciente (id_paciente). La cita ocupa su hueco en /citas/huecos.
+
+    Parámetros (JSON)
+    -----------------
+    medico : str
+        ID del médico.
+    fecha_hora : str
+        Fecha y hora de la cita en formato 'YYYY-MM-DD HH:MM' (p. ej. un hueco de /citas/huecos).
+    motivo : str, opcional
+        Motivo de la cita.
+    tipo : str, opcional
+        'presencial' (por defecto), 'telefonica' o 'urgencias', con su dato propio (centro, telefono_contacto
+        o nivel_prioridad).
+    id_paciente : str, opcional
+        ID del paciente (solo médicos y enfermeros; para un paciente es su propio usuario).
+
+    Devuelve
+    --------
+    jsonify
+        Cita creada (201), o mensaje de error (409 si se solapa con otra cita del médico).
+    """
+    data = request.json or {}
+    if usuario.rol == "paciente":
+        id_paciente = usuario.username
+    elif usuario.rol in ("medico", "enfermero"):
+        id_paciente = data.get('id_paciente')
+    else:
+        return jsonify({"detail": "Acceso denegado"}), 403
+
+    paciente = pacientes.get(id_paciente) if id_paciente else None
+    if not paciente:
+        return jsonify({"error": "Paciente no encontrado"}), 404
+    id_medico = data.get('medico')
+    if not id_medico or id_medico not in medicos:
+        return jsonify({"error": "Médico no encontrado"}), 404
+    tipo = str(data.get('tipo', 'presencial')).strip().lower()
+    if tipo not in TIPOS_CITA:
+        return jsonify({"error": f"Tipo de cita no válido: {tipo}"}), 400
+    try:
+        fecha_hora = datetime.strptime(str(data.get('fecha_hora')), '%Y-%m-%d %H:%M')
+    except ValueError:
+        return jsonify({"error": "'fecha_hora' debe tener el formato 'YYYY-MM-DD HH:MM'"}), 400
+
+    clase, columna_extra = TIPOS_CITA[tipo]
+    cita = clase(id_cita=f"CITA-{uuid.uuid4().hex[:10].upper()}", paciente=paciente, medico=id_medico,
+                 fecha_hora=fecha_hora, motivo=str(data.get('motivo', '')),
+                 **{columna_extra: data.get(columna_extra)})
+    try:
+        gestor_citas.añadir_cita(cita)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+    return jsonify({
+        "id_cita": cita.id_cita,
+        "tipo": tipo,
+        "paciente": id_paciente,
+        "medico": id_medico,
+        "fecha_hora": cita.fecha_hora_dt.strftime('%Y-%m-%d %H:%M'),
+        "motivo": cita.motivo,
+        "estado": cita.estado
+    }), 201
+
+# === Endpoints de Medicamentos ===
+@app.route('/medicamentos/buscar', methods=['GET'])
+def buscar_medicamento():
+    """
+    Busca un medicamento por nombre en RxNorm (en el espejo local si está configurado).
+
+    Parámetros (query string)
+    -------------------------
+    nombre : str
+        Nombre del medicamento, o comienzo del nombre con modo=prefijo.
+    modo : str, opcional
+        'insensible' (por defecto), 'exacto' o 'prefijo'. Los dos últimos necesitan el espejo local.
+    limite : int, opcional
+        Número máximo de conceptos devueltos (espejo local). Por defecto 100.
+
+    Devuelve
+    --------
+    jsonify
+        Lista de conceptos (name, rxcui, tty, language) o mensaje de error.
+    """
+    nombre = request.args.get('nombre', '')
+    modo = request.args.get('modo', 'insensible')
+    if not nombre.strip():
+        return jsonify({"error": "Debe indicar 'nombre'"}), 400
+    try:
+        limite = int(request.args.get('limite', 100))
+    except ValueError:
+        return jsonify({"error": "Parámetro 'limite' no válido"}), 400
+    if limite < 0:
+        return jsonify({"error": "'limite' no puede ser negativo"}), 400
+
+    cliente = obtener_cliente()
+    try:
+        if cliente.espejo is not None:
+            conceptos = cliente.espejo.buscar(nombre, modo, limite)
+            if not conceptos and modo == 'insensible' and not cliente.solo_espejo:
+                conceptos = cliente.buscar(nombre)
+        elif modo != 'insensible':
+            return jsonify({"error": f"El modo '{modo}' necesita el espejo local de RxNorm"}), 400
+        else:
+            conceptos = cliente.buscar(nombre)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except requests.exceptions.RequestException as e:
+        return jsonify({"error": f"No se puede completar la solicitud: {e}"}), 502
+    return jsonify({"medicamentos": conceptos[:limite]})
+
+@app.route('/medicamentos/info', methods=['POST'])
+def informacion_medicamentos():
+    """
+    Consulta varios medicamentos a la vez en RxNorm. Los nombres se resuelven en paralelo con el pool de
+    hilos del cliente compartido, así que la petición tarda lo que la consulta más lenta y no la suma.
+
+    Cuerpo (JSON)
+    -------------
+    medicamentos : List[str]
+        Nombres de los medicamentos (también se acepta directamente la lista).
+
+    Devuelve
+    --------
+    jsonify
+        Un resultado por nombre, en el orden pedido: {"nombre", "conceptos"} o {"nombre", "error"}.
+    """
+    data = request.get_json(silent=True)
+    nombres = data.get('medicamentos') if isinstance(data, dict) else data
+    if not isinstance(nombres, list) or not nombres or not all(isinstance(n, str) for n in nombres):
+        return jsonify({"error": "Debe indicar 'medicamentos' como una lista de nombres"}), 400
+    if len(nombres) > MAX_MEDICAMENTOS_LOTE:
+        return jsonify({"error": f"Como máximo {MAX_MEDICAMENTOS_LOTE} medicamentos por petición"}), 400
+
+    encontrados = obtener_cliente().buscar_varios(nombres)
+    resultados = []
+    for nombre in nombres:
+        conceptos = encontrados[nombre]
+        if isinstance(conceptos, ValueError):
+            resultados.append({"nombre": nombre, "error": str(conceptos)})
+        elif isinstance(conceptos, Exception):
+            resultados.append({"nombre": nombre, "error": f"No se puede completar la solicitud: {conceptos}"})
+        elif not conceptos:
+            resultados.append({"nombre": nombre, "error": "El medicamento no existe o no se encuentra en RxNorm"})
+        else:
+            resultados.append({"nombre": nombre, "conceptos": conceptos})
+    return jsonify({"resultados": resultados})
+
+# === Endpoints de Urgencias ===
+@app.route('/urgencias/llegada', methods=['POST'])
+@requiere_autenticacion
+def llegada_urgencias(usuario):
+    """
+    Registra la llegada de un paciente a urgencias y lo coloca en la cola de triaje según su estado.
+
+    Parámetros
+    ----------
+    usuario : object
+        Objeto con el rol del usuario autenticado (médico o enfermero).
+
+    Devuelve
+    --------
+    jsonify
+        Entrada de triaje creada o mensaje de error.
+    """
+    if usuario.rol not in ("medico", "enfermero"):
+        return jsonify({"detail": "Acceso denegado"}), 403
+
+    data = request.json or {}
+    paciente = pacientes.get(data.get('id_paciente'))
+    if not paciente:
+        return jsonify({"error": "Paciente no encontrado"}), 404
+    try:
+        entrada = gestor_citas.triaje.añadir(paciente)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"mensaje": f"Paciente {paciente.nombre} en espera de triaje.", "triaje": entrada.to_dict()})
+
+@app.route('/urgencias/siguiente', methods=['POST'])
+@requiere_autenticacion
+def siguiente_paciente_urgencias(usuario):
+    """
+    Saca de la cola de triaje al siguiente paciente que debe ser atendido (mayor prioridad y,
+    a igualdad de prioridad, el que llegó antes).
+
+    Parámetros
+    ----------
+    usuario : object
+        Objeto con el rol del usuario autenticado (médico o enfermero).
+
+    Devuelve
+    --------
+    jsonify
+        Datos del siguiente paciente o mensaje si la cola está vacía.
+    """
+    if usuario.rol not in ("medico", "enfermero"):
+        return jsonify({"detail": "Acceso denegado"}), 403
+
+    entrada = gestor_citas.siguiente_urgencia()
+    if entrada is None:
+        return jsonify({"mensaje": "No hay pacientes en espera"}), 404
+    return jsonify({"siguiente": entrada.to_dict(), "en_espera": len(gestor_citas.triaje)})
+
 # === Endpoint de Prueba ===
 @app.route("/test", methods=["GET"])
 def test():
     """Endpoint de prueba para verificar que la API está funcionando."""
     return jsonify({"mensaje": "API funcionando correctamente"}), 200
 
+# === Datos de Ejemplo ===
+def cargar_datos_ejemplo() -> int:
+    """
+    Carga en los registros de la API los pacientes, médicos, enfermeros y auxiliares de ejemplo
+    (datos_ejemplo.py). El módulo de datos solo se importa al llamar a esta función, nunca al importar la API.
+
+    Devuelve
+    --------
+    int
+        Número de personas cargadas.
+    """
+    import datos_ejemplo
+
+    cargadas = 0
+    for registro, datos in ((pacientes, datos_ejemplo.PACIENTES), (medicos, datos_ejemplo.MEDICOS),
+                            (enfermeros, datos_ejemplo.ENFERMEROS), (auxiliares, datos_ejemplo.AUXILIARES)):
+        for clave, persona in datos.items():
+            registro[clave] = persona
+            cargadas += 1
+    return cargadas
+
 # === Iniciar la Aplicación ===
 if __name__ == "__main__":
+    if os.environ.get('PROSALUD_DATOS_EJEMPLO') == '1':
+        cargar_datos_ejemplo()
     app.run(debug=True, port=5000)
\ No newline at end of file
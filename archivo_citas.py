@@ -0,0 +1,200 @@
+import json
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Tuple
+import numpy as np
+from citas import Cita, TEXTOS_ESTADO, CODIGOS_ESTADO, ESTADOS_CANCELADOS, codigo_estado
+from almacen_citas import clave_persona
+
+EPOCA = datetime(1970, 1, 1)
+MINUTOS_DIA = 24 * 60
+
+# Columna -> tipo de NumPy con el que se guarda
+COLUMNAS = {
+    'id_cita': np.int64,
+    'medico': np.int32,
+    'paciente': np.int32,
+    'minutos': np.int64,
+    'tipo': np.int8,
+    'estado': np.int8,
+    'atendido': np.bool_,
+}
+
+
+class ArchivoCitas:
+    '''
+    Archivo en columnas de las citas ya cerradas (atendidas o canceladas). Cada atributo de la cita
+    se guarda en un array de NumPy y los valores repetidos (médico, paciente, tipo) se codifican como
+    enteros con un diccionario, de forma que los informes se calculan con operaciones vectorizadas
+    en lugar de recorrer objetos Cita.
+
+    Atributos
+    ---------
+    columnas : Dict[str, np.ndarray]
+        id_cita, medico, paciente, minutos (desde 1970-01-01), tipo, estado y atendido.
+    medicos / pacientes / tipos : List[Hashable]
+        Valor original de cada código (el código es la posición en la lista).
+
+    Métodos
+    -------
+    añadir(citas) -> int
+        Congela un grupo de citas y las añade al final de las columnas.
+    citas_por_medico_y_semana() -> Dict[Tuple[Hashable, date], int]
+        Número de citas por médico y semana (lunes de la semana).
+    tasa_cancelacion_por_tipo() -> Dict[str, float]
+        Proporción de citas canceladas por tipo de cita.
+    guardar(directorio) / cargar(directorio, mmap=True)
+        Persistencia en ficheros .npy que se pueden abrir con memory-map.
+    '''
+
+    def __init__(self):
+        '''
+        Inicializa un archivo vacío.
+        '''
+        self.columnas: Dict[str, np.ndarray] = {nombre: np.empty(0, dtype=tipo) for nombre, tipo in COLUMNAS.items()}
+        self.medicos: List[Hashable] = []
+        self.pacientes: List[Hashable] = []
+        self.tipos: List[str] = []
+        self._codigos_medico: Dict[Hashable, int] = {}
+        self._codigos_paciente: Dict[Hashable, int] = {}
+        self._codigos_tipo: Dict[str, int] = {}
+
+    @staticmethod
+    def _codificar(valor: Hashable, codigos: Dict[Hashable, int], valores: List[Hashable]) -> int:
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(valores)
+            valores.append(valor)
+        return codigo
+
+    def añadir(self, citas: Iterable[Cita]) -> int:
+        '''
+        Congela las citas en columnas y las añade al archivo.
+
+        Parámetros
+        ----------
+        citas : Iterable[Cita]
+            Citas cerradas que se quieren archivar. Su id_cita debe ser un entero.
+
+        Devuelve
+        --------
+        int
+            Número de citas añadidas.
+        '''
+        nuevas = {nombre: [] for nombre in COLUMNAS}
+        for cita in citas:
+            nuevas['id_cita'].append(int(cita.id_cita))
+            nuevas['medico'].append(self._codificar(clave_persona(cita.medico), self._codigos_medico, self.medicos))
+            nuevas['paciente'].append(self._codificar(clave_persona(cita.paciente), self._codigos_paciente, self.pacientes))
+            nuevas['minutos'].append(int((cita.fecha_hora_dt - EPOCA).total_seconds()) // 60)
+            nuevas['tipo'].append(self._codificar(type(cita).__name__, self._codigos_tipo, self.tipos))
+            nuevas['estado'].append(cita.codigo_estado)
+            nuevas['atendido'].append(bool(cita.atendido))
+        cantidad = len(nuevas['id_cita'])
+        if cantidad:
+            for nombre, tipo in COLUMNAS.items():
+                self.columnas[nombre] = np.concatenate((self.columnas[nombre], np.asarray(nuevas[nombre], dtype=tipo)))
+        return cantidad
+
+    def __len__(self) -> int:
+        return len(self.columnas['id_cita'])
+
+    def citas_por_medico_y_semana(self) -> Dict[Tuple[Hashable, date], int]:
+        '''
+        Cuenta las citas archivadas por médico y semana.
+
+        Devuelve
+        --------
+        Dict[Tuple[Hashable, date], int]
+            (médico, lunes de la semana) -> número de citas.
+        '''
+        if not len(self):
+            return {}
+        # El 1970-01-01 fue jueves: sumando 3 días las semanas empiezan en lunes
+        semanas = (self.columnas['minutos'] // MINUTOS_DIA + 3) // 7
+        claves = semanas * len(self.medicos) + self.columnas['medico']
+        unicas, cuentas = np.unique(claves, return_counts=True)
+        semanas_unicas, medicos_unicos = np.divmod(unicas, len(self.medicos))
+        return {
+            (self.medicos[medico], (EPOCA + timedelta(days=int(semana) * 7 - 3)).date()): int(cuenta)
+            for semana, medico, cuenta in zip(semanas_unicas, medicos_unicos, cuentas)
+        }
+
+    def tasa_cancelacion_por_tipo(self) -> Dict[str, float]:
+        '''
+        Calcula la proporción de citas canceladas de cada tipo.
+
+        Devuelve
+        --------
+        Dict[str, float]
+            Nombre de la clase de cita -> proporción de canceladas (entre 0 y 1).
+        '''
+        if not len(self):
+            return {}
+        codigos_cancelados = [CODIGOS_ESTADO[estado] for estado in ESTADOS_CANCELADOS]
+        canceladas = np.isin(self.columnas['estado'], codigos_cancelados)
+        totales = np.bincount(self.columnas['tipo'], minlength=len(self.tipos))
+        cancel = np.bincount(self.columnas['tipo'], weights=canceladas, minlength=len(self.tipos))
+        return {tipo: float(cancel[codigo] / totales[codigo]) for codigo, tipo in enumerate(self.tipos) if totales[codigo]}
+
+    def guardar(self, directorio: str) -> None:
+        '''
+        Guarda cada columna en un fichero .npy y los diccionarios de códigos en meta.json.
+
+        Parámetros
+        ----------
+        directorio : str
+            Directorio de destino (se crea si no existe).
+        '''
+        os.makedirs(directorio, exist_ok=True)
+        for nombre, columna in self.columnas.items():
+            np.save(os.path.join(directorio, f'{nombre}.npy'), columna)
+        meta = {
+            'medicos': self.medicos,
+            'pacientes': self.pacientes,
+            'tipos': self.tipos,
+            'estados': list(TEXTOS_ESTADO),
+        }
+        with open(os.path.join(directorio, 'meta.json'), 'w', encoding='utf-8') as fichero:
+            json.dump(meta, fichero, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, directorio: str, mmap: bool = True) -> 'ArchivoCitas':
+        '''
+        Carga un archivo guardado con `guardar`.
+
+        Parámetros
+        ----------
+        directorio : str
+            Directorio donde se guardó el archivo.
+        mmap : bool, opcional
+            Si es True (por defecto) las columnas se abren con memory-map en solo lectura, sin leerlas enteras.
+
+        Devuelve
+        --------
+        ArchivoCitas
+            Archivo cargado.
+        '''
+        archivo = cls()
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as fichero:
+            meta = json.load(fichero)
+        for nombre in COLUMNAS:
+            archivo.columnas[nombre] = np.load(os.path.join(directorio, f'{nombre}.npy'), mmap_mode='r' if mmap else None)
+        archivo.medicos = meta['medicos']
+        archivo.pacientes = meta['pacientes']
+        archivo.tipos = meta['tipos']
+        archivo._codigos_medico = {valor: codigo for codigo, valor in enumerate(archivo.medicos)}
+        archivo._codigos_paciente = {valor: codigo for codigo, valor in enumerate(archivo.pacientes)}
+        archivo._codigos_tipo = {valor: codigo for codigo, valor in enumerate(archivo.tipos)}
+        # Los códigos de estado del fichero se traducen a los de este proceso si no coinciden
+        traduccion = np.array([codigo_estado(estado) for estado in meta['estados']], dtype=np.int8)
+        if not np.array_equal(traduccion, np.arange(len(traduccion))):
+            archivo.columnas['estado'] = traduccion[archivo.columnas['estado']]
+        return archivo
+
+
+def minutos_a_fecha(minutos: int) -> datetime:
+    '''
+    Convierte minutos desde 1970-01-01 (columna `minutos`) de nuevo en datetime.
+    '''
+    return EPOCA + timedelta(minutes=int(minutos))
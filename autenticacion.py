@@ -0,0 +1,175 @@
+"""
+Sesiones de la API: la contraseña se comprueba con bcrypt una sola vez y a partir de ahí las peticiones
+se autentican con un token de sesión de vida corta guardado en memoria (caché con caducidad y LRU).
+
+- Con `Authorization: Bearer <token>` la sesión se busca directamente por el token.
+- Con autenticación básica (usuario y contraseña en cada petición), las credenciales ya verificadas se
+  reconocen por un HMAC con una clave aleatoria del proceso, sin volver a pasar por bcrypt. La
+  contraseña nunca se guarda.
+
+Al dar de baja a un usuario se revocan todas sus sesiones.
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set
+
+
+class Sesion:
+    """
+    Sesión de un usuario autenticado.
+
+    Atributos
+    ---------
+    token : str
+        Token que identifica la sesión.
+    username : str
+        Usuario autenticado.
+    rol : str
+        Rol del usuario (paciente, medico, enfermero, ...).
+    expira : float
+        Instante (según el reloj de la caché) a partir del cual la sesión deja de ser válida.
+    """
+
+    __slots__ = ('token', 'username', 'rol', 'expira', 'credencial')
+
+    def __init__(self, token: str, username: str, rol: str, expira: float, credencial: Optional[bytes] = None):
+        self.token = token
+        self.username = username
+        self.rol = rol
+        self.expira = expira
+        self.credencial = credencial
+
+
+class CacheSesiones:
+    """
+    Caché de sesiones en memoria con caducidad (TTL) y capacidad máxima (se expulsa la menos usada).
+
+    Atributos
+    ---------
+    duracion : float
+        Segundos de validez de cada sesión desde que se emite.
+    capacidad : int
+        Número máximo de sesiones guardadas.
+    """
+
+    def __init__(self, duracion: float = 900, capacidad: int = 10_000, reloj: Callable[[], float] = time.monotonic):
+        """
+        Parámetros
+        ----------
+        duracion : float, opcional
+            Validez de las sesiones en segundos. Por defecto 900 (15 minutos).
+        capacidad : int, opcional
+            Sesiones máximas en memoria. Por defecto 10000.
+        reloj : Callable[[], float], opcional
+            Función que devuelve el instante actual en segundos. Por defecto time.monotonic.
+        """
+        self.duracion = duracion
+        self.capacidad = capacidad
+        self._reloj = reloj
+        self._clave = secrets.token_bytes(32)
+        self._sesiones: 'OrderedDict[str, Sesion]' = OrderedDict()
+        self._por_credencial: Dict[bytes, str] = {}
+        self._por_usuario: Dict[str, Set[str]] = {}
+        self._cerrojo = threading.Lock()
+
+    def _credencial(self, username: str, password: str) -> bytes:
+        return hmac.new(self._clave, f'{username}\0{password}'.encode('utf-8'), hashlib.sha256).digest()
+
+    def _quitar(self, token: str) -> None:
+        sesion = self._sesiones.pop(token)
+        if sesion.credencial is not None and self._por_credencial.get(sesion.credencial) == token:
+            del self._por_credencial[sesion.credencial]
+        tokens = self._por_usuario.get(sesion.username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._por_usuario[sesion.username]
+
+    def _vigente(self, token: Optional[str]) -> Optional[Sesion]:
+        sesion = self._sesiones.get(token) if token is not None else None
+        if sesion is None:
+            return None
+        if sesion.expira <= self._reloj():
+            self._quitar(token)
+            return None
+        self._sesiones.move_to_end(token)
+        return sesion
+
+    def emitir(self, username: str, rol: str, password: Optional[str] = None) -> Sesion:
+        """
+        Crea una sesión para un usuario cuyas credenciales ya se han verificado.
+
+        Parámetros
+        ----------
+        username : str
+            Usuario autenticado.
+        rol : str
+            Rol del usuario.
+        password : str, opcional
+            Contraseña verificada. Si se indica, las siguientes peticiones con autenticación básica y las
+            mismas credenciales reutilizan esta sesión (ver `por_credencial`).
+
+        Devuelve
+        --------
+        Sesion
+            Sesión nueva.
+        """
+        credencial = self._credencial(username, password) if password is not None else None
+        sesion = Sesion(secrets.token_urlsafe(32), username, rol, self._reloj() + self.duracion, credencial)
+        with self._cerrojo:
+            self._sesiones[sesion.token] = sesion
+            if credencial is not None:
+                self._por_credencial[credencial] = sesion.token
+            self._por_usuario.setdefault(username, set()).add(sesion.token)
+            while len(self._sesiones) > self.capacidad:
+                self._quitar(next(iter(self._sesiones)))
+        return sesion
+
+    def validar(self, token: str) -> Optional[Sesion]:
+        """
+        Devuelve la sesión de un token, o None si no existe, ha caducado o se ha revocado.
+        """
+        with self._cerrojo:
+            return self._vigente(token)
+
+    def por_credencial(self, username: str, password: str) -> Optional[Sesion]:
+        """
+        Devuelve la sesión vigente emitida para estas credenciales, o None si hay que verificarlas con bcrypt.
+        """
+        credencial = self._credencial(username, password)
+        with self._cerrojo:
+            return self._vigente(self._por_credencial.get(credencial))
+
+    def restante(self, sesion: Sesion) -> float:
+        """
+        Segundos de validez que le quedan a una sesión (0 si ya ha caducado).
+        """
+        return max(0.0, sesion.expira - self._reloj())
+
+    def revocar(self, token: str) -> bool:
+        """
+        Revoca una sesión. Devuelve True si existía.
+        """
+        with self._cerrojo:
+            if token not in self._sesiones:
+                return False
+            self._quitar(token)
+            return True
+
+    def revocar_usuario(self, username: str) -> int:
+        """
+        Revoca todas las sesiones de un usuario (por ejemplo, al darlo de baja). Devuelve cuántas había.
+        """
+        with self._cerrojo:
+            tokens = list(self._por_usuario.get(username, ()))
+            for token in tokens:
+                self._quitar(token)
+            return len(tokens)
+
+    def __len__(self) -> int:
+        return len(self._sesiones)
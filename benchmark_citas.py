@@ -0,0 +1,136 @@
+"""
+Benchmark de la creación de citas: compara la construcción una a una con strptime (como se hacía antes)
+con la importación masiva de GestorCitas.importar_citas, que lee el fichero fila a fila y convierte
+las fechas con parsear_fecha_hora. También mide los bytes por cita con la representación anterior
+(__dict__ y estado como cadena) y con la actual (__slots__ y estado como código).
+
+Uso:
+    python benchmark_citas.py [numero_de_citas]
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from citas import FORMATO_FECHA_HORA, parsear_fecha_hora
+from Gestorcitas import CitaPresencial, CitaTelefonica, CitaUrgencias, GestorCitas
+
+
+def generar_filas(cantidad: int) -> list:
+    """
+    Genera filas de citas de un año, repartidas entre 50 médicos y en huecos de 30 minutos.
+    """
+    tipos = ['presencial', 'telefonica', 'urgencias']
+    filas = []
+    for i in range(cantidad):
+        tipo = tipos[i % 3]
+        extra = {'presencial': 'CENTRO001', 'telefonica': '600000000', 'urgencias': 'alta'}[tipo]
+        filas.append({
+            'tipo': tipo,
+            'id_cita': str(i),
+            'paciente': f'PAC{random.randint(1, 20000)}',
+            'medico': f'MED{random.randint(1, 50):03d}',
+            'fecha_hora': f'2024 {random.randint(1, 12):02d} {random.randint(1, 28):02d} '
+                          f'{random.randint(8, 19):02d}:{random.choice(("00", "30"))}',
+            'motivo': 'Revisión',
+            'extra': extra,
+        })
+    return filas
+
+
+def construir_con_strptime(filas: list) -> GestorCitas:
+    """
+    Construcción una a una con strptime en cada cita (comportamiento anterior de Cita.__init__).
+    """
+    clases = {'presencial': CitaPresencial, 'telefonica': CitaTelefonica, 'urgencias': CitaUrgencias}
+    gestor = GestorCitas()
+    for fila in filas:
+        fecha_hora = datetime.strptime(fila['fecha_hora'], FORMATO_FECHA_HORA)
+        gestor += clases[fila['tipo']](int(fila['id_cita']), fila['paciente'], fila['medico'],
+                                       fecha_hora, fila['motivo'], fila['extra'])
+    return gestor
+
+
+class CitaConDict:
+    """
+    Réplica de la representación anterior de CitaPresencial: atributos en __dict__ y estado como cadena.
+    """
+
+    def __init__(self, id_cita, paciente, medico, fecha_hora, motivo, centro):
+        self.id_cita = id_cita
+        self.paciente = paciente
+        self.medico = medico
+        self.motivo = motivo
+        self.fecha_hora_dt = fecha_hora
+        self.estado = 'pendiente'
+        self.atendido = False
+        self.centro = centro
+
+
+def bytes_por_cita(clase, filas: list) -> float:
+    """
+    Mide con tracemalloc la memoria que ocupan las citas (sin contar los datos compartidos entre ellas).
+    """
+    fechas = [parsear_fecha_hora(fila['fecha_hora']) for fila in filas]
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    citas = [clase(i, fila['paciente'], fila['medico'], fecha, fila['motivo'], fila['extra'])
+             for i, (fila, fecha) in enumerate(zip(filas, fechas))]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (despues - antes) / len(citas)
+
+
+def main() -> None:
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    filas = generar_filas(cantidad)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'citas.csv')
+        with open(ruta, 'w', encoding='utf-8', newline='') as fichero:
+            escritor = csv.DictWriter(fichero, fieldnames=['tipo', 'id_cita', 'paciente', 'medico',
+                                                           'fecha_hora', 'motivo', 'centro',
+                                                           'telefono_contacto', 'nivel_prioridad'])
+            escritor.writeheader()
+            for fila in filas:
+                columna = {'presencial': 'centro', 'telefonica': 'telefono_contacto',
+                           'urgencias': 'nivel_prioridad'}[fila['tipo']]
+                datos = {k: v for k, v in fila.items() if k != 'extra'}
+                datos[columna] = fila['extra']
+                escritor.writerow(datos)
+
+        inicio = time.perf_counter()
+        for fila in filas:
+            datetime.strptime(fila['fecha_hora'], FORMATO_FECHA_HORA)
+        t_strptime = time.perf_counter() - inicio
+
+        parsear_fecha_hora.cache_clear()
+        inicio = time.perf_counter()
+        for fila in filas:
+            parsear_fecha_hora(fila['fecha_hora'])
+        t_parser = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        construir_con_strptime(filas)
+        t_objetos = time.perf_counter() - inicio
+
+        parsear_fecha_hora.cache_clear()
+        inicio = time.perf_counter()
+        GestorCitas().importar_citas(ruta)
+        t_importar = time.perf_counter() - inicio
+
+    print(f'Citas: {cantidad}')
+    print(f'Solo fechas  - strptime: {t_strptime:.3f} s | parsear_fecha_hora: {t_parser:.3f} s '
+          f'(x{t_strptime / t_parser:.1f})')
+    print(f'Carga total  - una a una con strptime: {t_objetos:.3f} s | importar_citas (CSV): {t_importar:.3f} s')
+    print(f'Memoria      - __dict__: {bytes_por_cita(CitaConDict, filas):.0f} B/cita | '
+          f'__slots__: {bytes_por_cita(CitaPresencial, filas):.0f} B/cita')
+
+
+if __name__ == '__main__':
+    main()
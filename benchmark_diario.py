@@ -0,0 +1,83 @@
+"""
+Benchmark del diario de operaciones con instantáneas (diario.py): mide el rendimiento de escritura
+y el tiempo de recuperación al arrancar, recuperando solo desde el diario y desde instantánea + cola.
+
+Uso:
+    python benchmark_diario.py [operaciones ...]   (por defecto 100000 y 1000000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from diario import Diario
+
+
+class PacienteLigero:
+    """
+    Objeto de prueba con el tamaño aproximado de los datos básicos de un paciente.
+    """
+
+    def __init__(self, id: str):
+        self.id = id
+        self.username = f'user{id}'
+        self.nombre = 'Nombre'
+        self.apellido = 'Apellido'
+        self.edad = 40
+        self.estado = 'leve'
+        self.medico_asignado = None
+
+
+def escribir(directorio: str, operaciones: int, intervalo_snapshot: int) -> float:
+    """
+    Escribe `operaciones` altas, asignaciones de médico y SIPs y devuelve las operaciones por segundo.
+    """
+    diario = Diario(directorio, intervalo_snapshot=intervalo_snapshot)
+    pacientes = diario.registro('pacientes')
+    sips = diario.registro('sips')
+    inicio = time.perf_counter()
+    for i in range(operaciones):
+        clave = f'PAC{i // 3:07d}'
+        if i % 3 == 0:
+            pacientes[clave] = PacienteLigero(clave)
+        elif i % 3 == 1:
+            paciente = pacientes[clave]
+            paciente.medico_asignado = 'MED001'
+            pacientes.registrar('asignar_medico', clave, paciente)
+        else:
+            sips.registrar('crear_sip', clave, f'SIP-{i:010X}')
+    duracion = time.perf_counter() - inicio
+    diario.cerrar()
+    return operaciones / duracion
+
+
+def recuperar(directorio: str) -> float:
+    """
+    Abre el diario y devuelve los segundos que tarda en recuperar el estado.
+    """
+    inicio = time.perf_counter()
+    diario = Diario(directorio)
+    duracion = time.perf_counter() - inicio
+    diario.cerrar()
+    return duracion
+
+
+def main() -> None:
+    tamaños = [int(valor) for valor in sys.argv[1:]] or [100_000, 1_000_000]
+    for operaciones in tamaños:
+        with tempfile.TemporaryDirectory() as solo_diario, tempfile.TemporaryDirectory() as con_snapshot:
+            # Sin instantáneas: al arrancar hay que repetir todo el diario
+            ops_diario = escribir(solo_diario, operaciones, intervalo_snapshot=operaciones + 1)
+            # Instantánea cada 10% de las operaciones: al arrancar solo se repite la cola
+            ops_snapshot = escribir(con_snapshot, operaciones, intervalo_snapshot=max(1, operaciones // 10))
+            t_diario = recuperar(solo_diario)
+            t_snapshot = recuperar(con_snapshot)
+            tamaño = os.path.getsize(os.path.join(solo_diario, 'diario.log')) / 1e6
+        print(f'Operaciones: {operaciones}')
+        print(f'  Escritura   - solo diario: {ops_diario:,.0f} ops/s | con instantáneas: {ops_snapshot:,.0f} ops/s')
+        print(f'  Recuperación - solo diario ({tamaño:.1f} MB): {t_diario:.3f} s | instantánea + cola: {t_snapshot:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark del ingreso de muchos pacientes a la vez (ManejoHabitaciones): compara asignarlos uno a uno con
+asignar_paciente_a_habitacion buscando a mano una habitación limpia con sitio (como se hacía antes), uno a
+uno buscando la habitación en el índice de camas libres, y el ingreso en bloque (ingresar_en_bloque).
+
+Uso:
+    python benchmark_habitaciones.py [habitaciones] [pacientes]   (por defecto 10000 y 5000)
+
+El método anterior recorre las habitaciones por cada paciente y tardaría demasiado, así que se mide sobre
+una muestra y se extrapola.
+"""
+
+import contextlib
+import io
+import random
+import sys
+import time
+
+from enfermero import Enfermero
+from habitacion import Habitacion
+from ManejoHabitaciones import ManejoHabitaciones
+from paciente import Paciente
+from persona import hash_diferido
+
+MUESTRA_ANTERIOR = 200
+ENFERMEROS = 100
+
+
+def preparar(n_habitaciones: int, n_pacientes: int) -> tuple:
+    """
+    Crea un gestor con habitaciones de 1 a 4 camas (60 % limpias) repartidas entre enfermeros, y los
+    pacientes a ingresar con estados al azar.
+    """
+    random.seed(0)
+    with hash_diferido():
+        enfermeros = [Enfermero(f'ENF{i:03d}', 'Nombre', 'Apellido', 35, 'F', 'noche', 40, 2000, 'Planta', 5,
+                                f'enfermero{i}', 'clave') for i in range(ENFERMEROS)]
+        pacientes = [Paciente(f'PAC{i:05d}', f'paciente{i}', None, 'Nombre', 'Apellido', 50, 'M',
+                              random.choice(('grave', 'moderado', 'leve'))) for i in range(n_pacientes)]
+    manejo = ManejoHabitaciones()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(n_habitaciones):
+            manejo.agregar_habitacion(Habitacion(f'H{i:05d}', random.randint(1, 4), limpia=random.random() < 0.6))
+            manejo.asignar_habitacion_a_enfermero(f'H{i:05d}', enfermeros[i % ENFERMEROS])
+    return manejo, pacientes
+
+
+def uno_a_uno(manejo: ManejoHabitaciones, pacientes: list, buscar) -> int:
+    """
+    Ingresa los pacientes uno a uno con asignar_paciente_a_habitacion. Devuelve cuántos han ingresado.
+    """
+    ingresados = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for paciente in pacientes:
+            habitacion = buscar(manejo)
+            if habitacion is None:
+                break
+            manejo.asignar_paciente_a_habitacion(paciente, habitacion.numero_habitacion,
+                                                 manejo.enfermeros[habitacion.numero_habitacion])
+            ingresados += 1
+    return ingresados
+
+
+def buscar_recorriendo(manejo: ManejoHabitaciones):
+    return next((habitacion for habitacion in manejo.habitaciones.values()
+                 if habitacion.limpia and len(habitacion) < habitacion.capacidad), None)
+
+
+def main() -> None:
+    n_habitaciones = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_pacientes = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    print(f'Habitaciones: {n_habitaciones} | pacientes: {n_pacientes}')
+
+    manejo, pacientes = preparar(n_habitaciones, n_pacientes)
+    muestra = pacientes[-MUESTRA_ANTERIOR:]
+    # Se ocupan antes, en el mismo orden en que las encuentra el recorrido, las camas que habría ocupado el resto
+    # de pacientes, para medir la muestra al final (cuando cada búsqueda recorre más habitaciones llenas)
+    previos = iter(pacientes[:-MUESTRA_ANTERIOR])
+    for habitacion in manejo.habitaciones.values():
+        if habitacion.limpia:
+            for paciente in [paciente for _, paciente in zip(range(habitacion.camas_libres), previos)]:
+                habitacion.añadir_pacientes(paciente)
+    inicio = time.perf_counter()
+    uno_a_uno(manejo, muestra, buscar_recorriendo)
+    t_muestra = time.perf_counter() - inicio
+    print(f'  Uno a uno recorriendo habitaciones (estimado): {t_muestra / len(muestra) * n_pacientes:8.2f} s')
+
+    manejo, pacientes = preparar(n_habitaciones, n_pacientes)
+    inicio = time.perf_counter()
+    ingresados = uno_a_uno(manejo, pacientes, lambda manejo: manejo.buscar_habitacion_libre())
+    print(f'  Uno a uno con el índice de camas libres:       {time.perf_counter() - inicio:8.2f} s ({ingresados} ingresados)')
+
+    manejo, pacientes = preparar(n_habitaciones, n_pacientes)
+    inicio = time.perf_counter()
+    informe = manejo.ingresar_en_bloque(pacientes)
+    print(f'  Ingreso en bloque:                             {time.perf_counter() - inicio:8.2f} s '
+          f'({len(informe["asignados"])} ingresados, {len(informe["sin_cama"])} sin cama, '
+          f'{informe["habitaciones_usadas"]} habitaciones)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark del arranque en frío de la API: mide con `python -X importtime` lo que cuesta importar
+apis_prosalud y lo compara con importar además los datos de ejemplo (lo que antes se pagaba en cada
+importación), con y sin calcular los hashes bcrypt de sus contraseñas.
+
+Uso:
+    python benchmark_importacion.py [repeticiones] [modulos_mostrados]   (por defecto 5 y 10)
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ESCENARIOS = {
+    'API sola': 'import apis_prosalud',
+    'API + datos de ejemplo': 'import apis_prosalud, datos_ejemplo',
+    'API + datos de ejemplo con hashes': (
+        'import apis_prosalud, datos_ejemplo, persona;'
+        'persona.hashear_pendientes([*datos_ejemplo.PACIENTES.values(), *datos_ejemplo.MEDICOS.values(),'
+        ' *datos_ejemplo.ENFERMEROS.values(), *datos_ejemplo.AUXILIARES.values()], procesos=1)'
+    ),
+}
+
+
+def ejecutar(codigo: str) -> tuple:
+    """
+    Ejecuta el código en un intérprete nuevo y devuelve (segundos totales, informe de -X importtime).
+    """
+    entorno = dict(os.environ, PROSALUD_ALMACENAMIENTO='memoria')
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], capture_output=True, text=True,
+                             env=entorno, cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    return time.perf_counter() - inicio, proceso.stderr
+
+
+def modulos_propios(informe: str) -> list:
+    """
+    Extrae del informe de -X importtime los módulos del proyecto con su tiempo acumulado (µs).
+    """
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    propios = {nombre[:-3] for nombre in os.listdir(directorio) if nombre.endswith('.py')}
+    resultado = []
+    for linea in informe.splitlines():
+        if not linea.startswith('import time:') or '|' not in linea:
+            continue
+        _, acumulado, modulo = linea[len('import time:'):].split('|')
+        modulo = modulo.strip()
+        if acumulado.strip().isdigit() and modulo in propios:
+            resultado.append((int(acumulado), modulo))
+    return sorted(resultado, reverse=True)
+
+
+def main() -> None:
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    mostrados = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    ejecutar('pass')  # Calienta la caché de bytecode y del sistema de ficheros
+    for nombre, codigo in ESCENARIOS.items():
+        tiempos = []
+        for _ in range(repeticiones):
+            segundos, informe = ejecutar(codigo)
+            tiempos.append(segundos)
+        print(f'{nombre}: mediana {statistics.median(tiempos) * 1000:.0f} ms ({repeticiones} arranques)')
+        for acumulado, modulo in modulos_propios(informe)[:mostrados]:
+            print(f'    {acumulado / 1000:8.1f} ms  {modulo}')
+
+
+if __name__ == '__main__':
+    main()
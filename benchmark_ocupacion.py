@@ -0,0 +1,79 @@
+"""
+Benchmark del historial de ocupación (HistorialOcupacion): un año de ingresos y altas en las habitaciones de
+un centro, y la serie horaria de todo el año (8760 puntos) por centro, por planta y por habitación. Se compara
+con recorrer los eventos en cada punto (medido sobre una muestra y extrapolado) y se comprueba que dan lo
+mismo.
+
+Uso:
+    python benchmark_ocupacion.py [habitaciones] [plantas]   (por defecto 1000 y 10)
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from ocupacion_habitaciones import HistorialOcupacion
+
+INICIO = datetime(2025, 1, 1)
+FIN = datetime(2026, 1, 1)
+PASO = timedelta(hours=1)
+MUESTRA_RECORRIDO = 50
+
+
+def generar(n_habitaciones: int, n_plantas: int) -> tuple:
+    """
+    Genera estancias de 1 a 10 días separadas por huecos de hasta 2 días en habitaciones de 1 a 4 camas.
+    Devuelve el historial y la lista de eventos (habitación, instante, cambio) en orden cronológico.
+    """
+    random.seed(0)
+    historial = HistorialOcupacion()
+    eventos = []
+    for i in range(n_habitaciones):
+        numero = f'H{i:05d}'
+        historial.añadir_habitacion(numero, planta=f'Planta{i % n_plantas}', centro='C001')
+        for _ in range(random.randint(1, 4)):
+            instante = INICIO + timedelta(minutes=random.randint(0, 2 * 24 * 60))
+            while instante < FIN:
+                alta = instante + timedelta(minutes=random.randint(24 * 60, 10 * 24 * 60))
+                eventos.append((numero, instante, 1))
+                eventos.append((numero, alta, -1))
+                instante = alta + timedelta(minutes=random.randint(30, 2 * 24 * 60))
+    eventos.sort(key=lambda evento: evento[1])
+    for numero, instante, cambio in eventos:
+        historial.registrar(numero, instante, cambio)
+    return historial, eventos
+
+
+def main() -> None:
+    n_habitaciones = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_plantas = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    inicio = time.perf_counter()
+    historial, eventos = generar(n_habitaciones, n_plantas)
+    print(f'Habitaciones: {n_habitaciones} | eventos: {len(eventos)} '
+          f'(generados y registrados en {time.perf_counter() - inicio:.2f} s)')
+
+    puntos = int((FIN - INICIO) / PASO)
+    muestra = [INICIO + PASO * i for i in range(0, puntos, puntos // MUESTRA_RECORRIDO)]
+    inicio = time.perf_counter()
+    esperado = [sum(cambio for _, instante, cambio in eventos if instante <= punto) for punto in muestra]
+    t_recorrido = (time.perf_counter() - inicio) / len(muestra) * puntos
+    print(f'  Serie anual del centro recorriendo eventos (estimado): {t_recorrido:8.2f} s')
+
+    for titulo, filtro in (('centro', {'centro': 'C001'}), ('planta', {'planta': 'Planta0'}),
+                           ('habitación', {'habitacion': 'H00000'})):
+        for repeticion in ('primera', 'siguientes'):
+            inicio = time.perf_counter()
+            serie = historial.serie(INICIO, FIN, PASO, **filtro)
+            print(f'  Serie anual por {titulo:10} ({repeticion:10}): {(time.perf_counter() - inicio) * 1000:8.1f} ms '
+                  f'({len(serie)} puntos)')
+    inicio = time.perf_counter()
+    historial.serie(INICIO, FIN, PASO, centro='C001', maximo=True)
+    print(f'  Serie anual del centro con picos por hora:        {(time.perf_counter() - inicio) * 1000:8.1f} ms')
+
+    obtenido = [historial.ocupadas(punto, centro='C001') for punto in muestra]
+    print(f'  Resultados idénticos: {"sí" if obtenido == esperado else "NO"}')
+
+
+if __name__ == '__main__':
+    main()
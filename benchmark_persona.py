@@ -0,0 +1,64 @@
+"""
+Benchmark de la construcción de personas con contraseña (persona.py): hash bcrypt inmediato, hash
+diferido, hash ya calculado y hash en paralelo con un pool de procesos.
+
+Uso:
+    python benchmark_persona.py [personas] [rondas] [procesos]   (por defecto 10000, 10 y uno por CPU)
+
+El hash inmediato de todas las personas tardaría demasiado, así que se mide sobre una muestra y se extrapola.
+"""
+
+import os
+import sys
+import time
+
+import persona
+from persona import Persona, hash_diferido, hashear_passwords, hashear_pendientes
+
+MUESTRA_INMEDIATO = 100
+
+
+def crear(cantidad: int, **kwargs) -> list:
+    """
+    Crea `cantidad` personas con contraseñas distintas.
+    """
+    return [Persona(f'P{i:06d}', 'Nombre', 'Apellido', 40, 'F', 'paciente', password=f'clave{i}', **kwargs)
+            for i in range(cantidad)]
+
+
+def medir(funcion, *args) -> tuple:
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main() -> None:
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rondas = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    procesos = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    persona.RONDAS_BCRYPT = rondas
+    print(f'Personas: {cantidad} | rondas bcrypt: {rondas} | procesos: {procesos}')
+
+    muestra = min(MUESTRA_INMEDIATO, cantidad)
+    t_muestra, _ = medir(crear, muestra)
+    print(f'  Hash inmediato (estimado a partir de {muestra}): {t_muestra / muestra * cantidad:.2f} s')
+
+    with hash_diferido():
+        t_diferido, personas = medir(crear, cantidad)
+    print(f'  Construcción con hash diferido:                {t_diferido:.3f} s')
+
+    hashes = hashear_passwords([f'clave{i}' for i in range(muestra)], rondas, 1)
+    hashes = [hashes[i % muestra] for i in range(cantidad)]
+    t_prehash, _ = medir(lambda: [Persona(f'P{i:06d}', 'Nombre', 'Apellido', 40, 'F', 'paciente', password_hash=h)
+                                  for i, h in enumerate(hashes)])
+    print(f'  Construcción con hash ya calculado:            {t_prehash:.3f} s')
+
+    t_paralelo, hasheadas = medir(hashear_pendientes, personas, rondas, procesos)
+    print(f'  Hash de las {hasheadas} pendientes en paralelo:     {t_paralelo:.2f} s')
+
+    comprobada = personas[-1].verificar_password(f'clave{cantidad - 1}')
+    print(f'  Verificación tras el hash en paralelo: {"correcta" if comprobada else "INCORRECTA"}')
+
+
+if __name__ == '__main__':
+    main()
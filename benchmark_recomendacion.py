@@ -0,0 +1,139 @@
+"""
+Benchmark de la recomendación de medicamentos: compara `recomendar_medicamento` sobre una lista (recorre
+todos los medicamentos y sus alérgenos) con el catálogo indexado (CatalogoMedicamentos), y
+`comprobacion_alergenos` con el cribado por máscaras de bits (CribadoAlergenos), tanto de las recetas de
+cada paciente como de todo el catálogo, y la recomendación en lote de una planta entera (perfiles
+repetidos agrupados, con y sin pool de procesos). Comprueba que todas las variantes dan el mismo resultado.
+
+Uso:
+    python benchmark_recomendacion.py [medicamentos] [pacientes]   (por defecto 30000 y 200)
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+
+from catalogo_medicamentos import CatalogoMedicamentos
+from cribado_alergenos import CONTIENE_ALERGENOS, CribadoAlergenos
+from enfermedades import Enfermedad
+from medicamento import Medicamento
+from paciente import Paciente
+from recomendar_medicamentos import comprobacion_alergenos, recomendar_medicamento, recomendar_medicamentos_lote
+
+SINTOMAS = [f'sintoma{i}' for i in range(400)]
+ALERGENOS = [f'alergeno{i}' for i in range(60)]
+RECETAS_POR_PACIENTE = 5
+
+
+def generar_medicamentos(cantidad: int) -> list:
+    """
+    Genera medicamentos que curan de 1 a 5 síntomas y contienen de 0 a 3 alérgenos.
+    """
+    caducidad = datetime(2030, 1, 1)
+    return [Medicamento(f'Medicamento{i}', '1 comprimido', 5.0, caducidad,
+                        random.sample(ALERGENOS, random.randint(0, 3)),
+                        random.sample(SINTOMAS, random.randint(1, 5)))
+            for i in range(cantidad)]
+
+
+def generar_pacientes(cantidad: int) -> list:
+    """
+    Genera pacientes con 1 a 3 enfermedades (de 2 a 6 síntomas cada una) y 0 a 4 alergias.
+    """
+    pacientes = []
+    for i in range(cantidad):
+        paciente = Paciente(f'PAC{i:05d}', f'paciente{i}', None, 'Nombre', 'Apellido', 40, 'F', 'leve',
+                            alergias=random.sample(ALERGENOS, random.randint(0, 4)))
+        for j in range(random.randint(1, 3)):
+            paciente.asignar_enfermedades(Enfermedad(f'Enfermedad{i}_{j}', random.sample(SINTOMAS, random.randint(2, 6))))
+        pacientes.append(paciente)
+    return pacientes
+
+
+def generar_ingresados(cantidad: int, enfermedades: int = 300) -> list:
+    """
+    Genera pacientes ingresados que comparten un conjunto limitado de enfermedades (y por tanto muchos
+    repiten perfil de síntomas y alergias).
+    """
+    comunes = [Enfermedad(f'Enfermedad{i}', random.sample(SINTOMAS, random.randint(2, 6))) for i in range(enfermedades)]
+    alergias = [[], [], ['alergeno1'], ['alergeno2', 'alergeno3']]
+    pacientes = []
+    for i in range(cantidad):
+        paciente = Paciente(f'ING{i:05d}', f'ingresado{i}', None, 'Nombre', 'Apellido', 60, 'M', 'moderado',
+                            alergias=random.choice(alergias))
+        paciente.asignar_enfermedades(random.choice(comunes))
+        pacientes.append(paciente)
+    return pacientes
+
+
+def main() -> None:
+    n_medicamentos = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000
+    n_pacientes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    random.seed(0)
+    medicamentos = generar_medicamentos(n_medicamentos)
+    pacientes = generar_pacientes(n_pacientes)
+    print(f'Medicamentos: {n_medicamentos} | pacientes: {n_pacientes}')
+
+    inicio = time.perf_counter()
+    esperado = [recomendar_medicamento(paciente, medicamentos) for paciente in pacientes]
+    t_lista = time.perf_counter() - inicio
+    print(f'  Lista (recorrido completo): {t_lista * 1000 / n_pacientes:8.2f} ms/paciente')
+
+    inicio = time.perf_counter()
+    catalogo = CatalogoMedicamentos(medicamentos)
+    print(f'  Construcción del catálogo:  {(time.perf_counter() - inicio) * 1000:8.1f} ms')
+
+    inicio = time.perf_counter()
+    obtenido = [recomendar_medicamento(paciente, catalogo) for paciente in pacientes]
+    t_catalogo = time.perf_counter() - inicio
+    print(f'  Catálogo (índices):         {t_catalogo * 1000 / n_pacientes:8.2f} ms/paciente '
+          f'({t_lista / t_catalogo:.0f}x)')
+    print(f'  Resultados idénticos: {"sí" if obtenido == esperado else "NO"}')
+
+    print('Cribado de alérgenos')
+    alergicos = [paciente for paciente in pacientes if paciente.alergias]
+    recetas = [random.sample(medicamentos, RECETAS_POR_PACIENTE) for _ in alergicos]
+    inicio = time.perf_counter()
+    cribado = CribadoAlergenos(medicamentos)
+    cribado.matriz()
+    print(f'  Construcción del cribado:   {(time.perf_counter() - inicio) * 1000:8.1f} ms')
+
+    inicio = time.perf_counter()
+    esperado = [comprobacion_alergenos(paciente, receta) for paciente, receta in zip(alergicos, recetas)]
+    t_lista = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    obtenido = [comprobacion_alergenos(paciente, receta, cribado) for paciente, receta in zip(alergicos, recetas)]
+    t_cribado = time.perf_counter() - inicio
+    print(f'  Recetas ({RECETAS_POR_PACIENTE}/paciente), listas:  {t_lista * 1e6 / len(alergicos):8.1f} µs/paciente')
+    print(f'  Recetas ({RECETAS_POR_PACIENTE}/paciente), máscaras: {t_cribado * 1e6 / len(alergicos):8.1f} µs/paciente')
+    print(f'  Resultados idénticos: {"sí" if obtenido == esperado else "NO"}')
+
+    inicio = time.perf_counter()
+    esperado = [comprobacion_alergenos(paciente, medicamentos) for paciente in alergicos[:20]]
+    t_lista = (time.perf_counter() - inicio) / 20
+    inicio = time.perf_counter()
+    vectores = [cribado.cribar_catalogo(paciente.alergias) for paciente in alergicos]
+    t_cribado = (time.perf_counter() - inicio) / len(alergicos)
+    iguales = all((esperado[i][m.nombre] == CONTIENE_ALERGENOS) == bool(vectores[i][j])
+                  for i in range(20) for j, m in enumerate(medicamentos))
+    print(f'  Catálogo entero, listas:    {t_lista * 1000:8.2f} ms/paciente')
+    print(f'  Catálogo entero, AND NumPy: {t_cribado * 1000:8.2f} ms/paciente ({t_lista / t_cribado:.0f}x)')
+    print(f'  Resultados idénticos: {"sí" if iguales else "NO"}')
+
+    ingresados = generar_ingresados(n_pacientes * 25)
+    print(f'Recomendación en lote ({len(ingresados)} ingresados)')
+    inicio = time.perf_counter()
+    esperado = [catalogo.recomendar(paciente) for paciente in ingresados]
+    t_uno = time.perf_counter() - inicio
+    print(f'  Catálogo, uno a uno:        {t_uno * 1000:8.1f} ms')
+    for procesos in (None, 2):
+        inicio = time.perf_counter()
+        obtenido = [recomendacion for _, recomendacion in recomendar_medicamentos_lote(ingresados, catalogo, procesos)]
+        t_lote = time.perf_counter() - inicio
+        print(f'  Lote, procesos={procesos or 1}:          {t_lote * 1000:8.1f} ms ({t_uno / t_lote:.0f}x) | '
+              f'resultados idénticos: {"sí" if obtenido == esperado else "NO"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+Catálogo de medicamentos con índices invertidos para recomendar medicamentos a escala de farmacia online.
+
+En lugar de recorrer cada medicamento por cada síntoma y cada alergia (recomendar_medicamentos.py), el
+catálogo guarda dos índices precalculados:
+- id de síntoma (sintomas.py) -> posiciones de los medicamentos que lo curan (`sintomas_curables_ids`),
+- alérgeno -> posiciones de los medicamentos que lo contienen (`alergenos`).
+
+Una recomendación es la unión de los medicamentos de los síntomas del paciente menos la unión de los de
+sus alergias, y el resultado es el mismo (y en el mismo orden) que el de `recomendar_medicamento`.
+
+Para recomendar a muchos pacientes a la vez (cierre de farmacia), `recomendar_lote` agrupa los pacientes
+con el mismo perfil de síntomas y alergias, puede repartir el trabajo en un pool de procesos y devuelve
+los resultados como un generador.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+Perfil = Tuple[FrozenSet, FrozenSet]
+
+
+def perfil_paciente(paciente) -> Perfil:
+    """
+    Perfil de un paciente para la recomendación: (ids de los síntomas de sus enfermedades, alergias). Dos
+    pacientes con el mismo perfil reciben la misma recomendación.
+    """
+    sintomas = frozenset().union(*(enfermedad.sintomas_ids for enfermedad in paciente.enfermedades))
+    return sintomas, frozenset(paciente.alergias or ())
+
+
+class CatalogoMedicamentos:
+    """
+    Catálogo de medicamentos indexado por síntoma curable y por alérgeno.
+
+    Los índices se calculan al añadir cada medicamento: si después cambian sus síntomas curables o sus
+    `alergenos`, hay que crear el catálogo de nuevo.
+
+    Atributos
+    ---------
+    medicamentos : List[Medicamento]
+        Medicamentos del catálogo, en el orden en que se añadieron.
+    """
+
+    def __init__(self, medicamentos: Iterable = ()):
+        """
+        Parámetros
+        ----------
+        medicamentos : Iterable[Medicamento], opcional
+            Medicamentos iniciales del catálogo.
+        """
+        self.medicamentos: List = []
+        self._por_sintoma: Dict[int, Set[int]] = {}
+        self._por_alergeno: Dict[Any, Set[int]] = {}
+        # Medicamentos cuyos alérgenos son un texto: `in` busca subcadenas y no se puede indexar
+        self._alergenos_texto: List[int] = []
+        for medicamento in medicamentos:
+            self.añadir(medicamento)
+
+    def __len__(self) -> int:
+        return len(self.medicamentos)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.medicamentos)
+
+    def añadir(self, medicamento) -> None:
+        """
+        Añade un medicamento al catálogo y a sus índices.
+
+        Parámetros
+        ----------
+        medicamento : Medicamento
+            Medicamento con `sintomas_curables_ids` y `alergenos`.
+        """
+        posicion = len(self.medicamentos)
+        self.medicamentos.append(medicamento)
+        for id_sintoma in medicamento.sintomas_curables_ids:
+            self._por_sintoma.setdefault(id_sintoma, set()).add(posicion)
+        if isinstance(medicamento.alergenos, str):
+            self._alergenos_texto.append(posicion)
+        else:
+            for alergeno in medicamento.alergenos:
+                self._por_alergeno.setdefault(alergeno, set()).add(posicion)
+
+    def posiciones_por_sintomas(self, sintomas_ids: Iterable[int]) -> Set[int]:
+        """
+        Devuelve las posiciones de los medicamentos que curan alguno de los síntomas (por id).
+        """
+        return set().union(*(self._por_sintoma.get(id_sintoma, ()) for id_sintoma in sintomas_ids))
+
+    def posiciones_por_alergenos(self, alergias: Iterable) -> Set[int]:
+        """
+        Devuelve las posiciones de los medicamentos que contienen alguno de los alérgenos.
+        """
+        alergias = set(alergias)
+        posiciones = set().union(*(self._por_alergeno.get(alergia, ()) for alergia in alergias))
+        for posicion in self._alergenos_texto:
+            if any(alergia in self.medicamentos[posicion].alergenos for alergia in alergias):
+                posiciones.add(posicion)
+        return posiciones
+
+    def recomendar(self, paciente) -> list:
+        """
+        Devuelve los medicamentos que curan algún síntoma del paciente y no contienen ninguno de sus
+        alérgenos. Equivale a `recomendar_medicamento(paciente, catalogo.medicamentos)`.
+
+        Parámetros
+        ----------
+        paciente : Paciente
+            Paciente con `enfermedades` (cada una con sus `sintomas_ids`) y `alergias`.
+
+        Devuelve
+        --------
+        list
+            Medicamentos adecuados, en el orden del catálogo.
+
+        Excepciones
+        -----------
+        ValueError
+            Si el paciente no tiene síntomas.
+        """
+        posiciones = self.posiciones_recomendadas(perfil_paciente(paciente))
+        if posiciones is None:
+            raise ValueError('El paciente no tiene síntomas')
+        return [self.medicamentos[posicion] for posicion in posiciones]
+
+    def posiciones_recomendadas(self, perfil: Perfil) -> Optional[Tuple[int, ...]]:
+        """
+        Posiciones (ordenadas) de los medicamentos recomendados para un perfil, o None si no tiene síntomas.
+        """
+        sintomas, alergias = perfil
+        if not sintomas:
+            return None
+        posiciones = self.posiciones_por_sintomas(sintomas)
+        if alergias:
+            posiciones -= self.posiciones_por_alergenos(alergias)
+        return tuple(sorted(posiciones))
+
+    def recomendar_lote(self, pacientes: Iterable, procesos: Optional[int] = None, tamaño_bloque: int = 512,
+                        capacidad_perfiles: int = 4096) -> Iterator[Tuple[Any, Union[list, ValueError]]]:
+        """
+        Recomienda medicamentos a muchos pacientes. Los pacientes se leen y los resultados se devuelven
+        por bloques, así que nunca están todos en memoria a la vez.
+
+        Parámetros
+        ----------
+        pacientes : Iterable[Paciente]
+            Pacientes (puede ser un generador).
+        procesos : int, opcional
+            Procesos del pool que calcula los perfiles nuevos de cada bloque. Por defecto (None o 1) se
+            calculan en este proceso.
+        tamaño_bloque : int, opcional
+            Pacientes por bloque. Por defecto 512.
+        capacidad_perfiles : int, opcional
+            Perfiles recientes cuya recomendación se recuerda entre bloques. Por defecto 4096.
+
+        Devuelve
+        --------
+        Iterator[Tuple[Paciente, list o ValueError]]
+            Cada paciente, en el orden de entrada, con sus medicamentos adecuados (los mismos objetos y en
+            el mismo orden que `recomendar`), o el ValueError si no tiene síntomas.
+        """
+        memoria: 'OrderedDict[Perfil, Optional[Tuple[int, ...]]]' = OrderedDict()
+        pool = ProcessPoolExecutor(procesos, initializer=_iniciar_proceso, initargs=(self,)) \
+            if procesos and procesos > 1 else None
+        pacientes = iter(pacientes)
+        try:
+            while True:
+                bloque = [(paciente, perfil_paciente(paciente)) for paciente in islice(pacientes, tamaño_bloque)]
+                if not bloque:
+                    break
+                nuevos = list(dict.fromkeys(perfil for _, perfil in bloque if perfil not in memoria))
+                if pool is not None and len(nuevos) > 1:
+                    partes = [nuevos[i::procesos] for i in range(procesos)]
+                    for parte, posiciones in zip(partes, pool.map(_posiciones_en_proceso, partes)):
+                        memoria.update(zip(parte, posiciones))
+                else:
+                    memoria.update((perfil, self.posiciones_recomendadas(perfil)) for perfil in nuevos)
+                for paciente, perfil in bloque:
+                    memoria.move_to_end(perfil)
+                    posiciones = memoria[perfil]
+                    if posiciones is None:
+                        yield paciente, ValueError('El paciente no tiene síntomas')
+                    else:
+                        yield paciente, [self.medicamentos[posicion] for posicion in posiciones]
+                while len(memoria) > capacidad_perfiles:
+                    memoria.popitem(last=False)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+
+_catalogo_proceso: Optional[CatalogoMedicamentos] = None
+
+
+def _iniciar_proceso(catalogo: CatalogoMedicamentos) -> None:
+    # Cada proceso del pool recibe el catálogo (con sus índices) una sola vez
+    global _catalogo_proceso
+    _catalogo_proceso = catalogo
+
+
+def _posiciones_en_proceso(perfiles: List[Perfil]) -> List[Optional[Tuple[int, ...]]]:
+    # Solo viajan los perfiles y las posiciones; los medicamentos se recuperan en el proceso principal
+    return [_catalogo_proceso.posiciones_recomendadas(perfil) for perfil in perfiles]
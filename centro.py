@@ -163,58 +163,3 @@ class Centro(Provincia):
         info += f'Habitaciones disponibles: {self.habitaciones}\n'
         info += f'Presupuesto: {self.presupuesto}€\n'
         return info
-
-# Ejemplo de objetos:
-centro1 = Centro(
-    nombre_comunidad='Comunidad Valenciana',
-    nombre_provincia='Alicante',
-    id_centro="CENTRO001",
-    nombre_centro="Hospital General de Alicante",
-    cantidad_trabajadores=250,
-    presupuesto=1500000,
-    habitaciones=120
-)
-
-centro2 = Centro(
-    nombre_comunidad="Andalucía",
-    nombre_provincia="Sevilla",
-    id_centro="CENTRO002",
-    nombre_centro="Clínica Nuestra Señora del Rocío",
-    cantidad_trabajadores=180,
-    presupuesto=950000,
-    habitaciones=80
-)
-
-centro3 = Centro(
-    nombre_comunidad="Cataluña",
-    nombre_provincia="Barcelona",
-    id_centro="CENTRO003",
-    nombre_centro="Centro Médico Sant Pau",
-    cantidad_trabajadores=300,
-    presupuesto=2000000,
-    habitaciones=150
-)
-
-centro4 = Centro(
-    nombre_comunidad="Madrid",
-    nombre_provincia="Madrid",
-    id_centro="CENTRO004",
-    nombre_centro="Hospital de La Paz",
-    cantidad_trabajadores=500,
-    presupuesto=3200000,
-    habitaciones=200
-)
-
-centro5 = Centro(
-    nombre_comunidad="Castilla y León",
-    nombre_provincia="Valladolid",
-    id_centro="CENTRO005",
-    nombre_centro="Centro de Salud Valladolid Oeste",
-    cantidad_trabajadores=100,
-    presupuesto=600000,
-    habitaciones=60
-)
-
-print(centro3.habitaciones)
-centro3.añadir_habitaciones(54)
-print(centro3.habitaciones)
@@ -1,5 +1,56 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Union
+
+# Duración de una cita: dos citas del mismo médico se solapan si empiezan a menos de esta distancia
+DURACION_CITA = timedelta(minutes=30)
+
+FORMATO_FECHA_HORA = '%Y %m %d %H:%M'
+
+
+# Tabla de códigos de estado: cada cita guarda un entero pequeño en lugar de repetir la cadena.
+# Los estados no previstos se registran al vuelo para que `estado` devuelva siempre el texto original.
+TEXTOS_ESTADO: List[str] = ['pendiente', 'Cancelada', 'cancelado', 'completado']
+CODIGOS_ESTADO: Dict[str, int] = {texto: codigo for codigo, texto in enumerate(TEXTOS_ESTADO)}
+ESTADOS_CANCELADOS = ('Cancelada', 'cancelado')
+
+
+def codigo_estado(estado: str) -> int:
+    '''
+    Devuelve el código entero de un estado, registrándolo si es nuevo.
+    '''
+    codigo = CODIGOS_ESTADO.get(estado)
+    if codigo is None:
+        codigo = CODIGOS_ESTADO[estado] = len(TEXTOS_ESTADO)
+        TEXTOS_ESTADO.append(estado)
+    return codigo
+
+
+@lru_cache(maxsize=65536)
+def parsear_fecha_hora(fecha_hora: str) -> datetime:
+    '''
+    Convierte una fecha con formato 'YYYY MM DD HH:MM' en datetime leyendo los campos por posición,
+    sin pasar por strptime. Como las citas caen en horas repetidas, el resultado se cachea.
+    Si la cadena no tiene exactamente ese formato (por ejemplo, '2024 1 5 9:00') se usa strptime.
+
+    Parámetros
+    ----------
+    fecha_hora : str
+        Fecha y hora de la cita.
+
+    Devuelve
+    --------
+    datetime
+        Fecha y hora convertidas.
+    '''
+    if len(fecha_hora) == 16 and fecha_hora[4] == ' ' and fecha_hora[7] == ' ' and fecha_hora[10] == ' ' and fecha_hora[13] == ':':
+        try:
+            return datetime(int(fecha_hora[0:4]), int(fecha_hora[5:7]), int(fecha_hora[8:10]),
+                            int(fecha_hora[11:13]), int(fecha_hora[14:16]))
+        except ValueError:
+            pass
+    return datetime.strptime(fecha_hora, FORMATO_FECHA_HORA)
 
 class Cita(ABC):
     '''
@@ -35,8 +86,11 @@ class Cita(ABC):
         Marca la cita como atendida y cambia su estado a 'completado'.
     '''
 
+    # Sin __dict__ por cita: los atributos van en slots y el estado se guarda como código entero
+    __slots__ = ('id_cita', 'paciente', 'medico', 'motivo', 'fecha_hora_dt', 'codigo_estado', 'atendido')
+
     # Método de inicialización
-    def __init__(self, id_cita: str, paciente: str, medico: str, fecha_hora: str, motivo: str,  estado: str='pendiente', atendido: bool=False):
+    def __init__(self, id_cita: str, paciente: str, medico: str, fecha_hora: Union[str, datetime], motivo: str,  estado: str='pendiente', atendido: bool=False):
         '''
         Inicializa una nueva cita médica con el ID, paciente, médico, fecha_hora, estado y si ha sido atendida o no.
 
@@ -48,8 +102,8 @@ class Cita(ABC):
             Nombre del paciente.
         medico : str
             Nombre del médico asignado.
-        fecha_hora : str
-            Fecha y hora en la que se llevará a cabo la cita.
+        fecha_hora : Union[str, datetime]
+            Fecha y hora en la que se llevará a cabo la cita ('YYYY MM DD HH:MM' o un datetime ya convertido).
         estado : str, opcional
             Estado de la cita, por defecto 'pendiente'.
         atendido : bool, opcional
@@ -60,10 +114,28 @@ class Cita(ABC):
         self.paciente = paciente
         self.medico = medico
         self.motivo = motivo
-        self.fecha_hora_dt = datetime.strptime(fecha_hora, '%Y %m %d %H:%M')
+        self.fecha_hora_dt = fecha_hora if isinstance(fecha_hora, datetime) else parsear_fecha_hora(fecha_hora)
         self.estado = estado
         self.atendido = atendido
 
+    @property
+    def estado(self) -> str:
+        '''
+        Estado de la cita como texto (se almacena internamente como código entero).
+        '''
+        return TEXTOS_ESTADO[self.codigo_estado]
+
+    @estado.setter
+    def estado(self, estado: str) -> None:
+        self.codigo_estado = codigo_estado(estado)
+
+    @property
+    def cancelada(self) -> bool:
+        '''
+        Indica si la cita está cancelada.
+        '''
+        return self.estado in ESTADOS_CANCELADOS
+
     @abstractmethod
     def cancelar_cita(self) -> str:
         '''
@@ -109,7 +181,7 @@ class Cita(ABC):
             True si las citas se solapan, False en caso contrario.
         '''
         delta = abs((self.fecha_hora_dt - otra_cita.fecha_hora_dt).total_seconds())
-        return delta < 1800
+        return delta < DURACION_CITA.total_seconds()
 
     def to_dict(self) -> dict:
         '''
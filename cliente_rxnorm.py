@@ -0,0 +1,284 @@
+"""
+Cliente compartido de la API RxNorm (https://rxnav.nlm.nih.gov) para consultar medicamentos.
+
+- Una sola `requests.Session` con pool de conexiones keep-alive, reintentos y timeout.
+- Caché LRU con caducidad (TTL) de las respuestas, incluida la caché negativa de los medicamentos que
+  RxNorm no conoce (con un TTL más corto).
+- Consultas en lote de muchos nombres a la vez con un pool de hilos.
+
+La URL se puede cambiar (parámetro `url` o variable de entorno PROSALUD_RXNORM_URL) para apuntar a un
+servidor local que reproduce respuestas grabadas (servidor_rxnorm_local.py).
+
+Con un espejo local (espejo_rxnorm.py, variable PROSALUD_RXNORM_ESPEJO) los nombres se buscan primero en
+el índice en disco y solo se consulta RxNorm si no están (o nunca, con PROSALUD_RXNORM_SOLO_ESPEJO=1).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+URL_RXNORM = "https://rxnav.nlm.nih.gov/REST/drugs.json"
+CAMPOS_CONCEPTO = ('name', 'rxcui', 'tty', 'language')
+
+
+def extraer_conceptos(datos: dict) -> List[Dict[str, str]]:
+    """
+    Extrae de una respuesta de drugs.json la lista de conceptos (name, rxcui, tty, language).
+    Si RxNorm no conoce el medicamento la lista está vacía.
+    """
+    conceptos = []
+    for grupo in datos.get('drugGroup', {}).get('conceptGroup') or []:
+        for propiedad in grupo.get('conceptProperties') or []:
+            conceptos.append({campo: propiedad.get(campo) for campo in CAMPOS_CONCEPTO})
+    return conceptos
+
+
+class ClienteRxNorm:
+    """
+    Cliente de RxNorm con sesión persistente y caché.
+
+    Atributos
+    ---------
+    url : str
+        URL del endpoint drugs.json.
+    timeout : float o Tuple[float, float]
+        Timeout de cada petición (conexión, lectura) en segundos.
+    ttl : float
+        Segundos que se guarda una respuesta con resultados.
+    ttl_negativo : float
+        Segundos que se guarda una respuesta vacía (medicamento desconocido).
+    capacidad_cache : int
+        Número máximo de nombres en la caché.
+    espejo : EspejoRxNorm o None
+        Índice local que se consulta antes que RxNorm.
+    solo_espejo : bool
+        Si es True, los nombres que no están en el espejo no se buscan en RxNorm.
+    """
+
+    def __init__(self, url: Optional[str] = None, timeout: Union[float, Tuple[float, float]] = (3.05, 10),
+                 tamaño_pool: int = 20, reintentos: int = 2, capacidad_cache: int = 1024,
+                 ttl: float = 3600, ttl_negativo: float = 300, espejo=None, solo_espejo: bool = False):
+        """
+        Parámetros
+        ----------
+        url : str, opcional
+            Endpoint drugs.json. Por defecto PROSALUD_RXNORM_URL o el de la NLM.
+        timeout : float o Tuple[float, float], opcional
+            Timeout de conexión y lectura. Por defecto (3.05, 10).
+        tamaño_pool : int, opcional
+            Conexiones keep-alive que se mantienen abiertas (y consultas simultáneas en lote). Por defecto 20.
+        reintentos : int, opcional
+            Reintentos ante errores de conexión o respuestas 429/5xx. Por defecto 2.
+        capacidad_cache : int, opcional
+            Nombres que se guardan en la caché. Por defecto 1024.
+        ttl / ttl_negativo : float, opcional
+            Validez en segundos de las respuestas con y sin resultados. Por defecto 3600 y 300.
+        espejo : EspejoRxNorm, opcional
+            Índice local (espejo_rxnorm.py) que se consulta antes que RxNorm. Por defecto ninguno.
+        solo_espejo : bool, opcional
+            No consultar RxNorm para los nombres que no están en el espejo. Por defecto False.
+        """
+        self.url = url or os.environ.get('PROSALUD_RXNORM_URL', URL_RXNORM)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.ttl_negativo = ttl_negativo
+        self.capacidad_cache = capacidad_cache
+        self.tamaño_pool = tamaño_pool
+        self.espejo = espejo
+        self.solo_espejo = solo_espejo and espejo is not None
+        self.sesion = requests.Session()
+        adaptador = HTTPAdapter(
+            pool_connections=tamaño_pool,
+            pool_maxsize=tamaño_pool,
+            max_retries=Retry(total=reintentos, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=('GET',))
+        )
+        self.sesion.mount('http://', adaptador)
+        self.sesion.mount('https://', adaptador)
+        self._cache: 'OrderedDict[str, Tuple[float, List[Dict[str, str]]]]' = OrderedDict()
+        self._cerrojo = threading.Lock()
+
+    @staticmethod
+    def _clave(nombre: str) -> str:
+        return nombre.strip().lower()
+
+    def _de_cache(self, clave: str) -> Optional[List[Dict[str, str]]]:
+        with self._cerrojo:
+            entrada = self._cache.get(clave)
+            if entrada is None:
+                return None
+            if entrada[0] <= time.monotonic():
+                del self._cache[clave]
+                return None
+            self._cache.move_to_end(clave)
+            return entrada[1]
+
+    def _local(self, clave: str) -> Optional[List[Dict[str, str]]]:
+        # Respuesta sin red: el espejo (si tiene el nombre) o la caché; None si hay que preguntar a RxNorm
+        if self.espejo is not None:
+            conceptos = self.espejo.buscar(clave, limite=None)
+            if conceptos or self.solo_espejo:
+                return conceptos
+        return self._de_cache(clave)
+
+    def _a_cache(self, clave: str, conceptos: List[Dict[str, str]]) -> None:
+        ttl = self.ttl if conceptos else self.ttl_negativo
+        with self._cerrojo:
+            self._cache[clave] = (time.monotonic() + ttl, conceptos)
+            self._cache.move_to_end(clave)
+            while len(self._cache) > self.capacidad_cache:
+                self._cache.popitem(last=False)
+
+    def buscar(self, nombre: str) -> List[Dict[str, str]]:
+        """
+        Busca un medicamento por nombre.
+
+        Parámetros
+        ----------
+        nombre : str
+            Nombre del medicamento.
+
+        Devuelve
+        --------
+        List[Dict[str, str]]
+            Conceptos encontrados (name, rxcui, tty, language); lista vacía si RxNorm no lo conoce.
+            Si hay espejo local y tiene el nombre, la respuesta sale de él sin usar la red.
+
+        Excepciones
+        -----------
+        ValueError
+            Si el nombre está vacío.
+        requests.exceptions.RequestException
+            Si la petición falla (los errores no se guardan en la caché).
+        """
+        clave = self._clave(nombre)
+        if not clave:
+            raise ValueError('El nombre del medicamento no puede estar vacío')
+        conceptos = self._local(clave)
+        if conceptos is not None:
+            return conceptos
+        respuesta = self.sesion.get(self.url, params={'name': clave}, timeout=self.timeout)
+        respuesta.raise_for_status()
+        conceptos = extraer_conceptos(respuesta.json())
+        self._a_cache(clave, conceptos)
+        return conceptos
+
+    def buscar_varios(self, nombres: Iterable[str], max_hilos: Optional[int] = None
+                      ) -> Dict[str, Union[List[Dict[str, str]], Exception]]:
+        """
+        Busca muchos medicamentos a la vez. Los nombres repetidos se consultan una sola vez y los que ya
+        están en el espejo o en caché no generan peticiones.
+
+        Parámetros
+        ----------
+        nombres : Iterable[str]
+            Nombres de los medicamentos.
+        max_hilos : int, opcional
+            Peticiones simultáneas. Por defecto, el tamaño del pool de conexiones.
+
+        Devuelve
+        --------
+        Dict[str, List[Dict[str, str]] o Exception]
+            Nombre (tal como se pidió) -> conceptos encontrados, o la excepción si su consulta falló.
+        """
+        nombres = list(dict.fromkeys(nombres))
+
+        def consultar(nombre: str) -> Union[List[Dict[str, str]], Exception]:
+            try:
+                return self.buscar(nombre)
+            except (requests.exceptions.RequestException, ValueError) as error:
+                return error
+
+        # Se agrupan por nombre normalizado para no repetir peticiones ('Ibuprofen' e 'ibuprofen ')
+        por_clave: Dict[str, Union[List[Dict[str, str]], Exception, None]] = {}
+        for nombre in nombres:
+            clave = self._clave(nombre)
+            if clave not in por_clave:
+                por_clave[clave] = self._local(clave)
+        pendientes = [clave for clave, conceptos in por_clave.items() if conceptos is None]
+        if len(pendientes) > 1:
+            with ThreadPoolExecutor(max_workers=max_hilos or self.tamaño_pool) as pool:
+                por_clave.update(zip(pendientes, pool.map(consultar, pendientes)))
+        else:
+            por_clave.update((clave, consultar(clave)) for clave in pendientes)
+        return {nombre: por_clave[self._clave(nombre)] for nombre in nombres}
+
+    def limpiar_cache(self) -> None:
+        """
+        Vacía la caché de respuestas.
+        """
+        with self._cerrojo:
+            self._cache.clear()
+
+    def cerrar(self) -> None:
+        """
+        Cierra las conexiones de la sesión y el espejo local.
+        """
+        self.sesion.close()
+        if self.espejo is not None:
+            self.espejo.cerrar()
+
+
+_cliente: Optional[ClienteRxNorm] = None
+_cerrojo_cliente = threading.Lock()
+
+
+def obtener_cliente() -> ClienteRxNorm:
+    """
+    Devuelve el cliente compartido del proceso, creándolo en el primer uso. Si PROSALUD_RXNORM_ESPEJO
+    indica el directorio de un espejo local, el cliente lo usa.
+    """
+    global _cliente
+    with _cerrojo_cliente:
+        if _cliente is None:
+            espejo = None
+            if os.environ.get('PROSALUD_RXNORM_ESPEJO'):
+                from espejo_rxnorm import EspejoRxNorm
+                espejo = EspejoRxNorm(os.environ['PROSALUD_RXNORM_ESPEJO'])
+            _cliente = ClienteRxNorm(espejo=espejo, solo_espejo=os.environ.get('PROSALUD_RXNORM_SOLO_ESPEJO') == '1')
+        return _cliente
+
+
+def obtener_informacion_medicamento(medicamento: str) -> None:
+    """
+    Consulta información de un medicamento usando la API RxNorm y la imprime.
+
+    Parámetros
+    ----------
+    medicamento : str
+        Nombre del medicamento a consultar.
+
+    Ejemplo
+    -------
+    >>> obtener_informacion_medicamento("ibuprofeno")
+    Nombre: Ibuprofen
+    RXCUI: 5640
+    TTY: IN
+    Idioma: ENG
+    -------------------------------
+    """
+    try:
+        conceptos = obtener_cliente().buscar(medicamento)
+    except requests.exceptions.RequestException as error:
+        print(f"No se puede completar la solicitud: {error}")
+        return
+    except ValueError as error:
+        print(f"Error: {error}")
+        return
+    if not conceptos:
+        print("El medicamento que has proporcionado no existe o no se encuentra en la base de datos.")
+        return
+    for concepto in conceptos:
+        print(f"Nombre: {concepto['name']}")
+        print(f"RXCUI: {concepto['rxcui']}")
+        print(f"TTY: {concepto['tty']}")
+        print(f"Idioma: {concepto['language']}")
+        print("-------------------------------")
+        print("")
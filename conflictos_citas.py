@@ -0,0 +1,155 @@
+from bisect import insort
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional, Tuple
+from citas import Cita, DURACION_CITA
+from almacen_citas import clave_persona
+
+
+class AgendaMedico:
+    '''
+    Agenda de un médico ordenada por la hora de inicio de cada cita. Como todas las citas duran
+    `DURACION_CITA`, un hueco choca con la agenda si alguna cita empieza a menos de esa distancia,
+    y basta una búsqueda binaria para comprobarlo.
+
+    Atributos
+    ---------
+    inicios : List[Tuple[datetime, Hashable]]
+        Pares (fecha_hora_dt, id_cita) ordenados por fecha.
+    '''
+
+    def __init__(self):
+        '''
+        Inicializa una agenda vacía.
+        '''
+        self.inicios: List[Tuple[datetime, Hashable]] = []
+
+    def añadir(self, fecha_hora: datetime, id_cita) -> None:
+        '''
+        Inserta una cita en su posición dentro de la agenda.
+        '''
+        insort(self.inicios, (fecha_hora, id_cita), key=lambda par: par[0])
+
+    def eliminar(self, fecha_hora: datetime, id_cita) -> None:
+        '''
+        Quita una cita de la agenda si está en ella.
+        '''
+        i = self._posicion(fecha_hora)
+        while i < len(self.inicios) and self.inicios[i][0] == fecha_hora:
+            if self.inicios[i][1] == id_cita:
+                del self.inicios[i]
+                return
+            i += 1
+
+    def _posicion(self, fecha_hora: datetime, estricto: bool = False) -> int:
+        # Primer índice cuya fecha es >= fecha_hora (> si estricto). Se busca solo por la fecha para no comparar ids
+        bajo, alto = 0, len(self.inicios)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            actual = self.inicios[medio][0]
+            if actual < fecha_hora or (estricto and actual == fecha_hora):
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def conflicto(self, fecha_hora: datetime) -> Optional[Hashable]:
+        '''
+        Comprueba en O(log n) si un hueco de `DURACION_CITA` que empieza en `fecha_hora` choca con la agenda.
+
+        Parámetros
+        ----------
+        fecha_hora : datetime
+            Inicio del hueco que se quiere comprobar.
+
+        Devuelve
+        --------
+        Optional[Hashable]
+            El id de una cita que se solapa con el hueco, o None si está libre.
+        '''
+        # Las citas que empiezan justo DURACION_CITA antes no se solapan (mismo criterio que Cita.se_solapa)
+        i = self._posicion(fecha_hora - DURACION_CITA, estricto=True)
+        if i < len(self.inicios) and self.inicios[i][0] < fecha_hora + DURACION_CITA:
+            return self.inicios[i][1]
+        return None
+
+    def pares_solapados(self) -> List[Tuple[Hashable, Hashable]]:
+        '''
+        Devuelve todos los pares de citas de la agenda que se solapan, recorriendo la lista ordenada
+        una sola vez (O(n log n) por la ordenación más el número de pares encontrados).
+
+        Devuelve
+        --------
+        List[Tuple[Hashable, Hashable]]
+            Pares (id_cita, id_cita) que se solapan.
+        '''
+        pares = []
+        for i, (inicio, id_cita) in enumerate(self.inicios):
+            j = i + 1
+            while j < len(self.inicios) and self.inicios[j][0] - inicio < DURACION_CITA:
+                pares.append((id_cita, self.inicios[j][1]))
+                j += 1
+        return pares
+
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+
+class MotorConflictos:
+    '''
+    Detector de solapamientos a nivel de agenda: mantiene una `AgendaMedico` por médico.
+
+    Atributos
+    ---------
+    agendas : Dict[Hashable, AgendaMedico]
+        Clave del médico -> agenda ordenada.
+
+    Métodos
+    -------
+    registrar(cita) / retirar(cita) -> None
+        Añade o quita una cita de la agenda de su médico.
+    conflicto(medico, fecha_hora) -> Optional[Hashable]
+        Id de la cita que choca con el hueco, o None.
+    pares_solapados(medico=None) -> List[Tuple[Hashable, Hashable]]
+        Barrido de consistencia de una agenda o de todas.
+    '''
+
+    def __init__(self):
+        '''
+        Inicializa el motor sin agendas.
+        '''
+        self.agendas: Dict[Hashable, AgendaMedico] = {}
+
+    def registrar(self, cita: Cita) -> None:
+        '''
+        Añade una cita a la agenda de su médico.
+        '''
+        self.agendas.setdefault(clave_persona(cita.medico), AgendaMedico()).añadir(cita.fecha_hora_dt, cita.id_cita)
+
+    def retirar(self, cita: Cita) -> None:
+        '''
+        Quita una cita de la agenda de su médico (por ejemplo, al cancelarla).
+        '''
+        agenda = self.agendas.get(clave_persona(cita.medico))
+        if agenda is not None:
+            agenda.eliminar(cita.fecha_hora_dt, cita.id_cita)
+
+    def conflicto(self, medico, fecha_hora: datetime) -> Optional[Hashable]:
+        '''
+        Devuelve el id de una cita del médico que se solapa con el hueco que empieza en `fecha_hora`, o None.
+        '''
+        agenda = self.agendas.get(clave_persona(medico))
+        if agenda is None:
+            return None
+        return agenda.conflicto(fecha_hora)
+
+    def pares_solapados(self, medico=None) -> List[Tuple[Hashable, Hashable]]:
+        '''
+        Devuelve los pares de citas solapadas de un médico o, si no se indica, de todos los médicos.
+        '''
+        if medico is not None:
+            agenda = self.agendas.get(clave_persona(medico))
+            return agenda.pares_solapados() if agenda is not None else []
+        pares = []
+        for agenda in self.agendas.values():
+            pares.extend(agenda.pares_solapados())
+        return pares
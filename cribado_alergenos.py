@@ -0,0 +1,178 @@
+"""
+Cribado de alérgenos con máscaras de bits, para comprobar las recetas de todos los pacientes ingresados
+(por ejemplo, en cada cambio de turno) sin recorrer alergia x alérgeno en cada medicamento.
+
+- Cada alérgeno se interna una sola vez en una posición de bit.
+- Cada medicamento guarda sus alérgenos como un entero (máscara de bits) y el catálogo entero como una
+  matriz NumPy de palabras de 64 bits (una fila por medicamento).
+- Cribar a un paciente es un AND de su máscara de alergias con la matriz: un solo paso vectorizado.
+
+`CribadoAlergenos.comprobar` devuelve lo mismo que `comprobacion_alergenos` (recomendar_medicamentos.py).
+"""
+
+from typing import Any, Dict, Iterable, List, Union
+
+import numpy as np
+
+from medicamento import Medicamento
+
+CONTIENE_ALERGENOS = 'Contiene alérgenos'
+SEGURO = 'Seguro'
+
+
+class CribadoAlergenos:
+    """
+    Motor de cribado de alérgenos de un catálogo de medicamentos.
+
+    Los medicamentos recetados que no están en el catálogo se comprueban aparte, sin añadirlos (así el
+    catálogo no crece con cada receta). Si cambian los `alergenos` de un medicamento ya añadido, hay que crear
+    el cribado de nuevo.
+
+    Atributos
+    ---------
+    medicamentos : List[Medicamento]
+        Medicamentos del catálogo, en el orden en que se añadieron.
+    bits : Dict[Any, int]
+        Alérgeno -> posición de su bit.
+    """
+
+    def __init__(self, medicamentos: Iterable[Medicamento] = ()):
+        """
+        Parámetros
+        ----------
+        medicamentos : Iterable[Medicamento], opcional
+            Medicamentos iniciales del catálogo.
+        """
+        self.medicamentos: List[Medicamento] = []
+        self.bits: Dict[Any, int] = {}
+        self._mascaras: List[int] = []
+        self._posiciones: Dict[int, int] = {}  # id(medicamento) -> posición
+        # Medicamentos con los alérgenos en un texto: `in` busca subcadenas y se comprueban aparte
+        self._texto: Dict[int, str] = {}
+        self._matriz = np.zeros((0, 1), dtype=np.uint64)
+        for medicamento in medicamentos:
+            self.añadir(medicamento)
+
+    def __len__(self) -> int:
+        return len(self.medicamentos)
+
+    def _bit(self, alergeno) -> int:
+        bit = self.bits.get(alergeno)
+        if bit is None:
+            bit = self.bits[alergeno] = len(self.bits)
+        return bit
+
+    def añadir(self, medicamento: Medicamento) -> int:
+        """
+        Añade un medicamento al catálogo (si no estaba) y devuelve su posición.
+        """
+        posicion = self._posiciones.get(id(medicamento))
+        if posicion is not None:
+            return posicion
+        posicion = len(self.medicamentos)
+        mascara = 0
+        if isinstance(medicamento.alergenos, str):
+            self._texto[posicion] = medicamento.alergenos
+        else:
+            for alergeno in medicamento.alergenos:
+                mascara |= 1 << self._bit(alergeno)
+        self.medicamentos.append(medicamento)
+        self._mascaras.append(mascara)
+        self._posiciones[id(medicamento)] = posicion
+        return posicion
+
+    @property
+    def _palabras(self) -> int:
+        return max(1, (len(self.bits) + 63) // 64)
+
+    def _a_palabras(self, mascara: int) -> np.ndarray:
+        return np.array([(mascara >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(self._palabras)], dtype=np.uint64)
+
+    def matriz(self) -> np.ndarray:
+        """
+        Devuelve la matriz (medicamentos x palabras de 64 bits) con las máscaras de alérgenos del catálogo.
+        Se reconstruye solo si se han añadido medicamentos o alérgenos desde la última vez.
+        """
+        if self._matriz.shape != (len(self.medicamentos), self._palabras):
+            self._matriz = np.array([self._a_palabras(mascara) for mascara in self._mascaras],
+                                    dtype=np.uint64).reshape(len(self.medicamentos), self._palabras)
+        return self._matriz
+
+    def mascara_alergias(self, alergias: Iterable) -> int:
+        """
+        Máscara de bits de las alergias de un paciente (los alérgenos que ningún medicamento contiene no
+        ocupan bit).
+        """
+        mascara = 0
+        for alergia in alergias:
+            bit = self.bits.get(alergia)
+            if bit is not None:
+                mascara |= 1 << bit
+        return mascara
+
+    def _con_texto(self, posiciones: Iterable[int], alergias: list) -> set:
+        return {posicion for posicion in posiciones
+                if posicion in self._texto and any(alergia in self._texto[posicion] for alergia in alergias)}
+
+    def cribar_catalogo(self, alergias: Iterable) -> np.ndarray:
+        """
+        Criba todo el catálogo con un AND vectorizado.
+
+        Parámetros
+        ----------
+        alergias : Iterable
+            Alérgenos a los que es alérgico el paciente.
+
+        Devuelve
+        --------
+        np.ndarray
+            Vector booleano: True en la posición de cada medicamento que contiene alguno de los alérgenos.
+        """
+        alergias = list(alergias)
+        matriz = self.matriz()
+        peligrosos = (matriz & self._a_palabras(self.mascara_alergias(alergias))).any(axis=1)
+        for posicion in self._con_texto(self._texto, alergias):
+            peligrosos[posicion] = True
+        return peligrosos
+
+    def comprobar(self, paciente, medicamentos: Union[list, Medicamento]) -> Dict[str, str]:
+        """
+        Comprueba si los medicamentos recetados a un paciente contienen alérgenos que le afecten.
+
+        Parámetros
+        ----------
+        paciente : Paciente
+            Paciente con sus `alergias`.
+        medicamentos : Union[list, Medicamento]
+            Un medicamento o una lista de medicamentos.
+
+        Devuelve
+        --------
+        Dict[str, str]
+            Nombre del medicamento -> 'Seguro' o 'Contiene alérgenos' (si hay nombres repetidos, cuenta el
+            último). Vacío si `medicamentos` no es un Medicamento ni una lista.
+
+        Excepciones
+        -----------
+        ValueError
+            Si el paciente no tiene alergias.
+        """
+        if not paciente.alergias:
+            raise ValueError('El paciente no tiene alergias')
+        if isinstance(medicamentos, Medicamento):
+            medicamentos = [medicamentos]
+        elif not isinstance(medicamentos, list):
+            return {}
+        alergias = list(paciente.alergias)
+        posiciones = [self._posiciones.get(id(medicamento)) for medicamento in medicamentos]
+        mascara = self.mascara_alergias(alergias)
+        con_texto = self._con_texto(posiciones, alergias)
+        comprobacion = {}
+        for medicamento, posicion in zip(medicamentos, posiciones):
+            if posicion is None:
+                # Fuera del catálogo: se recorren sus alérgenos, como en comprobacion_alergenos
+                peligroso = any(alergia in medicamento.alergenos for alergia in alergias)
+            else:
+                peligroso = self._mascaras[posicion] & mascara or posicion in con_texto
+            comprobacion[medicamento.nombre] = CONTIENE_ALERGENOS if peligroso else SEGURO
+        return comprobacion
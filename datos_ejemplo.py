@@ -0,0 +1,703 @@
+"""
+Datos de ejemplo (pacientes, trabajadores, habitaciones, centros, enfermedades, medicamentos...).
+
+Antes estos objetos se creaban al importar cada módulo del dominio, de modo que cualquier `import`
+(por ejemplo, el de la API) pagaba el coste de crearlos, calcular hashes bcrypt e imprimir por pantalla.
+Ahora solo existen aquí y se cargan bajo demanda: importando este módulo o llamando a
+`apis_prosalud.cargar_datos_ejemplo()` (también al arrancar la API con PROSALUD_DATOS_EJEMPLO=1).
+Las contraseñas se hashean de forma diferida, la primera vez que se necesitan, y la carga no imprime nada.
+"""
+
+import io
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from persona import hash_diferido
+from paciente import Paciente
+from medico import Medico
+from enfermero import Enfermero
+from auxiliar import Auxiliar
+from paramedico import Paramedico
+from ambulancia import Ambulancia
+from habitacion import Habitacion
+from centro import Centro
+from provincia import Provincia
+from enfermedades import Enfermedad
+from medicamento import Medicamento
+from documento import Documento
+from secretario import Secretario
+
+# Los métodos del dominio avisan por pantalla (asignaciones, limpiezas, tono de sirena...): al cargar los datos de
+# ejemplo esos mensajes se descartan
+with hash_diferido(), redirect_stdout(io.StringIO()):
+    # Creación de objetos Paciente con sus atributos
+    paciente1 = Paciente(
+        id='PAC001',
+        username='lucia.r',
+        password='pac001',
+        nombre='Lucía',
+        apellido='Romero',
+        edad=34,
+        genero='Femenino',
+        estado='leve'
+    )
+
+    paciente2 = Paciente(
+        id='PAC002',
+        username='mario.s',
+        password='pac002',
+        nombre='Mario',
+        apellido='Sanz',
+        edad=67,
+        genero='Masculino',
+        estado='moderado'
+    )
+
+    paciente3 = Paciente(
+        id='PAC003',
+        username='elena.g',
+        password='pac003',
+        nombre='Elena',
+        apellido='Gil',
+        edad=52,
+        genero='Femenino',
+        estado='leve'
+    )
+
+    paciente4 = Paciente(
+        id='PAC004',
+        username='pablo.n',
+        password='pac004',
+        nombre='Pablo',
+        apellido='Navarro',
+        edad=23,
+        genero='Masculino',
+        estado='grave'
+    )
+
+    paciente5 = Paciente(
+        id='PAC005',
+        username='sofia.m',
+        password='pac005',
+        nombre='Sofía',
+        apellido='Molina',
+        edad=8,
+        genero='Femenino',
+        estado='leve'
+    )
+
+    paciente6 = Paciente(
+        id='PAC006',
+        username='hugo.o',
+        password='pac006',
+        nombre='Hugo',
+        apellido='Ortega',
+        edad=75,
+        genero='Masculino',
+        estado='grave'
+    )
+
+    paciente7 = Paciente(
+        id='PAC007',
+        username='irene.c',
+        password='pac007',
+        nombre='Irene',
+        apellido='Castro',
+        edad=41,
+        genero='Femenino',
+        estado='moderado'
+    )
+
+    paciente8 = Paciente(
+        id='PAC008',
+        username='diego.r',
+        password='pac008',
+        nombre='Diego',
+        apellido='Rubio',
+        edad=29,
+        genero='Masculino',
+        estado='leve'
+    )
+
+    paciente9 = Paciente(
+        id='PAC009',
+        username='nuria.d',
+        password='pac009',
+        nombre='Nuria',
+        apellido='Díaz',
+        edad=58,
+        genero='Femenino',
+        estado='moderado'
+    )
+
+    paciente10 = Paciente(
+        id='PAC010',
+        username='alberto.v',
+        password='pac010',
+        nombre='Alberto',
+        apellido='Vidal',
+        edad=83,
+        genero='Masculino',
+        estado='grave'
+    )
+
+    paciente11 = Paciente(
+        id='PAC011',
+        username='carmen.i',
+        password='pac011',
+        nombre='Carmen',
+        apellido='Iglesias',
+        edad=46,
+        genero='Femenino',
+        estado='leve'
+    )
+
+    # Creación de objetos Medico con sus atributos
+    medico1 = Medico(
+        id='MED001',
+        username='juanmed',
+        password='1234',
+        nombre='Juan',
+        apellido='Pérez',
+        edad=45,
+        genero='Masculino',
+        turno='Día',
+        horas=40,
+        salario=3000.00,
+        especialidad='Cardiología',
+        antiguedad=12
+    )
+
+    medico2 = Medico(
+        id='MED002',
+        username='anamed',
+        password='abcd',
+        nombre='Ana',
+        apellido='Gómez',
+        edad=38,
+        genero='Femenino',
+        turno='Noche',
+        horas=36,
+        salario=2800.00,
+        especialidad='Pediatría',
+        antiguedad=6
+    )
+
+    medico3 = Medico(
+        id='MED003',
+        username='carlosneu',
+        password='neu123',
+        nombre='Carlos',
+        apellido='Martínez',
+        edad=50,
+        genero='Masculino',
+        turno='Día',
+        horas=42,
+        salario=3500.00,
+        especialidad='Neurología',
+        antiguedad=15
+    )
+
+    medico4 = Medico(
+        id='MED004',
+        username='marialop',
+        password='mlop456',
+        nombre='María',
+        apellido='Lopez',
+        edad=40,
+        genero='Femenino',
+        turno='Día',
+        horas=38,
+        salario=3100.00,
+        especialidad='Traumatología',
+        antiguedad=8
+    )
+
+    medico5 = Medico(
+        id='MED005',
+        username='luissan',
+        password='ls123',
+        nombre='Luis',
+        apellido='Sánchez',
+        edad=35,
+        genero='Masculino',
+        turno='Noche',
+        horas=40,
+        salario=2900.00,
+        especialidad='Dermatología',
+        antiguedad=4
+    )
+
+    # Creación de objetos Enfermero con sus atributos
+    enfermero1 = Enfermero(
+        id="ENF001",
+        nombre="Juan",
+        apellido="Pérez",
+        edad=35,
+        genero="Masculino",
+        turno="mañana",
+        horas=40,
+        salario=1800,
+        especialidad="UCI",
+        antiguedad=6,
+        username='juan.perez',
+        password='passjuan'
+    )
+
+    enfermero2 = Enfermero(
+        id="ENF002",
+        nombre="María",
+        apellido="García",
+        edad=30,
+        genero="Femenino",
+        turno="tarde",
+        horas=38,
+        salario=1750,
+        especialidad="Pediatría",
+        antiguedad=3,
+        username='maria.garcia',
+        password='passmaria'
+    )
+
+    enfermero3 = Enfermero(
+        id="ENF003",
+        nombre="Pedro",
+        apellido="López",
+        edad=45,
+        genero="Masculino",
+        turno="noche",
+        horas=42,
+        salario=1900,
+        especialidad="Urgencias",
+        antiguedad=10,
+        username='pedro.lopez',
+        password='passpedro'
+    )
+
+    enfermero4 = Enfermero(
+        id="ENF004",
+        nombre="Laura",
+        apellido="Martínez",
+        edad=29,
+        genero="Femenino",
+        turno="mañana",
+        horas=36,
+        salario=1600,
+        especialidad="Oncología",
+        antiguedad=1,
+        username='laura.martinez',
+        password='passlaura'
+    )
+
+    enfermero5 = Enfermero(
+        id="ENF005",
+        nombre="Andrés",
+        apellido="Sánchez",
+        edad=50,
+        genero="Masculino",
+        turno="noche",
+        horas=40,
+        salario=2000,
+        especialidad="Reanimación",
+        antiguedad=14,
+        username='andres.sanchez',
+        password='passandres'
+    )
+
+    # Ejemplos de objetos `Auxiliar`
+    auxiliar1 = Auxiliar(
+        id='AUX001',
+        nombre='Claudia',
+        apellido='Mora',
+        edad=28,
+        genero='Femenino',
+        turno='Mañana',
+        horas=35,
+        salario=1200,
+        enfermero_asignado=None,
+        antiguedad=1
+    )
+
+    auxiliar2 = Auxiliar(
+        id='AUX002',
+        nombre='Carlos',
+        apellido='Ramírez',
+        edad=40,
+        genero='Masculino',
+        turno='Tarde',
+        horas=40,
+        salario=1300,
+        enfermero_asignado=enfermero1,
+        antiguedad=5
+    )
+
+    auxiliar3 = Auxiliar(
+        id='AUX003',
+        nombre='Lucía',
+        apellido='Delgado',
+        edad=33,
+        genero='Femenino',
+        turno='Noche',
+        horas=38,
+        salario=1250,
+        enfermero_asignado=enfermero5,
+        antiguedad=10
+    )
+
+    auxiliar4 = Auxiliar(
+        id='AUX004',
+        nombre='Javier',
+        apellido='Gómez',
+        edad=45,
+        genero='Masculino',
+        turno='Noche',
+        horas=36,
+        salario=1350,
+        enfermero_asignado=None,
+        antiguedad=13
+    )
+
+    auxiliar5 = Auxiliar(
+        id='AUX005',
+        nombre='Marina',
+        apellido='López',
+        edad=29,
+        genero='Femenino',
+        turno='Mañana',
+        horas=30,
+        salario=1100,
+        enfermero_asignado=None,
+        antiguedad=0
+    )
+
+    # Creación de objetos de la clase Paramedico
+    paramedico1 = Paramedico(
+        id='PAR001',
+        nombre='Laura',
+        apellido='Gómez',
+        edad=32,
+        genero='Femenino',
+        turno='mañana',
+        horas=36,
+        salario=1600,
+        especialidad='Emergencias',
+        antiguedad=4
+    )
+
+    paramedico2 = Paramedico(
+        id='PAR002',
+        nombre='Andrés',
+        apellido='Martínez',
+        edad=45,
+        genero='Masculino',
+        turno='tarde',
+        horas=40,
+        salario=1700,
+        especialidad='Traumatología',
+        antiguedad=10
+    )
+
+    paramedico3 = Paramedico(
+        id='PAR003',
+        nombre='Carmen',
+        apellido='López',
+        edad=29,
+        genero='Femenino',
+        turno='noche',
+        horas=38,
+        salario=1650,
+        especialidad='Cardiología',
+        antiguedad=6
+    )
+
+    paramedico4 = Paramedico(
+        id='PAR004',
+        nombre='Jorge',
+        apellido='Ruiz',
+        edad=39,
+        genero='Masculino',
+        turno='mañana',
+        horas=35,
+        salario=1550,
+        especialidad='Pediatría',
+        antiguedad=3
+    )
+
+    paramedico5 = Paramedico(
+        id='PAR005',
+        nombre='Natalia',
+        apellido='Fernández',
+        edad=41,
+        genero='Femenino',
+        turno='tarde',
+        horas=37,
+        salario=1680,
+        especialidad='Cuidados intensivos',
+        antiguedad=8
+    )
+
+    # Objetos:
+    # Ambulancia 1
+    ambulancia1 = Ambulancia(
+        matricula='A-1234-BC',
+        zona='Centro',
+        modelo='Mercedes-Benz Sprinter',
+        sirena='bitonal'
+    )
+
+    # Ambulancia 2
+    ambulancia2 = Ambulancia(
+        matricula='B-5678-DE',
+        zona='Norte',
+        modelo='Ford Transit',
+        sirena='secuencial'
+    )
+
+    # Ambulancia 3
+    ambulancia3 = Ambulancia(
+        matricula='C-9012-FG',
+        zona='Sur',
+        modelo='Peugeot Boxer',
+        sirena='ninoninoni'
+    )
+
+    habitacion1 = Habitacion(99, 4)
+    habitacion2 = Habitacion(54, 1)
+    habitacion3 = Habitacion(109, 2)
+    habitacion4 = Habitacion(90, 3)
+    habitacion5 = Habitacion(190, 10)
+
+    # Ejemplo de objetos:
+    centro1 = Centro(
+        nombre_comunidad='Comunidad Valenciana',
+        nombre_provincia='Alicante',
+        id_centro="CENTRO001",
+        nombre_centro="Hospital General de Alicante",
+        cantidad_trabajadores=250,
+        presupuesto=1500000,
+        habitaciones=120
+    )
+
+    centro2 = Centro(
+        nombre_comunidad="Andalucía",
+        nombre_provincia="Sevilla",
+        id_centro="CENTRO002",
+        nombre_centro="Clínica Nuestra Señora del Rocío",
+        cantidad_trabajadores=180,
+        presupuesto=950000,
+        habitaciones=80
+    )
+
+    centro3 = Centro(
+        nombre_comunidad="Cataluña",
+        nombre_provincia="Barcelona",
+        id_centro="CENTRO003",
+        nombre_centro="Centro Médico Sant Pau",
+        cantidad_trabajadores=300,
+        presupuesto=2000000,
+        habitaciones=150
+    )
+
+    centro4 = Centro(
+        nombre_comunidad="Madrid",
+        nombre_provincia="Madrid",
+        id_centro="CENTRO004",
+        nombre_centro="Hospital de La Paz",
+        cantidad_trabajadores=500,
+        presupuesto=3200000,
+        habitaciones=200
+    )
+
+    centro5 = Centro(
+        nombre_comunidad="Castilla y León",
+        nombre_provincia="Valladolid",
+        id_centro="CENTRO005",
+        nombre_centro="Centro de Salud Valladolid Oeste",
+        cantidad_trabajadores=100,
+        presupuesto=600000,
+        habitaciones=60
+    )
+
+    provincia1 = Provincia(nombre_comunidad='Comunidad Valenciana', nombre_provincia='Alicante')
+    provincia2 = Provincia(nombre_comunidad='Comunidad de Madrid', nombre_provincia='Madrid')
+    provincia3 = Provincia(nombre_comunidad='Andalucía', nombre_provincia='Sevilla')
+    provincia4 = Provincia(nombre_comunidad='Cataluña', nombre_provincia='Barcelona')
+    provincia5 = Provincia(nombre_comunidad='Galicia', nombre_provincia='La Coruña')
+
+    # Objetos
+    enfermedad1 = Enfermedad(nombre='Gripe', sintomas='Fiebre, tos, dolor de cabeza, malestar general')
+    enfermedad2 = Enfermedad(nombre='Neumonía', sintomas='Tos persistente, fiebre alta, dificultad para respirar')
+    enfermedad3 = Enfermedad(nombre='Clamidia', sintomas='Ardor al orinar')
+    enfermedad4 = Enfermedad(nombre='Diabetes', sintomas='Aumento de la sed, hambre, orina frecuente', cronica=True)
+    enfermedad5 = Enfermedad(nombre='Migraña', sintomas='Dolor de cabeza intenso, náuseas, sensibilidad a la luz')
+
+    # Creación de objetos Medicamento con sus atributos
+    medicamento1 = Medicamento(
+        nombre="Ibuprofeno",
+        dosis="200mg",
+        precio=5.50,
+        fecha_caducidad=datetime(2025, 12, 31),
+        alergenos=["Lactosa"]
+    )
+
+    medicamento2 = Medicamento(
+        nombre="Paracetamol",
+        dosis="500mg",
+        precio=4.00,
+        fecha_caducidad=datetime(2024, 5, 20)
+    )
+
+    medicamento3 = Medicamento(
+        nombre="Amoxicilina",
+        dosis="250mg",
+        precio=8.00,
+        fecha_caducidad=datetime(2025, 3, 15),
+        alergenos=["Penicilina"]
+    )
+
+    medicamento4 = Medicamento(
+        nombre="Aspirina",
+        dosis="300mg",
+        precio=3.50,
+        fecha_caducidad=datetime(2024, 7, 5)
+    )
+
+    medicamento5 = Medicamento(
+        nombre="Loratadina",
+        dosis="10mg",
+        precio=2.50,
+        fecha_caducidad=datetime(2026, 1, 10),
+        alergenos=["Sulfatos"]
+    )
+
+    # Objetos
+    documento1 = Documento(
+        titulo='Informe de Ventas',
+        descripcion='Informe detallado sobre las ventas del mes.'
+    )
+    documento2 = Documento(
+        titulo='Planificación de Recursos',
+        descripcion='Documento para la asignación de recursos en el proyecto.'
+    )
+    documento3 = Documento(
+        titulo='Acta de Reunión',
+        descripcion='Resumen de la reunión del comité de dirección.'
+    )
+    documento4 = Documento(
+        titulo='Propuesta de Marketing',
+        descripcion='Propuesta con estrategias para aumentar las ventas.'
+    )
+    documento5 = Documento(
+        titulo='Informe de Finanzas',
+        descripcion='Informe detallado sobre el estado financiero de la empresa.'
+    )
+
+    # Creación de los objetos de la clase Secretario
+
+    secretario1 = Secretario(
+        id='SEC001',
+        nombre='Ana',
+        apellido='González',
+        edad=28,
+        genero='Femenino',
+        turno='mañana',
+        horas=40,
+        salario=1500,
+        titulo='Licenciatura en Administración',
+        descripcion='Gestión de documentos y tareas administrativas',
+        antiguedad=3,
+        email='ana.gonzalez@empresa.com',
+        departamento='Recursos Humanos'
+    )
+
+    secretario2 = Secretario(
+        id='SEC002',
+        nombre='Carlos',
+        apellido='López',
+        edad=35,
+        genero='Masculino',
+        turno='tarde',
+        horas=38,
+        salario=1600,
+        titulo='Diplomado en Gestión Empresarial',
+        descripcion='Atención al cliente y gestión de correspondencia',
+        antiguedad=5,
+        email='carlos.lopez@empresa.com',
+        departamento='Atención al Cliente'
+    )
+
+    secretario3 = Secretario(
+        id='SEC003',
+        nombre='Beatriz',
+        apellido='Martínez',
+        edad=40,
+        genero='Femenino',
+        turno='mañana',
+        horas=36,
+        salario=1550,
+        titulo='Licenciatura en Derecho',
+        descripcion='Gestión de contratos y documentos legales',
+        antiguedad=8,
+        email='beatriz.martinez@empresa.com',
+        departamento='Legal'
+    )
+
+    secretario4 = Secretario(
+        id='SEC004',
+        nombre='Luis',
+        apellido='Pérez',
+        edad=30,
+        genero='Masculino',
+        turno='noche',
+        horas=40,
+        salario=1700,
+        titulo='Técnico en Administración de Empresas',
+        descripcion='Soporte administrativo y gestión de agendas',
+        antiguedad=4,
+        email='luis.perez@empresa.com',
+        departamento='Operaciones'
+    )
+
+    secretario5 = Secretario(
+        id='SEC005',
+        nombre='Elena',
+        apellido='Rodríguez',
+        edad=25,
+        genero='Femenino',
+        turno='tarde',
+        horas=35,
+        salario=1450,
+        titulo='Bachillerato en Ciencias Sociales',
+        descripcion='Asistencia administrativa y organización de eventos',
+        antiguedad=2,
+        email='elena.rodriguez@empresa.com',
+        departamento='Marketing'
+    )
+
+    # Relaciones entre los objetos de ejemplo
+    medico1.asignar_paciente(paciente10)
+    medico1.asignar_paciente(paciente6)
+    medico5.asignar_paciente(paciente1)
+    enfermero1.asignar_paciente(paciente4)
+    enfermero2.asignar_paciente(paciente2)
+    enfermero2.asignar_paciente(paciente1)
+    ambulancia2.agregar_paramedico(paramedico4)
+    ambulancia2.agregar_paramedico(paramedico3)
+    habitacion2.limpiar()
+    habitacion4.añadir_pacientes(paciente11)
+    habitacion4.añadir_pacientes(paciente10)
+    habitacion4.eliminar_paciente(paciente10)
+    centro3.añadir_habitaciones(54)
+    enfermedad2.marcar_grave()
+    enfermedad3.marcar_grave()
+    enfermedad1.paciente_tiene_enfermedad(paciente3)
+    enfermedad1.paciente_tiene_enfermedad(paciente7)
+    documento2.marcar_urgente()
+    documento4.marcar_urgente()
+
+# Registros por ID, listos para cargarse en la API
+PACIENTES = {p.id: p for p in (paciente1, paciente2, paciente3, paciente4, paciente5, paciente6, paciente7,
+                                paciente8, paciente9, paciente10, paciente11)}
+MEDICOS = {m.id: m for m in (medico1, medico2, medico3, medico4, medico5)}
+ENFERMEROS = {e.id: e for e in (enfermero1, enfermero2, enfermero3, enfermero4, enfermero5)}
+AUXILIARES = {a.id: a for a in (auxiliar1, auxiliar2, auxiliar3, auxiliar4, auxiliar5)}
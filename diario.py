@@ -0,0 +1,285 @@
+"""
+Persistencia ligera para los registros en memoria: un diario de operaciones de solo escritura al final
+(append-only) más instantáneas (snapshots) compactadas periódicas.
+
+Cada cambio en un registro (alta, baja, asignar_medico, asignar_habitacion, crear_sip, ...) se añade al
+diario antes de aplicarse. Cada `intervalo_snapshot` operaciones se guarda una instantánea con el estado
+completo y el diario se vacía. Al arrancar se carga la última instantánea y solo se repiten las
+operaciones posteriores a ella.
+"""
+
+import os
+import pickle
+import struct
+import threading
+from collections.abc import MutableMapping
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional, Tuple
+from indices import Extractores, IndicesSecundarios
+
+_CABECERA = struct.Struct('<I')  # Longitud de cada registro del diario
+
+
+class Diario:
+    """
+    Diario de operaciones con instantáneas para uno o varios registros (diccionarios con nombre).
+
+    Atributos
+    ---------
+    directorio : str
+        Directorio donde se guardan 'diario.log' y 'snapshot.pkl'.
+    intervalo_snapshot : int
+        Número de operaciones tras el cual se genera una instantánea y se vacía el diario.
+    forzar_disco : bool
+        Si es True se hace fsync tras cada operación (más lento, pero no se pierde nada si se va la luz).
+    registros : Dict[str, dict]
+        Estado actual de cada registro.
+    secuencia : int
+        Número de la última operación aplicada.
+    indices : Dict[str, IndicesSecundarios]
+        Índices secundarios de cada registro que los haya pedido (no se guardan: se reconstruyen al abrir).
+
+    Es seguro usarlo desde varios hilos (por ejemplo, el servidor Flask): escribir en el diario, aplicar la
+    operación y generar la instantánea se hacen bajo un mismo cerrojo.
+    """
+
+    def __init__(self, directorio: str, intervalo_snapshot: int = 10_000, forzar_disco: bool = False):
+        """
+        Abre el diario del directorio indicado y recupera el estado (instantánea + cola del diario).
+
+        Parámetros
+        ----------
+        directorio : str
+            Directorio de trabajo (se crea si no existe).
+        intervalo_snapshot : int, opcional
+            Operaciones entre instantáneas. Por defecto 10000.
+        forzar_disco : bool, opcional
+            Hacer fsync en cada operación. Por defecto False.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.intervalo_snapshot = intervalo_snapshot
+        self.forzar_disco = forzar_disco
+        self.registros: Dict[str, dict] = {}
+        self.indices: Dict[str, IndicesSecundarios] = {}
+        self.secuencia = 0
+        self._desde_snapshot = 0
+        self._cerrojo = threading.RLock()
+        self._ruta_diario = os.path.join(directorio, 'diario.log')
+        self._ruta_snapshot = os.path.join(directorio, 'snapshot.pkl')
+        self._recuperar()
+        self._fichero = open(self._ruta_diario, 'ab')
+
+    # --- Recuperación ---
+    def _recuperar(self) -> None:
+        if os.path.exists(self._ruta_snapshot):
+            with open(self._ruta_snapshot, 'rb') as fichero:
+                self.secuencia, self.registros = pickle.load(fichero)
+        if not os.path.exists(self._ruta_diario):
+            return
+        valido = 0
+        with open(self._ruta_diario, 'rb') as fichero:
+            while True:
+                cabecera = fichero.read(_CABECERA.size)
+                if len(cabecera) < _CABECERA.size:
+                    break
+                longitud = _CABECERA.unpack(cabecera)[0]
+                datos = fichero.read(longitud)
+                if len(datos) < longitud:
+                    break
+                try:
+                    secuencia, _, registro, clave, valor, borrar = pickle.loads(datos)
+                except Exception:
+                    # Registro cortado por una caída a mitad de escritura: se descarta desde aquí
+                    break
+                valido = fichero.tell()
+                # Las operaciones ya incluidas en la instantánea se saltan
+                if secuencia <= self.secuencia:
+                    continue
+                self._aplicar(registro, clave, valor, borrar)
+                self.secuencia = secuencia
+                self._desde_snapshot += 1
+        if valido < os.path.getsize(self._ruta_diario):
+            with open(self._ruta_diario, 'r+b') as fichero:
+                fichero.truncate(valido)
+
+    def _aplicar(self, registro: str, clave: Any, valor: Any, borrar: bool) -> None:
+        datos = self.registros.setdefault(registro, {})
+        if borrar:
+            datos.pop(clave, None)
+        else:
+            datos[clave] = valor
+        indices = self.indices.get(registro)
+        if indices is not None:
+            if borrar:
+                indices.retirar(clave)
+            else:
+                indices.actualizar(clave, valor)
+
+    # --- Escritura ---
+    def registrar(self, operacion: str, registro: str, clave: Any, valor: Any = None, borrar: bool = False) -> None:
+        """
+        Añade una operación al diario y la aplica al registro.
+
+        Parámetros
+        ----------
+        operacion : str
+            Nombre de la operación (alta, baja, asignar_medico, asignar_habitacion, crear_sip, ...).
+        registro : str
+            Registro afectado (pacientes, medicos, sips, personas, ...).
+        clave : Any
+            Clave del elemento dentro del registro.
+        valor : Any, opcional
+            Nuevo valor del elemento (se ignora si borrar es True).
+        borrar : bool, opcional
+            Si es True la operación elimina la clave del registro.
+        """
+        with self._cerrojo:
+            self.secuencia += 1
+            datos = pickle.dumps((self.secuencia, operacion, registro, clave, valor, borrar), pickle.HIGHEST_PROTOCOL)
+            self._fichero.write(_CABECERA.pack(len(datos)) + datos)
+            self._fichero.flush()
+            if self.forzar_disco:
+                os.fsync(self._fichero.fileno())
+            self._aplicar(registro, clave, valor, borrar)
+            self._desde_snapshot += 1
+            if self._desde_snapshot >= self.intervalo_snapshot:
+                self.snapshot()
+
+    def snapshot(self) -> None:
+        """
+        Guarda una instantánea compactada del estado actual y vacía el diario.
+        La instantánea se escribe en un fichero temporal y se renombra, así nunca queda a medias.
+        """
+        with self._cerrojo:
+            temporal = self._ruta_snapshot + '.tmp'
+            with open(temporal, 'wb') as fichero:
+                pickle.dump((self.secuencia, self.registros), fichero, pickle.HIGHEST_PROTOCOL)
+                fichero.flush()
+                os.fsync(fichero.fileno())
+            os.replace(temporal, self._ruta_snapshot)
+            # Si el proceso cae antes de vaciar el diario, sus operaciones se saltan al recuperar por su secuencia
+            self._fichero.close()
+            self._fichero = open(self._ruta_diario, 'wb')
+            self._desde_snapshot = 0
+
+    def registro(self, nombre: str, indices: Optional[Extractores] = None) -> 'RegistroDiario':
+        """
+        Devuelve una vista con interfaz de diccionario sobre uno de los registros del diario.
+        Si se indican índices secundarios y el registro aún no los tiene, se construyen con los datos actuales.
+        """
+        with self._cerrojo:
+            datos = self.registros.setdefault(nombre, {})
+            if nombre not in self.indices or (indices and not self.indices[nombre].extractores):
+                self.indices[nombre] = IndicesSecundarios(indices or {})
+                for clave, valor in datos.items():
+                    self.indices[nombre].actualizar(clave, valor)
+        return RegistroDiario(self, nombre)
+
+    def cerrar(self) -> None:
+        """
+        Cierra el fichero del diario.
+        """
+        with self._cerrojo:
+            if not self._fichero.closed:
+                self._fichero.close()
+
+
+class RegistroDiario(MutableMapping):
+    """
+    Registro con interfaz de diccionario cuyas escrituras quedan en el diario.
+
+    Las asignaciones de claves nuevas se anotan como 'alta' ('crear_sip' en el registro de SIPs), las de
+    claves existentes como 'actualizar' y los borrados como 'baja'. Con `registrar` se puede anotar la
+    operación concreta (por ejemplo, 'asignar_medico').
+    """
+
+    def __init__(self, diario: Diario, nombre: str):
+        self.diario = diario
+        self.nombre = nombre
+
+    @property
+    def _datos(self) -> dict:
+        return self.diario.registros[self.nombre]
+
+    def __getitem__(self, clave: Any) -> Any:
+        return self._datos[clave]
+
+    def __setitem__(self, clave: Any, valor: Any) -> None:
+        with self.diario._cerrojo:
+            if clave in self._datos:
+                operacion = 'actualizar'
+            else:
+                operacion = 'crear_sip' if self.nombre == 'sips' else 'alta'
+            self.diario.registrar(operacion, self.nombre, clave, valor)
+
+    def __delitem__(self, clave: Any) -> None:
+        with self.diario._cerrojo:
+            if clave not in self._datos:
+                raise KeyError(clave)
+            self.diario.registrar('baja', self.nombre, clave, borrar=True)
+
+    def __contains__(self, clave: object) -> bool:
+        return clave in self._datos
+
+    def __iter__(self) -> Iterator[Any]:
+        # Se recorre una copia de las claves: otro hilo puede estar dando altas o bajas
+        with self.diario._cerrojo:
+            claves = list(self._datos)
+        return iter(claves)
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def registrar(self, operacion: str, clave: Any, valor: Any) -> None:
+        """
+        Guarda un valor anotando en el diario el nombre de la operación.
+        """
+        self.diario.registrar(operacion, self.nombre, clave, valor)
+
+    def buscar_por_username(self, username: str) -> Optional[Any]:
+        """
+        Devuelve el objeto con ese username, o None si no existe.
+        """
+        with self.diario._cerrojo:
+            objetos = list(self._datos.values())
+        for objeto in objetos:
+            if getattr(objeto, 'username', None) == username:
+                return objeto
+        return None
+
+    def consultar(self, filtros: Optional[Dict[str, Any]] = None, despues: Any = None,
+                  limite: Optional[int] = None) -> Iterator[Tuple[Any, Any]]:
+        """
+        Recorre en orden de clave los pares (id, objeto) que cumplen los filtros, usando los índices secundarios.
+        Ver RepositorioSQLite.consultar.
+        """
+        with self.diario._cerrojo:
+            indices = self.diario.indices[self.nombre]
+            pares = [(clave, self._datos[clave]) for clave in islice(indices.consultar(filtros, despues), limite)]
+        return iter(pares)
+
+    def sincronizar(self) -> None:
+        """
+        Las operaciones ya se escriben al diario en cuanto se hacen; no hay nada pendiente.
+        """
+
+    def cerrar(self) -> None:
+        """
+        El fichero lo cierra el Diario compartido.
+        """
+
+
+_diarios: Dict[str, Diario] = {}
+_cerrojo_diarios = threading.Lock()
+
+
+def obtener_diario(directorio: str) -> Diario:
+    """
+    Devuelve el Diario de un directorio, abriéndolo una sola vez por proceso.
+    """
+    directorio = os.path.abspath(directorio)
+    with _cerrojo_diarios:
+        if directorio not in _diarios:
+            _diarios[directorio] = Diario(directorio)
+        return _diarios[directorio]
@@ -73,31 +73,3 @@ class Documento:
         else:
             self.prioridad = 0
         return self.prioridad
-
-
-# Objetos
-documento1 = Documento(
-    titulo='Informe de Ventas',
-    descripcion='Informe detallado sobre las ventas del mes.'
-)
-documento2 = Documento(
-    titulo='Planificación de Recursos',
-    descripcion='Documento para la asignación de recursos en el proyecto.'
-)
-documento3 = Documento(
-    titulo='Acta de Reunión',
-    descripcion='Resumen de la reunión del comité de dirección.'
-)
-documento4 = Documento(
-    titulo='Propuesta de Marketing',
-    descripcion='Propuesta con estrategias para aumentar las ventas.'
-)
-documento5 = Documento(
-    titulo='Informe de Finanzas',
-    descripcion='Informe detallado sobre el estado financiero de la empresa.'
-)
-
-documento2.marcar_urgente()
-documento4.marcar_urgente()
-print(documento1.prioritarios())
-print(documento2.prioritarios())
@@ -1,4 +1,6 @@
-from paciente import paciente3, paciente7
+from sintomas import VOCABULARIO
+
+
 class Enfermedad:
     '''
     Clase que representa una enfermedad, con atributos como el nombre, los síntomas, la condición de crónica,
@@ -10,6 +12,8 @@ class Enfermedad:
         Nombre de la enfermedad.
     sintomas : str
         Síntomas asociados a la enfermedad.
+    sintomas_ids : frozenset
+        Ids de los síntomas en el vocabulario compartido (sintomas.VOCABULARIO), calculados al crear la enfermedad.
     cronica : bool
         Indica si la enfermedad es crónica. Por defecto es False.
     grave : bool
@@ -32,6 +36,9 @@ class Enfermedad:
 
     listado_pacientes() :
         Devuelve la lista de pacientes afectados por la enfermedad.
+
+    lista_sintomas() :
+        Devuelve los síntomas normalizados de la enfermedad.
     '''
 
     def __init__(self, nombre: str, sintomas: str, cronica: bool = False):
@@ -43,7 +50,8 @@ class Enfermedad:
         nombre : str
             Nombre de la enfermedad.
         sintomas : str
-            Síntomas asociados a la enfermedad.
+            Síntomas asociados a la enfermedad, separados por comas (por ejemplo, 'Fiebre, tos, dolor de cabeza').
+            También se acepta una lista de síntomas.
         cronica : bool, opcional
             Indica si la enfermedad es crónica. Por defecto es False.
 
@@ -56,10 +64,29 @@ class Enfermedad:
             raise ValueError('Debe proporcionar nombre y síntomas para la enfermedad.')
         self.nombre = nombre
         self.sintomas = sintomas
+        self.sintomas_ids = VOCABULARIO.ids(sintomas)
+        VOCABULARIO.registrar_enfermedad(self)
         self.cronica = cronica
         self.grave = False
         self.pacientes = []
 
+    def __getstate__(self) -> dict:
+        '''
+        Estado para pickle sin `sintomas_ids`: los ids solo valen en el vocabulario de este proceso.
+        '''
+        estado = self.__dict__.copy()
+        estado.pop('sintomas_ids', None)
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        '''
+        Restaura la enfermedad recalculando `sintomas_ids` en el vocabulario de este proceso y registrándola
+        en el índice síntoma -> enfermedades.
+        '''
+        self.__dict__.update(estado)
+        self.sintomas_ids = VOCABULARIO.ids(self.sintomas)
+        VOCABULARIO.registrar_enfermedad(self)
+
     def marcar_grave(self) -> str:
         '''
         Marca la enfermedad como grave, estableciendo el atributo `grave` a True.
@@ -121,18 +148,13 @@ class Enfermedad:
             listado.append(str(paciente))
         return listado
 
+    def lista_sintomas(self) -> list:
+        '''
+        Devuelve los síntomas normalizados (sin tildes y en minúsculas) de la enfermedad.
 
-# Objetos
-enfermedad1 = Enfermedad(nombre='Gripe', sintomas='Fiebre, tos, dolor de cabeza, malestar general')
-enfermedad2 = Enfermedad(nombre='Neumonía', sintomas='Tos persistente, fiebre alta, dificultad para respirar')
-enfermedad3 = Enfermedad(nombre='Clamidia', sintomas='Ardor al orinar')
-enfermedad4 = Enfermedad(nombre='Diabetes', sintomas='Aumento de la sed, hambre, orina frecuente', cronica=True)
-enfermedad5 = Enfermedad(nombre='Migraña', sintomas='Dolor de cabeza intenso, náuseas, sensibilidad a la luz')
-
-enfermedad2.marcar_grave()
-enfermedad3.marcar_grave()
-enfermedad1.paciente_tiene_enfermedad(paciente3)
-enfermedad1.paciente_tiene_enfermedad(paciente7)
-print(enfermedad1.listado_pacientes())
-print(f'Pacientes con la enfermedad {enfermedad1.nombre}: {enfermedad1.listado_pacientes()}')
-
+        Devuelve
+        -------
+        list
+            Nombres de los síntomas, ordenados alfabéticamente.
+        '''
+        return sorted(VOCABULARIO.nombre(id_sintoma) for id_sintoma in self.sintomas_ids)
@@ -0,0 +1,239 @@
+"""
+Espejo local de RxNorm: un índice en disco de nombres de medicamentos para consultar sin depender de la
+red (rxnav.nlm.nih.gov).
+
+El índice se construye una vez con la herramienta de importación, a partir de:
+- un volcado de RxNorm (fichero RXNCONSO.RRF de la descarga completa), o
+- un corpus de respuestas grabadas de drugs.json (servidor_rxnorm_local.py grabar ...).
+
+Formato del índice (directorio):
+- cadenas.bin: registros 'clave\\x1fname\\x1frxcui\\x1ftty\\x1flanguage' en UTF-8, ordenados por clave
+  (nombre en minúsculas, casefold).
+- posiciones.npy: posición de inicio de cada registro (más una final), en int64.
+
+Ambos ficheros se abren con memory-map, así que abrir el espejo no lee el índice entero y cada búsqueda
+es una búsqueda binaria sobre las claves.
+
+Uso:
+    python espejo_rxnorm.py rrf RXNCONSO.RRF directorio
+    python espejo_rxnorm.py grabaciones grabaciones.json directorio
+    python espejo_rxnorm.py buscar directorio nombre [exacto|insensible|prefijo]
+"""
+
+import json
+import mmap
+import os
+import sys
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from cliente_rxnorm import CAMPOS_CONCEPTO, extraer_conceptos
+
+SEPARADOR = b'\x1f'
+MODOS_BUSQUEDA = ('exacto', 'insensible', 'prefijo')
+
+
+def clave_nombre(nombre: str) -> str:
+    """
+    Clave de búsqueda de un nombre: sin espacios en los extremos y en minúsculas (casefold).
+    """
+    return nombre.strip().casefold()
+
+
+def construir_espejo(entradas: Iterable[Tuple[str, Dict[str, str]]], directorio: str) -> int:
+    """
+    Construye el índice a partir de pares (nombre por el que se busca, concepto).
+
+    Parámetros
+    ----------
+    entradas : Iterable[Tuple[str, Dict[str, str]]]
+        Nombre de búsqueda y concepto con los campos name, rxcui, tty y language.
+    directorio : str
+        Directorio de destino (se crea si no existe). Los ficheros se sustituyen de forma atómica.
+
+    Devuelve
+    --------
+    int
+        Número de registros del índice.
+    """
+    registros = set()
+    for nombre, concepto in entradas:
+        clave = clave_nombre(nombre)
+        if not clave:
+            continue
+        campos = (clave, *(str(concepto.get(campo) or '') for campo in CAMPOS_CONCEPTO))
+        registros.add(SEPARADOR.join(campo.replace('\x1f', ' ').encode('utf-8') for campo in campos))
+    # Ordenar los bytes UTF-8 equivale a ordenar por clave (la clave va primero y el separador es < ' ')
+    ordenados = sorted(registros)
+    posiciones = np.zeros(len(ordenados) + 1, dtype=np.int64)
+    if ordenados:
+        posiciones[1:] = np.cumsum([len(registro) for registro in ordenados])
+    os.makedirs(directorio, exist_ok=True)
+    ruta_cadenas = os.path.join(directorio, 'cadenas.bin')
+    ruta_posiciones = os.path.join(directorio, 'posiciones.npy')
+    with open(ruta_cadenas + '.tmp', 'wb') as fichero:
+        fichero.write(b''.join(ordenados))
+    with open(ruta_posiciones + '.tmp', 'wb') as fichero:
+        np.save(fichero, posiciones)
+    os.replace(ruta_cadenas + '.tmp', ruta_cadenas)
+    os.replace(ruta_posiciones + '.tmp', ruta_posiciones)
+    return len(ordenados)
+
+
+def leer_rrf(ruta: str, fuentes: Tuple[str, ...] = ('RXNORM',)) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Lee los conceptos de un fichero RXNCONSO.RRF de RxNorm (campos separados por '|').
+    Se descartan los nombres suprimidos y los de otras fuentes (SAB) distintas de las indicadas.
+    """
+    with open(ruta, encoding='utf-8') as fichero:
+        for linea in fichero:
+            campos = linea.rstrip('\n').split('|')
+            if len(campos) < 17 or campos[11] not in fuentes or campos[16] in ('O', 'Y', 'E'):
+                continue
+            concepto = {'name': campos[14], 'rxcui': campos[0], 'tty': campos[12], 'language': campos[1]}
+            yield concepto['name'], concepto
+
+
+def leer_grabaciones(ruta: str) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Lee un corpus de respuestas grabadas de drugs.json ({nombre buscado: respuesta}). Cada concepto se
+    indexa por su propio nombre y por el nombre con el que se buscó, para que esa búsqueda devuelva lo
+    mismo que devolvía RxNorm.
+    """
+    with open(ruta, encoding='utf-8') as fichero:
+        grabaciones = json.load(fichero)
+    for buscado, respuesta in grabaciones.items():
+        for concepto in extraer_conceptos(respuesta):
+            yield buscado, concepto
+            if concepto.get('name'):
+                yield concepto['name'], concepto
+
+
+class _Claves:
+    # Vista de solo lectura de las claves del índice, para usar bisect directamente sobre el mmap
+    def __init__(self, espejo: 'EspejoRxNorm'):
+        self._espejo = espejo
+
+    def __len__(self) -> int:
+        return len(self._espejo)
+
+    def __getitem__(self, posicion: int) -> bytes:
+        return self._espejo._clave(posicion)
+
+
+class EspejoRxNorm:
+    """
+    Índice local de RxNorm abierto con memory-map.
+
+    Atributos
+    ---------
+    directorio : str
+        Directorio del índice.
+    """
+
+    def __init__(self, directorio: str):
+        """
+        Abre un índice creado con `construir_espejo`.
+
+        Excepciones
+        -----------
+        FileNotFoundError
+            Si el directorio no contiene un índice.
+        """
+        self.directorio = directorio
+        self._posiciones = np.load(os.path.join(directorio, 'posiciones.npy'), mmap_mode='r')
+        self._fichero = open(os.path.join(directorio, 'cadenas.bin'), 'rb')
+        tamaño = os.fstat(self._fichero.fileno()).st_size
+        # mmap no admite ficheros vacíos
+        self._cadenas = mmap.mmap(self._fichero.fileno(), 0, access=mmap.ACCESS_READ) if tamaño else b''
+        self._claves = _Claves(self)
+
+    def __len__(self) -> int:
+        return len(self._posiciones) - 1
+
+    def _registro(self, posicion: int) -> bytes:
+        return self._cadenas[int(self._posiciones[posicion]):int(self._posiciones[posicion + 1])]
+
+    def _clave(self, posicion: int) -> bytes:
+        inicio = int(self._posiciones[posicion])
+        return self._cadenas[inicio:self._cadenas.find(SEPARADOR, inicio)]
+
+    def _concepto(self, posicion: int) -> Dict[str, str]:
+        campos = self._registro(posicion).decode('utf-8').split('\x1f')[1:]
+        return dict(zip(CAMPOS_CONCEPTO, campos))
+
+    def buscar(self, nombre: str, modo: str = 'insensible', limite: Optional[int] = 100) -> List[Dict[str, str]]:
+        """
+        Busca conceptos por nombre.
+
+        Parámetros
+        ----------
+        nombre : str
+            Nombre (o comienzo del nombre) del medicamento.
+        modo : str, opcional
+            'exacto' (mismo nombre, distinguiendo mayúsculas), 'insensible' (mismo nombre sin distinguir
+            mayúsculas, por defecto) o 'prefijo' (nombres que empiezan así, sin distinguir mayúsculas).
+        limite : int, opcional
+            Número máximo de conceptos devueltos (None: todos). Por defecto 100.
+
+        Devuelve
+        --------
+        List[Dict[str, str]]
+            Conceptos (name, rxcui, tty, language) en orden de nombre.
+
+        Excepciones
+        -----------
+        ValueError
+            Si el modo no es válido.
+        """
+        if modo not in MODOS_BUSQUEDA:
+            raise ValueError(f'Modo de búsqueda no válido: {modo}')
+        clave = clave_nombre(nombre).encode('utf-8')
+        if not clave:
+            return []
+        resultado = []
+        vistos = set()
+        posicion = bisect_left(self._claves, clave)
+        while posicion < len(self) and (limite is None or len(resultado) < limite):
+            actual = self._claves[posicion]
+            if not (actual.startswith(clave) if modo == 'prefijo' else actual == clave):
+                break
+            concepto = self._concepto(posicion)
+            posicion += 1
+            if modo == 'exacto' and concepto['name'].strip() != nombre.strip():
+                continue
+            # Un concepto puede estar indexado por su nombre y por el nombre con el que se buscó
+            identidad = (concepto['rxcui'], concepto['tty'], concepto['name'])
+            if identidad not in vistos:
+                vistos.add(identidad)
+                resultado.append(concepto)
+        return resultado
+
+    def cerrar(self) -> None:
+        """
+        Libera el memory-map y cierra los ficheros.
+        """
+        if isinstance(self._cadenas, mmap.mmap):
+            self._cadenas.close()
+        self._fichero.close()
+
+
+def main() -> None:
+    if len(sys.argv) < 4 or sys.argv[1] not in ('rrf', 'grabaciones', 'buscar'):
+        print(__doc__)
+        return
+    if sys.argv[1] == 'buscar':
+        espejo = EspejoRxNorm(sys.argv[2])
+        for concepto in espejo.buscar(sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else 'insensible'):
+            print(concepto)
+        espejo.cerrar()
+        return
+    lector = leer_rrf if sys.argv[1] == 'rrf' else leer_grabaciones
+    total = construir_espejo(lector(sys.argv[2]), sys.argv[3])
+    print(f'Índice creado en {sys.argv[3]} con {total} registros')
+
+
+if __name__ == '__main__':
+    main()
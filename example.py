@@ -4,7 +4,7 @@ Script para interactuar con la API local (gestión de usuarios y SIPs) y la API
 Funcionalidades:
 - Obtiene y muestra el menú de opciones según el rol del usuario autenticado.
 - Permite interactuar con las opciones específicas del menú de cada rol (paciente, médico, enfermero).
-- Permite buscar información de medicamentos usando la API RxNorm.
+- Permite buscar información de uno o varios medicamentos (RxNorm) con el endpoint /medicamentos/info.
 - Permite crear y consultar SIPs usando la API local.
 - Menú con opciones específicas del rol, opciones adicionales (RxNorm, SIPs), y salir.
 """
@@ -12,9 +12,9 @@ Funcionalidades:
 # === Importaciones ===
 import requests
 
+
 # === Configuración de URLs ===
 URL_API = "http://localhost:5000"  # Ajusta este puerto según el puerto de tu API
-URL_RXNORM = "https://rxnav.nlm.nih.gov/REST/drugs.json"  # API RxNorm
 
 # === Funciones de Utilidad ===
 def param(nombre: str, lon_min: int = 0) -> str:
@@ -40,43 +40,6 @@ def param(nombre: str, lon_min: int = 0) -> str:
         else:
             return entrada
 
-def obtener_informacion_medicamento(medicamento: str) -> None:
-    """
-    Busca información de un medicamento usando la API RxNorm e imprime los detalles.
-
-    Parámetros
-    ----------
-    medicamento : str
-        Nombre del medicamento del que se desea obtener información.
-
-    Devuelve
-    -------
-    None
-        Imprime la información del medicamento en la consola.
-    """
-    try:
-        response = requests.get(URL_RXNORM, params={'name': medicamento})
-        response.raise_for_status()
-
-        data = response.json()
-
-        if 'conceptGroup' in data['drugGroup']:
-            medicamentos = data['drugGroup']['conceptGroup']
-            for med in medicamentos:
-                if 'conceptProperties' in med:
-                    for propiedad in med['conceptProperties']:
-                        print(f"Nombre: {propiedad.get('name')}")
-                        print(f"RXCUI: {propiedad.get('rxcui')}")
-                        print(f"TTY: {propiedad.get('tty')}")
-                        print(f"Idioma: {propiedad.get('language')}")
-                        print("-------------------------------")
-                        print("")
-        else:
-            print("El medicamento que has proporcionado no existe o no se encuentra en la base de datos.")
-
-    except requests.exceptions.RequestException as error:
-        print(f"No se puede completar su solicitud: {error}")
-
 def obtener_menu(username: str, password: str) -> dict:
     """
     Obtiene el menú de opciones desde el endpoint /menu de la API local.
@@ -104,6 +67,36 @@ def obtener_menu(username: str, password: str) -> dict:
         print(f"Error al conectar con la API: {str(e)}")
         return {"rol": "", "menu": []}
 
+def obtener_informacion_medicamentos(nombres: list) -> None:
+    """
+    Consulta varios medicamentos con el endpoint /medicamentos/info de la API local e imprime el resultado.
+
+    Parámetros
+    ----------
+    nombres : list
+        Nombres de los medicamentos.
+    """
+    try:
+        r = requests.post(f"{URL_API}/medicamentos/info", json={"medicamentos": nombres}, timeout=30)
+        r.raise_for_status()
+    except requests.exceptions.HTTPError as e:
+        print(f"Error HTTP: {e.response.status_code} - {e.response.text}")
+        return
+    except requests.RequestException as e:
+        print(f"Error al conectar con la API: {str(e)}")
+        return
+    for resultado in r.json()["resultados"]:
+        print(f"\n=== {resultado['nombre']} ===")
+        if "error" in resultado:
+            print(resultado["error"])
+            continue
+        for concepto in resultado["conceptos"]:
+            print(f"Nombre: {concepto['name']}")
+            print(f"RXCUI: {concepto['rxcui']}")
+            print(f"TTY: {concepto['tty']}")
+            print(f"Idioma: {concepto['language']}")
+            print("-------------------------------")
+
 # === Función Principal ===
 def main() -> None:
     """
@@ -142,7 +135,7 @@ def main() -> None:
         for item in menu:
             print(item)
         print("Opciones adicionales:")
-        print(f"{opcion_salir + 1}. Buscar información de un medicamento (RxNorm)")
+        print(f"{opcion_salir + 1}. Buscar información de medicamentos (RxNorm)")
         print(f"{opcion_salir + 2}. Crear SIP para un paciente")
         print(f"{opcion_salir + 3}. Consultar SIP de un paciente")
         print("0. Salir")
@@ -165,9 +158,10 @@ def main() -> None:
 
         # Opciones adicionales
         if opcion_num == opcion_salir + 1:  # Buscar información de medicamento (RxNorm)
-            medicamento = param("Nombre del medicamento", lon_min=1)
-            print(f"\nBuscando información para el medicamento: {medicamento}")
-            obtener_informacion_medicamento(medicamento)
+            medicamentos = param("Nombres de los medicamentos (separados por comas)", lon_min=1)
+            nombres = [nombre.strip() for nombre in medicamentos.split(",") if nombre.strip()]
+            print(f"\nBuscando información para: {', '.join(nombres)}")
+            obtener_informacion_medicamentos(nombres)
 
         elif opcion_num == opcion_salir + 2:  # Crear SIP para un paciente
             paciente_id = param("ID del paciente", lon_min=1)
@@ -201,9 +195,43 @@ def main() -> None:
                     except requests.RequestException as e:
                         print(f"Error al ver información personal: {str(e)}")
 
-                case 2:  # Pedir cita (no implementado en la API, placeholder)
-                    print("Funcionalidad 'Pedir cita' no implementada en la API.")
-                    # Aquí podrías implementar un endpoint /paciente/cita en la API
+                case 2:  # Pedir cita: consultar los próximos huecos libres y reservar uno
+                    id_medico = param("ID del médico (vacío para buscar por especialidad)")
+                    if id_medico:
+                        consulta = {"medico": id_medico}
+                    else:
+                        consulta = {"especialidad": param("Especialidad", lon_min=1)}
+                    try:
+                        r = requests.get(f"{URL_API}/citas/huecos", params=consulta, auth=(username, password), timeout=5)
+                        r.raise_for_status()
+                        huecos = r.json().get("huecos", [])
+                    except requests.RequestException as e:
+                        print(f"Error al consultar huecos libres: {str(e)}")
+                        continue
+                    if not huecos:
+                        print("No hay huecos libres en los próximos días.")
+                        continue
+                    for i, hueco in enumerate(huecos, 1):
+                        print(f"{i}. Médico: {hueco['medico']} - Fecha y hora: {hueco['fecha_hora']}")
+                    eleccion = param("Número del hueco a reservar (vacío para no reservar)")
+                    if not eleccion:
+                        continue
+                    if not eleccion.isdigit() or not 1 <= int(eleccion) <= len(huecos):
+                        print("Hueco no válido.")
+                        continue
+                    hueco = huecos[int(eleccion) - 1]
+                    try:
+                        r = requests.post(
+                            f"{URL_API}/citas",
+                            json={"medico": hueco["medico"], "fecha_hora": hueco["fecha_hora"],
+                                  "motivo": param("Motivo de la cita")},
+                            auth=(username, password),
+                            timeout=5
+                        )
+                        r.raise_for_status()
+                        print(f"Cita reservada: {r.json()}")
+                    except requests.RequestException as e:
+                        print(f"Error al reservar la cita: {str(e)}")
 
                 case 3:  # Descargar información en PDF
                     try:
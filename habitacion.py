@@ -1,22 +1,80 @@
-from paciente import paciente10
-from paciente import paciente11
-from paciente import paciente5
+import csv
+import os
+from collections import Counter, deque
+from datetime import datetime
+
+MAX_HISTORIAL = 1000  # Ingresos y altas que se guardan en memoria por habitación
+
+
 class Habitacion:
-    def __init__(self, numero_habitacion, capacidad, limpia=False):
+    def __init__(self, numero_habitacion, capacidad, limpia=False, max_historial=MAX_HISTORIAL, fichero_historial=None):
         self.numero_habitacion = numero_habitacion
         self.capacidad = capacidad
-        self.limpia = limpia
-        self.pacientes = []
-        self.historial_pacientes= []
-        self.pacientes_info = []
+        self._limpia = limpia
+        # Ocupantes actuales por id de paciente (comprobar si un paciente está es O(1))
+        self._ocupantes = {}
+        # Historial de ingresos y altas (fecha, id, nombre, 'ingreso' o 'alta') limitado a max_historial; los más
+        # antiguos se añaden a fichero_historial (CSV) si se indica, o se descartan
+        self.historial_pacientes = deque(maxlen=max_historial)
+        self.fichero_historial = fichero_historial
+        # Funciones a las que se avisa de cada cambio de ocupación o limpieza (p. ej. el índice de camas libres)
+        self._observadores = []
+
+    @property
+    def limpia(self):
+        return self._limpia
+
+    @limpia.setter
+    def limpia(self, valor):
+        self._limpia = valor
+        self._notificar()
+
+    @property
+    def pacientes(self):
+        return list(self._ocupantes.values())
+
+    @property
+    def pacientes_info(self):
+        return [str(paciente.nombre) for paciente in self._ocupantes.values()]
+
+    @property
+    def camas_libres(self):
+        return self.capacidad - len(self._ocupantes)
+
+    def observar(self, funcion):
+        if funcion not in self._observadores:
+            self._observadores.append(funcion)
+
+    def dejar_de_observar(self, funcion):
+        if funcion in self._observadores:
+            self._observadores.remove(funcion)
+
+    def __getstate__(self):
+        # Los observadores pertenecen al proceso (p. ej. el gestor de habitaciones) y no se guardan
+        estado = self.__dict__.copy()
+        estado['_observadores'] = []
+        return estado
+
+    def _notificar(self):
+        for funcion in self._observadores:
+            funcion(self)
+
+    def _registrar(self, paciente, evento):
+        if self.fichero_historial and len(self.historial_pacientes) == self.historial_pacientes.maxlen:
+            with open(self.fichero_historial, 'a', newline='', encoding='utf-8') as fichero:
+                fecha, id_paciente, nombre, evento_antiguo = self.historial_pacientes[0]
+                csv.writer(fichero).writerow([self.numero_habitacion, fecha.isoformat(), id_paciente, nombre, evento_antiguo])
+        self.historial_pacientes.append((datetime.now(), paciente.id, str(paciente.nombre), evento))
 
     def obtener_info(self):
-        for paciente in self.pacientes:
-            self.pacientes_info.append(str(paciente.nombre))
-        info = f'Habitacion: {self.numero_habitacion} - Limpia: {self.limpia} - Capacidad: {self.capacidad} - Pacientes asignados: {self.pacientes_info} - Cantidad de pacientes: {len(self.pacientes)}'
-        return info
+        return (f'Habitacion: {self.numero_habitacion} - Limpia: {self.limpia} - Capacidad: {self.capacidad} - '
+                f'Pacientes asignados: {self.pacientes_info} - Cantidad de pacientes: {len(self._ocupantes)}')
+
     def __len__(self):
-        return len(self.pacientes)
+        return len(self._ocupantes)
+
+    def __contains__(self, paciente):
+        return paciente.id in self._ocupantes
 
     def limpiar(self):
         if not self.limpia:
@@ -27,28 +85,66 @@ class Habitacion:
     def añadir_pacientes(self, paciente):
         if len(self) >= self.capacidad:
             raise ValueError(f'La cantidad de pacientes de la habitacion {self.numero_habitacion} sobrepasa su capacidad: {self.capacidad}')
-        if paciente in self.pacientes:
+        if paciente in self:
             raise ValueError (f'El paciente {paciente.nombre} ya está registrado en la habitacion {self.numero_habitacion}')
         else:
-            self.pacientes.append(paciente)
-            self.historial_pacientes.append(paciente)
+            # Primero el historial (puede fallar al escribir el fichero): si falla, la habitación no cambia
+            self._registrar(paciente, 'ingreso')
+            self._ocupantes[paciente.id] = paciente
+            self._notificar()
         return self.pacientes
 
     def eliminar_paciente(self, paciente):
-        if paciente in self.pacientes:
-            self.pacientes.remove(paciente)
+        if paciente in self:
+            self._registrar(paciente, 'alta')
+            del self._ocupantes[paciente.id]
+            self._notificar()
             print(f'Paciente {paciente.nombre} eliminado de la habitación {self.numero_habitacion}.')
         else:
             print(f'Paciente {paciente.nombre} no está en la habitación {self.numero_habitacion}.')
 
-habitacion1 = Habitacion(99, 4)
-habitacion2 = Habitacion(54, 1)
-habitacion3 = Habitacion(109, 2)
-habitacion4 = Habitacion(90, 3)
-habitacion5 = Habitacion(190, 10)
-
-habitacion2.limpiar()
-habitacion4.añadir_pacientes(paciente11)
-habitacion4.añadir_pacientes(paciente10)
-print(habitacion4.obtener_info())
-habitacion4.eliminar_paciente(paciente10)
+    def deshacer_ingreso(self, paciente):
+        self.deshacer_ingresos([paciente])
+
+    def deshacer_ingresos(self, pacientes):
+        # Revierte varios añadir_pacientes sin mensajes (p. ej. si falla un ingreso en bloque): quita del historial
+        # el último ingreso de cada uno y, si alguno ya había pasado al fichero, lo reescribe una sola vez
+        en_fichero = Counter()
+        cambios = False
+        for paciente in pacientes:
+            if paciente not in self:
+                continue
+            for posicion in range(len(self.historial_pacientes) - 1, -1, -1):
+                _, id_paciente, _, evento = self.historial_pacientes[posicion]
+                if id_paciente == paciente.id and evento == 'ingreso':
+                    del self.historial_pacientes[posicion]
+                    break
+            else:
+                en_fichero[str(paciente.id)] += 1
+            del self._ocupantes[paciente.id]
+            cambios = True
+        if en_fichero:
+            self._borrar_del_fichero(en_fichero)
+        if cambios:
+            self._notificar()
+
+    def _borrar_del_fichero(self, ids_pacientes):
+        # Los ingresos ya habían pasado al fichero: se reescribe sin la última fila de ingreso de cada id
+        if not self.fichero_historial or not os.path.exists(self.fichero_historial):
+            return
+        with open(self.fichero_historial, newline='', encoding='utf-8') as fichero:
+            filas = list(csv.reader(fichero))
+        pendientes = Counter(ids_pacientes)
+        conservadas = []
+        for fila in reversed(filas):
+            # Las filas sin evento (ficheros anteriores a registrar las altas) son ingresos
+            if (pendientes[fila[2]] > 0 and fila[0] == str(self.numero_habitacion)
+                    and (len(fila) < 5 or fila[4] == 'ingreso')):
+                pendientes[fila[2]] -= 1
+            else:
+                conservadas.append(fila)
+        conservadas.reverse()
+        temporal = self.fichero_historial + '.tmp'
+        with open(temporal, 'w', newline='', encoding='utf-8') as fichero:
+            csv.writer(fichero).writerows(conservadas)
+        os.replace(temporal, self.fichero_historial)
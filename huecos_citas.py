@@ -0,0 +1,142 @@
+from datetime import date, datetime, time, timedelta
+from heapq import merge
+from itertools import islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+from citas import Cita, DURACION_CITA
+from almacen_citas import clave_persona
+
+MINUTOS_HUECO = int(DURACION_CITA.total_seconds() // 60)
+HUECOS_POR_DIA = 24 * 60 // MINUTOS_HUECO
+
+
+class MapaOcupacion:
+    '''
+    Mapa de ocupación por médico y día. Cada día se divide en huecos de `DURACION_CITA` alineados
+    (00:00, 00:30, ...) y se guarda como un entero en el que el bit i indica que el hueco i está ocupado.
+    Una cita que empieza a mitad de hueco bloquea ese hueco y el siguiente, igual que en Cita.se_solapa.
+
+    Atributos
+    ---------
+    hora_inicio : int
+        Hora a la que empieza la jornada de consulta.
+    hora_fin : int
+        Hora a la que termina la jornada de consulta.
+    bits : Dict[Tuple[Hashable, date], int]
+        (médico, día) -> máscara de huecos ocupados.
+    conteos : Dict[Tuple[Hashable, date], Dict[int, int]]
+        Cuántas citas bloquean cada hueco, para poder liberar un hueco al cancelar.
+    '''
+
+    def __init__(self, hora_inicio: int = 8, hora_fin: int = 20):
+        '''
+        Parámetros
+        ----------
+        hora_inicio : int, opcional
+            Hora de inicio de la jornada. Por defecto 8.
+        hora_fin : int, opcional
+            Hora de fin de la jornada. Por defecto 20.
+        '''
+        if not 0 <= hora_inicio < hora_fin <= 24:
+            raise ValueError('La jornada debe cumplir 0 <= hora_inicio < hora_fin <= 24')
+        self.hora_inicio = hora_inicio
+        self.hora_fin = hora_fin
+        primero = hora_inicio * 60 // MINUTOS_HUECO
+        ultimo = hora_fin * 60 // MINUTOS_HUECO
+        self._jornada = ((1 << ultimo) - 1) ^ ((1 << primero) - 1)
+        self.bits: Dict[Tuple[Hashable, date], int] = {}
+        self.conteos: Dict[Tuple[Hashable, date], Dict[int, int]] = {}
+
+    @staticmethod
+    def _huecos_de(fecha_hora: datetime) -> List[int]:
+        minutos = fecha_hora.hour * 60 + fecha_hora.minute
+        hueco, resto = divmod(minutos, MINUTOS_HUECO)
+        if resto or fecha_hora.second or fecha_hora.microsecond:
+            return [hueco, hueco + 1]
+        return [hueco]
+
+    def registrar(self, cita: Cita) -> None:
+        '''
+        Marca como ocupados los huecos que bloquea la cita.
+        '''
+        medico = clave_persona(cita.medico)
+        dia = cita.fecha_hora_dt.date()
+        for hueco in self._huecos_de(cita.fecha_hora_dt):
+            clave = (medico, dia)
+            if hueco >= HUECOS_POR_DIA:
+                # El bloqueo pasa al primer hueco del día siguiente
+                clave, hueco = (medico, dia + timedelta(days=1)), 0
+            conteo = self.conteos.setdefault(clave, {})
+            conteo[hueco] = conteo.get(hueco, 0) + 1
+            self.bits[clave] = self.bits.get(clave, 0) | (1 << hueco)
+
+    def retirar(self, cita: Cita) -> None:
+        '''
+        Libera los huecos de la cita que no estén bloqueados por otra.
+        '''
+        medico = clave_persona(cita.medico)
+        dia = cita.fecha_hora_dt.date()
+        for hueco in self._huecos_de(cita.fecha_hora_dt):
+            clave = (medico, dia)
+            if hueco >= HUECOS_POR_DIA:
+                clave, hueco = (medico, dia + timedelta(days=1)), 0
+            conteo = self.conteos.get(clave)
+            if not conteo or hueco not in conteo:
+                continue
+            conteo[hueco] -= 1
+            if not conteo[hueco]:
+                del conteo[hueco]
+                self.bits[clave] &= ~(1 << hueco)
+            if not conteo:
+                del self.conteos[clave]
+                del self.bits[clave]
+
+    def huecos_libres(self, medico, desde: datetime, hasta: datetime) -> Iterator[datetime]:
+        '''
+        Genera, en orden, el inicio de cada hueco libre del médico dentro de la jornada entre `desde` y `hasta`.
+        Cada día cuesta una operación sobre la máscara más una por hueco libre devuelto.
+
+        Parámetros
+        ----------
+        medico : object
+            Médico (objeto o clave) del que se buscan huecos.
+        desde : datetime
+            Instante a partir del cual se buscan huecos (se redondea al siguiente hueco).
+        hasta : datetime
+            Instante límite: solo se devuelven huecos que empiezan antes de él.
+        '''
+        clave_medico = clave_persona(medico)
+        dia = desde.date()
+        while dia <= hasta.date():
+            libres = self._jornada & ~self.bits.get((clave_medico, dia), 0)
+            if dia == desde.date():
+                minutos = desde.hour * 60 + desde.minute + (1 if desde.second or desde.microsecond else 0)
+                primero = -(-minutos // MINUTOS_HUECO)
+                libres &= ~((1 << primero) - 1)
+            inicio_dia = datetime.combine(dia, time())
+            while libres:
+                bajo = libres & -libres
+                hueco = bajo.bit_length() - 1
+                inicio = inicio_dia + timedelta(minutes=hueco * MINUTOS_HUECO)
+                if inicio >= hasta:
+                    return
+                yield inicio
+                libres ^= bajo
+            dia += timedelta(days=1)
+
+    def proximos_huecos(self, medicos: Iterable, desde: datetime, hasta: datetime,
+                        n: int) -> List[Tuple[Hashable, datetime]]:
+        '''
+        Devuelve los `n` primeros huecos libres entre varios médicos, ordenados por fecha.
+
+        Devuelve
+        --------
+        List[Tuple[Hashable, datetime]]
+            Pares (clave del médico, inicio del hueco).
+        '''
+        generadores = [self._huecos_etiquetados(clave_persona(medico), desde, hasta) for medico in medicos]
+        return [(clave, inicio) for inicio, clave in islice(merge(*generadores), n)]
+
+    def _huecos_etiquetados(self, clave_medico: Hashable, desde: datetime,
+                            hasta: datetime) -> Iterator[Tuple[datetime, Hashable]]:
+        for inicio in self.huecos_libres(clave_medico, desde, hasta):
+            yield inicio, clave_medico
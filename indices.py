@@ -0,0 +1,129 @@
+"""
+Índices secundarios en memoria para los registros con interfaz de diccionario (RepositorioMemoria y
+RegistroDiario). RepositorioSQLite guarda los mismos índices como columnas indexadas de su tabla.
+
+Cada índice se define con un nombre de campo y una función que extrae el valor del objeto, por ejemplo
+{'estado': lambda p: p.estado}. Los valores se comparan como texto.
+"""
+
+from bisect import bisect_right, insort
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+Extractores = Dict[str, Callable[[Any], Any]]
+
+
+def valor_indice(valor: Any) -> Optional[str]:
+    """
+    Normaliza el valor de un campo indexado: None se mantiene y el resto se convierte a texto.
+    """
+    return None if valor is None else str(valor)
+
+
+class IndicesSecundarios:
+    """
+    Índices secundarios de un registro, con las claves de cada valor ordenadas para paginar por cursor.
+
+    Atributos
+    ---------
+    extractores : Dict[str, Callable[[Any], Any]]
+        Campo -> función que obtiene el valor del campo a partir del objeto.
+    claves : List
+        Todas las claves del registro, ordenadas.
+    por_campo : Dict[str, Dict[str, List]]
+        Campo -> valor -> claves ordenadas de los objetos con ese valor.
+    valores : Dict[Any, Dict[str, Optional[str]]]
+        Clave -> valores indexados del objeto, para poder retirarlo sin volver a leerlo.
+    """
+
+    def __init__(self, extractores: Extractores):
+        self.extractores = extractores
+        self.claves: List[Any] = []
+        self.por_campo: Dict[str, Dict[str, List[Any]]] = {campo: {} for campo in extractores}
+        self.valores: Dict[Any, Dict[str, Optional[str]]] = {}
+
+    def valores_de(self, objeto: Any) -> Dict[str, Optional[str]]:
+        """
+        Calcula los valores indexados de un objeto.
+        """
+        return {campo: valor_indice(extraer(objeto)) for campo, extraer in self.extractores.items()}
+
+    def actualizar(self, clave: Any, objeto: Any) -> None:
+        """
+        Indexa un objeto nuevo o reindexa uno existente.
+        """
+        nuevos = self.valores_de(objeto)
+        anteriores = self.valores.get(clave)
+        if anteriores is None:
+            insort(self.claves, clave)
+        for campo, valor in nuevos.items():
+            if anteriores is not None:
+                if anteriores[campo] == valor:
+                    continue
+                self._quitar(campo, anteriores[campo], clave)
+            if valor is not None:
+                insort(self.por_campo[campo].setdefault(valor, []), clave)
+        self.valores[clave] = nuevos
+
+    def retirar(self, clave: Any) -> None:
+        """
+        Quita una clave de los índices. Si no estaba indexada no hace nada.
+        """
+        anteriores = self.valores.pop(clave, None)
+        if anteriores is None:
+            return
+        self._borrar_de(self.claves, clave)
+        for campo, valor in anteriores.items():
+            self._quitar(campo, valor, clave)
+
+    def _quitar(self, campo: str, valor: Optional[str], clave: Any) -> None:
+        if valor is None:
+            return
+        lista = self.por_campo[campo].get(valor)
+        if lista is None:
+            return
+        self._borrar_de(lista, clave)
+        if not lista:
+            del self.por_campo[campo][valor]
+
+    @staticmethod
+    def _borrar_de(lista: List[Any], clave: Any) -> None:
+        posicion = bisect_right(lista, clave) - 1
+        if posicion >= 0 and lista[posicion] == clave:
+            del lista[posicion]
+
+    def consultar(self, filtros: Optional[Dict[str, Any]] = None, despues: Any = None) -> Iterator[Any]:
+        """
+        Recorre en orden las claves que cumplen todos los filtros.
+
+        Parámetros
+        ----------
+        filtros : Dict[str, Any], opcional
+            Campo -> valor exigido.
+        despues : Any, opcional
+            Cursor: solo se devuelven claves mayores que esta.
+
+        Excepciones
+        -----------
+        ValueError
+            Si se filtra por un campo que no está indexado.
+        """
+        filtros = {campo: valor_indice(valor) for campo, valor in (filtros or {}).items()}
+        for campo in filtros:
+            if campo not in self.por_campo:
+                raise ValueError(f'El campo {campo} no está indexado')
+        if filtros:
+            # Se recorre la lista más corta y el resto de filtros se comprueban con los valores guardados
+            base = min((self.por_campo[campo].get(valor, []) for campo, valor in filtros.items()), key=len)
+        else:
+            base = self.claves
+        posicion = bisect_right(base, despues) if despues is not None else 0
+        while posicion < len(base):
+            clave = base[posicion]
+            valores = self.valores[clave]
+            if all(valores[campo] == valor for campo, valor in filtros.items()):
+                yield clave
+            # Si la lista cambia entre dos claves devueltas se sigue desde la última vista
+            if posicion < len(base) and base[posicion] == clave:
+                posicion += 1
+            else:
+                posicion = bisect_right(base, clave)
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+from sintomas import VOCABULARIO
+
 class Medicamento:
     '''
     Clase que representa un medicamento, con información sobre su nombre, dosis, precio, fecha de caducidad 
@@ -17,10 +19,15 @@ class Medicamento:
         Fecha de caducidad del medicamento.
     alergenos : list, opcional
         Lista de alérgenos presentes en el medicamento. Por defecto es None.
+    sintomas_curables : list, opcional
+        Lista de síntomas que trata el medicamento. Por defecto es None.
+    sintomas_curables_ids : frozenset
+        Ids de esos síntomas en el vocabulario compartido (sintomas.VOCABULARIO).
 
     Métodos
     -------
-    __init__(nombre: str, dosis: str, precio: float, fecha_caducidad: date, alergenos: list = None)
+    __init__(nombre: str, dosis: str, precio: float, fecha_caducidad: date, alergenos: list = None,
+             sintomas_curables: list = None)
         Inicializa los atributos del medicamento.
     obtener_info() -> str
         Devuelve una cadena con la información del medicamento.
@@ -28,7 +35,8 @@ class Medicamento:
         Verifica si el medicamento ha caducado o no.
     '''
 
-    def __init__(self, nombre: str, dosis: str, precio: float, fecha_caducidad: datetime, alergenos: list = None):
+    def __init__(self, nombre: str, dosis: str, precio: float, fecha_caducidad: datetime, alergenos: list = None,
+                 sintomas_curables: list = None):
         '''
         Inicializa los atributos del medicamento, incluidos alérgenos si se proporcionan.
 
@@ -44,6 +52,8 @@ class Medicamento:
             Fecha de caducidad del medicamento.
         alergenos : list, opcional
             Lista de alérgenos presentes en el medicamento. Por defecto es None.
+        sintomas_curables : list, opcional
+            Lista de síntomas que trata el medicamento (o un texto separado por comas). Por defecto es None.
 
         Excepciones
         ------------
@@ -58,6 +68,24 @@ class Medicamento:
             self.alergenos = alergenos
         else:
             self.alergenos = []
+        self.sintomas_curables = sintomas_curables if sintomas_curables is not None else []
+        self.sintomas_curables_ids = VOCABULARIO.ids(self.sintomas_curables)
+
+    def __getstate__(self) -> dict:
+        '''
+        Estado para pickle sin `sintomas_curables_ids`: los ids solo valen en el vocabulario de este proceso.
+        '''
+        estado = self.__dict__.copy()
+        estado.pop('sintomas_curables_ids', None)
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        '''
+        Restaura el medicamento recalculando `sintomas_curables_ids` en el vocabulario de este proceso.
+        '''
+        self.__dict__.update(estado)
+        self.sintomas_curables_ids = VOCABULARIO.ids(self.sintomas_curables)
+
     def obtener_info(self) -> str:
         '''
         Devuelve la información del medicamento en formato de cadena.
@@ -95,46 +123,3 @@ class Medicamento:
             return f'El medicamento {self.nombre} ha caducado el {self.fecha_caducidad}.'
         else:
             return f'El medicamento {self.nombre} está dentro de su periodo de validez.'
-
-
-# Creación de objetos Medicamento con sus atributos
-medicamento1 = Medicamento(
-    nombre="Ibuprofeno",
-    dosis="200mg",
-    precio=5.50,
-    fecha_caducidad=datetime(2025, 12, 31),
-    alergenos=["Lactosa"]
-)
-
-medicamento2 = Medicamento(
-    nombre="Paracetamol",
-    dosis="500mg",
-    precio=4.00,
-    fecha_caducidad=datetime(2024, 5, 20)
-)
-
-medicamento3 = Medicamento(
-    nombre="Amoxicilina",
-    dosis="250mg",
-    precio=8.00,
-    fecha_caducidad=datetime(2025, 3, 15),
-    alergenos=["Penicilina"]
-)
-
-medicamento4 = Medicamento(
-    nombre="Aspirina",
-    dosis="300mg",
-    precio=3.50,
-    fecha_caducidad=datetime(2024, 7, 5)
-)
-
-medicamento5 = Medicamento(
-    nombre="Loratadina",
-    dosis="10mg",
-    precio=2.50,
-    fecha_caducidad=datetime(2026, 1, 10),
-    alergenos=["Sulfatos"]
-)
-
-print(medicamento2.obtener_info())
-print(medicamento3.verificar_caducidad())
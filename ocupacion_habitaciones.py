@@ -0,0 +1,287 @@
+"""
+Historial de ocupación de las habitaciones: cuántas camas estaban ocupadas en un instante dado ("¿cuántas
+camas había ocupadas el martes pasado a las 03:00?") o a lo largo de un intervalo (gráficas de un año), en
+una habitación, en una planta o en todo un centro.
+
+- Cada habitación guarda sus ingresos (+1) y altas (-1) en un `RegistroOcupacion`: los instantes y los
+  cambios en arrays compactos ordenados por instante, junto con la suma acumulada de los cambios (la
+  ocupación después de cada evento).
+- La ocupación en un instante es la suma acumulada del último evento anterior, que se encuentra con una
+  búsqueda binaria.
+- Para una planta o un centro se mezclan los eventos de sus habitaciones una sola vez (hasta que llega un
+  evento nuevo) y una serie entera se calcula con una única búsqueda vectorizada (`np.searchsorted`).
+
+`HistorialOcupacion` observa las habitaciones (igual que el índice de camas libres de ManejoHabitaciones) y
+registra cada cambio de ocupación en el momento en que ocurre; también admite cargar eventos pasados.
+"""
+
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+Instante = Union[datetime, float]
+
+
+def _segundos(instante: Instante) -> float:
+    return instante.timestamp() if isinstance(instante, datetime) else float(instante)
+
+
+class RegistroOcupacion:
+    '''
+    Eventos de ocupación de una habitación, ordenados por instante.
+
+    Atributos
+    ---------
+    instantes : array
+        Instante de cada evento (segundos desde la época, como `datetime.timestamp`).
+    cambios : array
+        Camas que ocupa (positivo) o libera (negativo) cada evento.
+    acumulado : array
+        Camas ocupadas justo después de cada evento (suma acumulada de `cambios`).
+    '''
+
+    def __init__(self):
+        self.instantes = array('d')
+        self.cambios = array('h')
+        self.acumulado = array('l')
+
+    def __len__(self) -> int:
+        return len(self.instantes)
+
+    def registrar(self, instante: Instante, cambio: int) -> None:
+        '''
+        Añade un evento. Lo normal es que llegue en orden (coste O(1)); si es anterior al último, se inserta
+        en su sitio y se recalcula el acumulado desde ahí.
+
+        Parámetros
+        ----------
+        instante : datetime o float
+            Momento del ingreso o el alta.
+        cambio : int
+            Camas que se ocupan (positivo) o se liberan (negativo).
+        '''
+        segundos = _segundos(instante)
+        if not self.instantes or segundos >= self.instantes[-1]:
+            self.instantes.append(segundos)
+            self.cambios.append(cambio)
+            self.acumulado.append((self.acumulado[-1] if self.acumulado else 0) + cambio)
+            return
+        posicion = bisect_right(self.instantes, segundos)
+        self.instantes.insert(posicion, segundos)
+        self.cambios.insert(posicion, cambio)
+        self.acumulado.insert(posicion, 0)
+        total = self.acumulado[posicion - 1] if posicion else 0
+        for i in range(posicion, len(self.cambios)):
+            total += self.cambios[i]
+            self.acumulado[i] = total
+
+    def ocupadas(self, instante: Instante) -> int:
+        '''
+        Devuelve las camas ocupadas en un instante (0 antes del primer evento).
+        '''
+        posicion = bisect_right(self.instantes, _segundos(instante))
+        return self.acumulado[posicion - 1] if posicion else 0
+
+
+class HistorialOcupacion:
+    '''
+    Registro de la ocupación de un conjunto de habitaciones y motor de consultas en el tiempo por habitación,
+    por planta o por centro.
+
+    Atributos
+    ---------
+    registros : Dict[str, RegistroOcupacion]
+        Número de habitación -> sus eventos.
+    plantas : Dict[Hashable, Set[str]]
+        Planta -> números de sus habitaciones.
+    centros : Dict[Hashable, Set[str]]
+        id del centro -> números de sus habitaciones.
+    '''
+
+    def __init__(self):
+        self.registros: Dict[str, RegistroOcupacion] = {}
+        self.plantas: Dict[Hashable, Set[str]] = {}
+        self.centros: Dict[Hashable, Set[str]] = {}
+        self._ocupadas: Dict[str, int] = {}  # Última ocupación conocida de cada habitación observada
+        self._eventos = 0
+        # (tipo, valor) -> (eventos cuando se calculó, instantes, acumulado) de los eventos mezclados
+        self._mezclas: Dict[Tuple[str, Hashable], Tuple[int, np.ndarray, np.ndarray]] = {}
+
+    def añadir_habitacion(self, numero_habitacion: str, planta: Hashable = None, centro=None) -> RegistroOcupacion:
+        '''
+        Da de alta una habitación en el historial (si no estaba) y la asigna a una planta y a un centro.
+
+        Parámetros
+        ----------
+        numero_habitacion : str
+            Número de la habitación.
+        planta : Hashable, opcional
+            Planta (o unidad) a la que pertenece.
+        centro : Centro o Hashable, opcional
+            Centro al que pertenece (un `Centro` o su id).
+
+        Devuelve
+        --------
+        RegistroOcupacion
+            El registro de eventos de la habitación.
+        '''
+        registro = self.registros.setdefault(numero_habitacion, RegistroOcupacion())
+        if planta is not None:
+            self.plantas.setdefault(planta, set()).add(numero_habitacion)
+        if centro is not None:
+            self.centros.setdefault(getattr(centro, 'id_centro', centro), set()).add(numero_habitacion)
+        self._mezclas.clear()
+        return registro
+
+    def registrar(self, numero_habitacion: str, instante: Instante, cambio: int) -> None:
+        '''
+        Registra un ingreso (cambio positivo) o un alta (negativo) en una habitación, por ejemplo al cargar
+        la ocupación de fechas pasadas.
+        '''
+        if numero_habitacion not in self.registros:
+            self.añadir_habitacion(numero_habitacion)
+        self.registros[numero_habitacion].registrar(instante, cambio)
+        self._eventos += 1
+
+    def observar(self, habitacion, planta: Hashable = None, centro=None, instante: Optional[Instante] = None) -> None:
+        '''
+        Empieza a registrar los ingresos y altas de una habitación en el momento en que ocurren. Si ya tiene
+        pacientes, se registran como ocupadas desde `instante` (por defecto, ahora).
+        '''
+        registro = self.añadir_habitacion(habitacion.numero_habitacion, planta, centro)
+        # Si ya se había observado antes, se parte de la ocupación que quedó registrada
+        self._ocupadas[habitacion.numero_habitacion] = registro.acumulado[-1] if len(registro) else 0
+        self._al_cambiar(habitacion, instante)
+        habitacion.observar(self._al_cambiar)
+
+    def dejar_de_observar(self, habitacion) -> None:
+        '''
+        Deja de registrar los cambios de una habitación (sus eventos pasados se conservan).
+        '''
+        habitacion.dejar_de_observar(self._al_cambiar)
+        self._ocupadas.pop(habitacion.numero_habitacion, None)
+
+    def _al_cambiar(self, habitacion, instante: Optional[Instante] = None) -> None:
+        # La habitación avisa también cuando cambia su limpieza: solo cuenta si cambia la ocupación
+        ocupadas = len(habitacion)
+        cambio = ocupadas - self._ocupadas[habitacion.numero_habitacion]
+        if cambio:
+            self._ocupadas[habitacion.numero_habitacion] = ocupadas
+            self.registrar(habitacion.numero_habitacion, datetime.now() if instante is None else instante, cambio)
+
+    def _numeros(self, habitacion: Optional[str], planta: Hashable, centro) -> Tuple[Tuple[str, Hashable], Set[str]]:
+        if sum(valor is not None for valor in (habitacion, planta, centro)) > 1:
+            raise ValueError('Indica solo una habitación, una planta o un centro')
+        if habitacion is not None:
+            if habitacion not in self.registros:
+                raise ValueError(f'La habitación {habitacion} no está en el historial')
+            return ('habitacion', habitacion), {habitacion}
+        if planta is not None:
+            if planta not in self.plantas:
+                raise ValueError(f'La planta {planta} no está en el historial')
+            return ('planta', planta), self.plantas[planta]
+        if centro is not None:
+            centro = getattr(centro, 'id_centro', centro)
+            if centro not in self.centros:
+                raise ValueError(f'El centro {centro} no está en el historial')
+            return ('centro', centro), self.centros[centro]
+        return ('todas', None), set(self.registros)
+
+    def _mezcla(self, habitacion: Optional[str], planta: Hashable, centro) -> Tuple[np.ndarray, np.ndarray]:
+        # Eventos de todas las habitaciones del grupo en un único orden temporal, con su suma acumulada
+        clave, numeros = self._numeros(habitacion, planta, centro)
+        mezcla = self._mezclas.get(clave)
+        if mezcla is None or mezcla[0] != self._eventos:
+            registros = [self.registros[numero] for numero in numeros]
+            instantes = np.concatenate([np.array(registro.instantes, dtype=np.float64) for registro in registros]
+                                       or [np.empty(0)])
+            cambios = np.concatenate([np.array(registro.cambios, dtype=np.int64) for registro in registros]
+                                     or [np.empty(0, dtype=np.int64)])
+            orden = np.argsort(instantes, kind='stable')
+            mezcla = self._mezclas[clave] = (self._eventos, instantes[orden], np.cumsum(cambios[orden]))
+        return mezcla[1], mezcla[2]
+
+    def ocupadas(self, instante: Instante, habitacion: Optional[str] = None, planta: Hashable = None,
+                 centro=None) -> int:
+        '''
+        Camas ocupadas en un instante en una habitación, una planta, un centro o (sin ninguno de los tres)
+        en todas las habitaciones del historial.
+
+        Parámetros
+        ----------
+        instante : datetime o float
+            Momento de la consulta.
+        habitacion : str, opcional
+            Número de la habitación.
+        planta : Hashable, opcional
+            Planta.
+        centro : Centro o Hashable, opcional
+            Centro (o su id).
+
+        Devuelve
+        --------
+        int
+            Camas ocupadas en ese instante (incluye los eventos ocurridos justo en él).
+
+        Excepciones
+        -----------
+        ValueError
+            Si se indica más de un filtro o la habitación, la planta o el centro no están en el historial.
+        '''
+        if habitacion is not None and planta is None and centro is None:
+            self._numeros(habitacion, None, None)
+            return self.registros[habitacion].ocupadas(instante)
+        instantes, acumulado = self._mezcla(habitacion, planta, centro)
+        posicion = int(np.searchsorted(instantes, _segundos(instante), side='right'))
+        return int(acumulado[posicion - 1]) if posicion else 0
+
+    def serie(self, inicio: datetime, fin: datetime, paso: timedelta, habitacion: Optional[str] = None,
+              planta: Hashable = None, centro=None, maximo: bool = False) -> List[Tuple[datetime, int]]:
+        '''
+        Serie de ocupación entre dos fechas, para dibujarla.
+
+        Parámetros
+        ----------
+        inicio : datetime
+            Primer instante de la serie.
+        fin : datetime
+            Fin de la serie (no incluido).
+        paso : timedelta
+            Separación entre puntos (por ejemplo, una hora).
+        habitacion, planta, centro : opcional
+            Igual que en `ocupadas`.
+        maximo : bool, opcional
+            Si es True, cada punto es el máximo de camas ocupadas en [instante, instante + paso) en lugar de
+            las ocupadas justo en el instante (así no se pierden los picos más cortos que el paso). Por
+            defecto False.
+
+        Devuelve
+        --------
+        List[Tuple[datetime, int]]
+            (instante, camas ocupadas) por cada paso desde `inicio` hasta antes de `fin`.
+
+        Excepciones
+        -----------
+        ValueError
+            Si el paso no es positivo, o por los mismos motivos que `ocupadas`.
+        '''
+        if paso <= timedelta(0):
+            raise ValueError('El paso debe ser positivo')
+        instantes, acumulado = self._mezcla(habitacion, planta, centro)
+        fechas = [inicio + paso * i for i in range(max(0, -((inicio - fin) // paso)))]
+        muestras = np.fromiter((_segundos(fecha) for fecha in fechas), dtype=np.float64, count=len(fechas))
+        posiciones = np.searchsorted(instantes, muestras, side='right')
+        con_ocupacion = np.concatenate(([0], acumulado))
+        valores = con_ocupacion[posiciones]
+        if maximo and len(acumulado):
+            # Eventos dentro de cada tramo (instante, siguiente): del primero posterior al instante al
+            # último anterior al siguiente. Un reduceat sobre los pares (desde, hasta) da el máximo de cada uno
+            finales = np.append(muestras[1:], _segundos(fin))
+            hasta = np.searchsorted(instantes, finales, side='left')
+            limites = np.column_stack((posiciones, hasta)).ravel()
+            maximos = np.maximum.reduceat(np.append(acumulado, 0), np.minimum(limites, len(acumulado)))[::2]
+            valores = np.where(hasta > posiciones, np.maximum(valores, maximos), valores)
+        return list(zip(fechas, valores.tolist()))
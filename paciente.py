@@ -12,8 +12,8 @@ class Paciente(Persona):
         Identificador único del paciente.
     username : str
         Nombre de usuario del paciente.
-    password : str
-        Contraseña del paciente.
+    password_hash : bytes
+        Hash bcrypt de la contraseña (la contraseña en claro no se guarda).
     nombre : str
         Nombre del paciente.
     apellido : str
@@ -36,8 +36,12 @@ class Paciente(Persona):
         Prioridad del paciente en urgencias (1: alta, 2: moderada, 3: baja).
     historial_medico : List[str]
         Historial médico del paciente.
+    alergias : List[str]
+        Alérgenos a los que el paciente es alérgico.
     citas : List[Cita]
         Lista de citas del paciente.
+    cola_triaje : ColaTriaje, opcional
+        Cola de triaje de urgencias en la que espera el paciente, si está en alguna.
 
     Métodos
     -------
@@ -63,11 +67,10 @@ class Paciente(Persona):
         Devuelve un diccionario con los atributos del paciente.
     '''
 
-    def __init__(self, id,username, password, nombre, apellido, edad, genero, estado, medico_asignado=None, enfermero_asignado = None, habitacion_asginada = None, historial_medico: List[str] = None):
-        super().__init__(id, nombre, apellido, edad, genero, 'paciente')
+    def __init__(self, id,username, password, nombre, apellido, edad, genero, estado, medico_asignado=None, enfermero_asignado = None, habitacion_asginada = None, historial_medico: List[str] = None, alergias: List[str] = None):
+        super().__init__(id, nombre, apellido, edad, genero, 'paciente', password=password)
 
         self.username = username
-        self.password = password
         self.estado = estado
         self.medico_asignado = medico_asignado
         self.enfermero_asignado = enfermero_asignado
@@ -75,7 +78,15 @@ class Paciente(Persona):
         self.enfermedades = []
         self.prioridad_urgencias = 0
         self.historial_medico = historial_medico if historial_medico is not None else []
+        self.alergias = alergias if alergias is not None else []
         self.citas: List[Cita] = []
+        self.cola_triaje = None
+
+    def __getstate__(self) -> dict:
+        # La cola de triaje solo existe en este proceso: no se guarda con el paciente (se guardaría una copia entera)
+        estado = super().__getstate__()
+        estado['cola_triaje'] = None
+        return estado
 
     def asignar_medico(self, medico):
         '''
@@ -138,6 +149,8 @@ class Paciente(Persona):
             Nuevo estado del paciente.
         '''
         self.estado = nuevo_estado
+        if self.cola_triaje is not None:
+            self.cola_triaje.reprioritizar(self)
 
     def prioridad_urgencias(self):
         '''
@@ -189,7 +202,6 @@ class Paciente(Persona):
         return {
             'id': self.id,
             'username': self.username,
-            'password': self.password,
             'nombre': self.nombre,
             'edad': self.edad,
             'historial_medico': self.historial_medico,
@@ -75,7 +75,7 @@ class Paramedico(Trabajador):
         ValueError
             Si el id no empieza con 'PAR'.
         '''
-        super().__init__(id, nombre, apellido, edad, genero, turno, horas, salario, str, str)
+        super().__init__(id, nombre, apellido, edad, genero, turno, horas, salario)
         self.especialidad = especialidad
         self.antiguedad = antiguedad
         self.ambulancia_asignada = None
@@ -119,70 +119,3 @@ class Paramedico(Trabajador):
                     f'Turno: {self.turno} - Horas: {self.horas} - Salario: {self.salario} - '
                     f'Especialidad: {self.especialidad} - Antigüedad: {self.antiguedad} - '
                     f'Ambulancia: No asignada')
-
-
-# Creación de objetos de la clase Paramedico
-paramedico1 = Paramedico(
-    id='PAR001',
-    nombre='Laura',
-    apellido='Gómez',
-    edad=32,
-    genero='Femenino',
-    turno='mañana',
-    horas=36,
-    salario=1600,
-    especialidad='Emergencias',
-    antiguedad=4
-)
-
-paramedico2 = Paramedico(
-    id='PAR002',
-    nombre='Andrés',
-    apellido='Martínez',
-    edad=45,
-    genero='Masculino',
-    turno='tarde',
-    horas=40,
-    salario=1700,
-    especialidad='Traumatología',
-    antiguedad=10
-)
-
-paramedico3 = Paramedico(
-    id='PAR003',
-    nombre='Carmen',
-    apellido='López',
-    edad=29,
-    genero='Femenino',
-    turno='noche',
-    horas=38,
-    salario=1650,
-    especialidad='Cardiología',
-    antiguedad=6
-)
-
-paramedico4 = Paramedico(
-    id='PAR004',
-    nombre='Jorge',
-    apellido='Ruiz',
-    edad=39,
-    genero='Masculino',
-    turno='mañana',
-    horas=35,
-    salario=1550,
-    especialidad='Pediatría',
-    antiguedad=3
-)
-
-paramedico5 = Paramedico(
-    id='PAR005',
-    nombre='Natalia',
-    apellido='Fernández',
-    edad=41,
-    genero='Femenino',
-    turno='tarde',
-    horas=37,
-    salario=1680,
-    especialidad='Cuidados intensivos',
-    antiguedad=8
-)
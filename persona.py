@@ -1,5 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, List, Optional, Union
+
 import bcrypt as bcrypt
 
+# Factor de trabajo de bcrypt (2^rondas iteraciones). Configurable con la variable de entorno PROSALUD_BCRYPT_RONDAS.
+RONDAS_BCRYPT = int(os.environ.get('PROSALUD_BCRYPT_RONDAS', 12))
+
+# Si es True, las personas nuevas guardan la contraseña sin hashear hasta que se necesita el hash (ver hash_diferido).
+# Es una variable de contexto: activarla en un hilo (p. ej. una petición del servidor) no afecta a los demás
+_HASH_DIFERIDO: ContextVar[bool] = ContextVar('hash_diferido', default=False)
+
+
+def hashear_password(password: str, rondas: Optional[int] = None) -> bytes:
+    '''
+    Calcula el hash bcrypt de una contraseña.
+
+    Parámetros:
+    password (str): Contraseña en claro.
+    rondas (int, opcional): Factor de trabajo. Por defecto RONDAS_BCRYPT.
+
+    Devuelve:
+    bytes: Hash bcrypt de la contraseña.
+    '''
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rondas or RONDAS_BCRYPT))
+
+
+def _hashear_bloque(passwords: List[str], rondas: int) -> List[bytes]:
+    return [hashear_password(password, rondas) for password in passwords]
+
+
+def hashear_passwords(passwords: Iterable[str], rondas: Optional[int] = None, procesos: Optional[int] = None,
+                      tamaño_bloque: int = 64) -> List[bytes]:
+    '''
+    Calcula en paralelo, con un pool de procesos, el hash bcrypt de muchas contraseñas.
+
+    Parámetros:
+    passwords (Iterable[str]): Contraseñas en claro.
+    rondas (int, opcional): Factor de trabajo. Por defecto RONDAS_BCRYPT.
+    procesos (int, opcional): Número de procesos. Por defecto, uno por CPU.
+    tamaño_bloque (int, opcional): Contraseñas que se envían juntas a cada proceso. Por defecto 64.
+
+    Devuelve:
+    List[bytes]: Hashes en el mismo orden que las contraseñas.
+    '''
+    passwords = list(passwords)
+    rondas = rondas or RONDAS_BCRYPT
+    bloques = [passwords[i:i + tamaño_bloque] for i in range(0, len(passwords), tamaño_bloque)]
+    if procesos == 1 or len(bloques) <= 1:
+        return _hashear_bloque(passwords, rondas)
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        resultado: List[bytes] = []
+        for hashes in pool.map(_hashear_bloque, bloques, [rondas] * len(bloques)):
+            resultado.extend(hashes)
+    return resultado
+
+
+def hashear_pendientes(personas: Iterable['Persona'], rondas: Optional[int] = None,
+                       procesos: Optional[int] = None) -> int:
+    '''
+    Calcula en paralelo el hash de las personas creadas con hash diferido que aún no lo tienen.
+
+    Parámetros:
+    personas (Iterable[Persona]): Personas a revisar.
+    rondas (int, opcional): Factor de trabajo. Por defecto RONDAS_BCRYPT.
+    procesos (int, opcional): Número de procesos. Por defecto, uno por CPU.
+
+    Devuelve:
+    int: Número de contraseñas hasheadas.
+    '''
+    pendientes = [persona for persona in personas if persona._password_pendiente is not None]
+    hashes = hashear_passwords((persona._password_pendiente for persona in pendientes), rondas, procesos)
+    for persona, password_hash in zip(pendientes, hashes):
+        persona._password_hash = password_hash
+        persona._password_pendiente = None
+    return len(pendientes)
+
+
+@contextmanager
+def hash_diferido() -> Iterator[None]:
+    '''
+    Contexto para cargas masivas: las personas creadas dentro no calculan el hash de su contraseña al
+    construirse, sino la primera vez que se verifica la contraseña, se consulta password_hash o se
+    serializan (o todas a la vez con hashear_pendientes).
+    '''
+    token = _HASH_DIFERIDO.set(True)
+    try:
+        yield
+    finally:
+        _HASH_DIFERIDO.reset(token)
+
+
 class Persona:
     '''
     Clase que representa a una persona, con atributos básicos como id, nombre, apellido, edad, genero,
@@ -11,7 +104,7 @@ class Persona:
     apellido (str): Apellido de la persona.
     edad (int): Edad de la persona.
     genero (str): Género de la persona.
-    password_hash (str): Contraseña hasheada de la persona.
+    password_hash (bytes): Contraseña hasheada de la persona (None si no tiene contraseña).
     rol (str): Rol o puesto que ocupa la persona (por ejemplo, 'paciente', 'médico').
 
     Métodos:
@@ -20,7 +113,8 @@ class Persona:
     __str__(): Devuelve una cadena con la información básica de la persona.
     '''
 
-def __init__(self, id: str, nombre: str, apellido: str, edad: int, genero: str, rol: str, password: str):
+    def __init__(self, id: str, nombre: str, apellido: str, edad: int, genero: str, rol: Optional[str] = None,
+                 password: Optional[str] = None, password_hash: Union[bytes, str, None] = None):
         '''
         Inicializa una nueva instancia de la clase Persona.
 
@@ -30,8 +124,11 @@ def __init__(self, id: str, nombre: str, apellido: str, edad: int, genero: str,
         apellido (str): Apellido de la persona.
         edad (int): Edad de la persona.
         genero (str): Género de la persona.
-        rol (str): Rol o puesto que ocupa la persona (por ejemplo, 'paciente', 'médico').
-        password (str): Contraseña de la persona. Se guardará como hash.
+        rol (str, opcional): Rol o puesto que ocupa la persona (por ejemplo, 'paciente', 'médico').
+        password (str, opcional): Contraseña de la persona. Se guardará como hash (al momento o, dentro de
+            hash_diferido(), cuando se necesite).
+        password_hash (bytes o str, opcional): Hash bcrypt ya calculado (por ejemplo, al cargar personas de
+            una base de datos). Si se indica, no se usa password.
         '''
 
         self.id = id
@@ -39,10 +136,42 @@ def __init__(self, id: str, nombre: str, apellido: str, edad: int, genero: str,
         self.apellido = apellido
         self.edad = edad
         self.genero = genero
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        self._password_pendiente: Optional[str] = None
+        if password_hash is not None:
+            self._password_hash = password_hash.encode('utf-8') if isinstance(password_hash, str) else password_hash
+        elif password is None:
+            self._password_hash = None
+        elif _HASH_DIFERIDO.get():
+            self._password_hash = None
+            self._password_pendiente = password
+        else:
+            self._password_hash = hashear_password(password)
         self.rol = rol
 
-def a_diccionario(self) -> dict:
+    @property
+    def password_hash(self) -> Optional[bytes]:
+        '''
+        Hash bcrypt de la contraseña. Si la persona se creó con hash diferido, se calcula ahora.
+        '''
+        if self._password_pendiente is not None:
+            self._password_hash = hashear_password(self._password_pendiente)
+            self._password_pendiente = None
+        return self._password_hash
+
+    @password_hash.setter
+    def password_hash(self, valor: Union[bytes, str, None]) -> None:
+        self._password_hash = valor.encode('utf-8') if isinstance(valor, str) else valor
+        self._password_pendiente = None
+
+    def __getstate__(self) -> dict:
+        # La contraseña en claro nunca se serializa: se calcula el hash antes (y se descarta un atributo
+        # `password` que pudiera quedar de objetos antiguos)
+        self.password_hash
+        estado = self.__dict__.copy()
+        estado.pop('password', None)
+        return estado
+
+    def a_diccionario(self) -> dict:
         '''
         Convierte los atributos básicos de la persona en un diccionario.
 
@@ -57,8 +186,7 @@ def a_diccionario(self) -> dict:
             'genero': self.genero
         }
 
-def verificar_password(self, password: str) -> bool:
-
+    def verificar_password(self, password: str) -> bool:
         '''
         Verifica si la contraseña proporcionada coincide con el hash guardado.
 
@@ -68,9 +196,12 @@ def verificar_password(self, password: str) -> bool:
         Devuelve:
         bool: True si la contraseña coincide con el hash, False de lo contrario.
         '''
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash)
+        password_hash = self.password_hash
+        if password_hash is None:
+            return False
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash)
 
-def __str__(self) -> str:
+    def __str__(self) -> str:
         '''
         Devuelve una representación en cadena de la persona.
 
@@ -78,4 +209,4 @@ def __str__(self) -> str:
         str: Una cadena con la información básica de la persona.
         '''
 
-        return(f'ID: {self.id} - Nombre: {self.nombre} - Apellido {self.apellido} - Edad {self.edad} - Género {self.genero}')
\ No newline at end of file
+        return(f'ID: {self.id} - Nombre: {self.nombre} - Apellido {self.apellido} - Edad {self.edad} - Género {self.genero}')
@@ -127,13 +127,3 @@ class Provincia(Comunidad):
             if centro.nombre_centro == nombre_centro:
                 return centro
         return f'Centro {nombre_centro} no encontrado en la provincia {self.nombre_provincia}'
-
-provincia1 = Provincia(nombre_comunidad='Comunidad Valenciana', nombre_provincia='Alicante')
-provincia2 = Provincia(nombre_comunidad='Comunidad de Madrid', nombre_provincia='Madrid')
-provincia3 = Provincia(nombre_comunidad='Andalucía', nombre_provincia='Sevilla')
-provincia4 = Provincia(nombre_comunidad='Cataluña', nombre_provincia='Barcelona')
-provincia5 = Provincia(nombre_comunidad='Galicia', nombre_provincia='La Coruña')
-
-print(provincia1.obtener_info())
-print(provincia2.obtener_info())
-
@@ -3,10 +3,12 @@ Estas funciones pretenden servir para la recomendación de medicamentos a pacien
 Debemos importar las clases Paciente y Medicamento para poder comprobar correctamente la compatibilidad.
 """
 from typing import Union
+from catalogo_medicamentos import CatalogoMedicamentos
+from cribado_alergenos import CribadoAlergenos
 from medicamento import Medicamento
 from paciente import Paciente
 
-def recomendar_medicamento(paciente:Paciente , lista_medicamentos:list) -> list:
+def recomendar_medicamento(paciente:Paciente , lista_medicamentos:Union[list, CatalogoMedicamentos]) -> list:
     """
     Devuelve una lista con los medicamentos que puede tomar el paciente, teniendo en cuenta los síntomas y las alergias.
 
@@ -14,8 +16,9 @@ def recomendar_medicamento(paciente:Paciente , lista_medicamentos:list) -> list:
     -----------
     paciente: objeto Paciente
         El paciente que debe tomar el medicamento.
-    lista_medicamentos: list
-        Lista con los objetos medicamentos.
+    lista_medicamentos: Union[list, CatalogoMedicamentos]
+        Lista con los objetos medicamentos, o un CatalogoMedicamentos ya indexado (mucho más rápido con
+        catálogos grandes; el resultado es el mismo).
 
     Devuelve:
     ---------
@@ -25,9 +28,12 @@ def recomendar_medicamento(paciente:Paciente , lista_medicamentos:list) -> list:
     medicamentos_filtrados: list
         Una lista con los medicamentos filtrados según la contención de alérgenos que afecten al paciente
     """
-    sintomas_paciente = [] #Creamos esta lista para almacenar los síntomas que tiene un paciente
+    if isinstance(lista_medicamentos, CatalogoMedicamentos): #con el catálogo usamos sus índices de síntomas y alérgenos
+        return lista_medicamentos.recomendar(paciente)
+
+    sintomas_paciente = set() #Creamos este conjunto para almacenar los ids de los síntomas que tiene un paciente
     for enfermedad in paciente.enfermedades: #recorremos las enfermedades
-        sintomas_paciente.extend(enfermedad.sintomas) #y añadimos con extend los síntomas que tienen.
+        sintomas_paciente |= enfermedad.sintomas_ids #y añadimos sus síntomas ya separados y normalizados (vocabulario de sintomas.py).
 
 
     medicamentos_adecuados = [] #Creamos una lista vacía donde iremos añadiendo los medicamentos que puede tomar un paciente.
@@ -35,10 +41,8 @@ def recomendar_medicamento(paciente:Paciente , lista_medicamentos:list) -> list:
 
     if sintomas_paciente: #necesitamos que tenga síntomas el paciente, si no, no lo podemos curar
         for medicamento in lista_medicamentos: #creamos un bucle para recorrer la lista de los medicamentos que disponemos en nuestra base de datos
-            for sintoma in sintomas_paciente: #bucle que recorre la lista de síntomas que tiene un paciente
-                if sintoma in medicamento.sintomas_curables: #en caso de que el medicamento cure dicho síntoma...
-                    medicamentos_adecuados.append(medicamento) #añadimos el medicamento a nuestra lista de medicamentos adecuados
-                    break #rompemos el bucle, porque si un medicamento cura más de un síntoma, se añadirá múltiples veces a la lista
+            if not sintomas_paciente.isdisjoint(medicamento.sintomas_curables_ids): #en caso de que el medicamento cure alguno de los síntomas...
+                medicamentos_adecuados.append(medicamento) #añadimos el medicamento (una sola vez aunque cure varios síntomas)
 
         if paciente.alergias: #comprobamos si el paciente tiene o no alergias
             medicamentos_filtrados = [] #hacemos una lista vacía donde filtraremos los medicamentos con alérgenos
@@ -60,7 +64,29 @@ def recomendar_medicamento(paciente:Paciente , lista_medicamentos:list) -> list:
     else: #en caso de que el paciente esté sano, devolvemos un error
         raise ValueError('El paciente no tiene síntomas')
 
-def comprobacion_alergenos(paciente:Paciente, medicamentos:Union[list,Medicamento]) -> Union[dict, str]:
+def recomendar_medicamentos_lote(pacientes, lista_medicamentos:Union[list, CatalogoMedicamentos], procesos:int = None):
+    """
+    Recomienda medicamentos a muchos pacientes a la vez (por ejemplo, a todos los ingresados al cierre de la farmacia).
+
+    Parámetros:
+    -----------
+    pacientes: Iterable[Paciente]
+        Los pacientes (puede ser un generador).
+    lista_medicamentos: Union[list, CatalogoMedicamentos]
+        Lista con los objetos medicamentos o un CatalogoMedicamentos ya indexado.
+    procesos: int, opcional
+        Número de procesos entre los que repartir el cálculo. Por defecto se hace en este proceso.
+
+    Devuelve:
+    ---------
+    Generador de tuplas (paciente, medicamentos_adecuados) en el orden de los pacientes. Si un paciente no tiene síntomas,
+    en lugar de la lista se devuelve el ValueError correspondiente.
+    """
+    if not isinstance(lista_medicamentos, CatalogoMedicamentos): #los índices del catálogo se comparten entre todos los pacientes
+        lista_medicamentos = CatalogoMedicamentos(lista_medicamentos)
+    return lista_medicamentos.recomendar_lote(pacientes, procesos)
+
+def comprobacion_alergenos(paciente:Paciente, medicamentos:Union[list,Medicamento], cribado:CribadoAlergenos = None) -> Union[dict, str]:
     """
     Esta función sirve para comprobar de manera más sencilla si unos medicamentos que le han sido recetados a nuestro paciente
     (ya sea en nuestro centro ProSalud o en otro centro clínico ajeno) contienen alérgenos que afecten al paciente, con el objetivo de evitar
@@ -72,6 +98,9 @@ def comprobacion_alergenos(paciente:Paciente, medicamentos:Union[list,Medicament
         El paciente que debe tomar el medicamento.
     medicamentos: Union[list,Medicamento]
         Lista con los objetos medicamentos que le han recetado y/o recomendado al paciente, o un str en caso de que sea sólo un medicamento.
+    cribado: CribadoAlergenos, opcional
+        Motor de cribado con las máscaras de alérgenos del catálogo. Si se indica, la comprobación se hace con máscaras de bits
+        (mismo resultado, mucho más rápido al cribar muchos pacientes y recetas).
 
     Devuelve:
     ---------
@@ -81,6 +110,9 @@ def comprobacion_alergenos(paciente:Paciente, medicamentos:Union[list,Medicament
 
     """
 
+    if cribado is not None: #con el motor de cribado comparamos máscaras de bits en lugar de recorrer las listas
+        return cribado.comprobar(paciente, medicamentos)
+
     comprobar_alergenos = {} #diccionario vacío para poder comprobar la seguridad de los medicamentos.
     if paciente.alergias: #si el paciente tiene alergias
         if isinstance(medicamentos, Medicamento): #primero comprobamos si nos han dado el medicamento como objeto de la clase Medicamento
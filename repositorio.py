@@ -0,0 +1,433 @@
+"""
+Capa de repositorios para los registros del sistema (SIPs, pacientes, médicos, enfermeros, auxiliares).
+
+Cada repositorio se comporta como un diccionario {id: objeto}, de modo que los endpoints pueden leer y
+escribir igual que con los diccionarios en memoria, pero el almacenamiento es intercambiable:
+
+- RepositorioMemoria: un diccionario normal (sin persistencia).
+- RepositorioSQLite: una tabla SQLite en modo WAL con índices por id, username y los campos indicados, caché LRU de lectura
+  y escritura diferida (write-behind). Los objetos se cargan bajo demanda, nunca todos al arrancar.
+- RegistroDiario (diario.py): diccionario en memoria que se hace duradero con un diario de operaciones
+  y instantáneas periódicas.
+
+Todos admiten índices secundarios (por ejemplo, pacientes por estado o por médico) y `consultar`, que
+recorre los resultados en orden de id a partir de un cursor, para paginar sin cargar el registro entero.
+"""
+
+import atexit
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from diario import obtener_diario
+from indices import Extractores, IndicesSecundarios, valor_indice
+
+# Marca que indica en la cola de escritura que una clave se ha borrado
+_BORRADO = object()
+
+
+class RepositorioMemoria(MutableMapping):
+    """
+    Repositorio en memoria: un diccionario con los mismos métodos adicionales que RepositorioSQLite.
+    """
+
+    def __init__(self, indices: Optional[Extractores] = None):
+        """
+        Parámetros
+        ----------
+        indices : Dict[str, Callable], opcional
+            Índices secundarios (campo -> función que extrae el valor del objeto) para `consultar`.
+        """
+        self._datos: Dict[Any, Any] = {}
+        self._indices = IndicesSecundarios(indices or {})
+
+    def __getitem__(self, clave: Any) -> Any:
+        return self._datos[clave]
+
+    def __setitem__(self, clave: Any, objeto: Any) -> None:
+        self._datos[clave] = objeto
+        self._indices.actualizar(clave, objeto)
+
+    def __delitem__(self, clave: Any) -> None:
+        del self._datos[clave]
+        self._indices.retirar(clave)
+
+    def __contains__(self, clave: object) -> bool:
+        return clave in self._datos
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._datos)
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def registrar(self, operacion: str, clave: str, objeto: Any) -> None:
+        """
+        Guarda un objeto indicando la operación que lo modifica (solo relevante para el diario).
+        """
+        self[clave] = objeto
+
+    def buscar_por_username(self, username: str) -> Optional[Any]:
+        """
+        Devuelve el objeto con ese username, o None si no existe.
+        """
+        for objeto in self._datos.values():
+            if getattr(objeto, 'username', None) == username:
+                return objeto
+        return None
+
+    def consultar(self, filtros: Optional[Dict[str, Any]] = None, despues: Any = None,
+                  limite: Optional[int] = None) -> Iterator[Tuple[Any, Any]]:
+        """
+        Recorre en orden de clave los pares (id, objeto) que cumplen los filtros, usando los índices secundarios.
+        Ver RepositorioSQLite.consultar.
+        """
+        return ((clave, self._datos[clave])
+                for clave in islice(self._indices.consultar(filtros, despues), limite))
+
+    def sincronizar(self) -> None:
+        """
+        No hace nada: los datos en memoria no se persisten.
+        """
+
+    def cerrar(self) -> None:
+        """
+        No hace nada: no hay recursos que liberar.
+        """
+
+
+class RepositorioSQLite(MutableMapping):
+    """
+    Repositorio respaldado por una tabla SQLite.
+
+    Atributos
+    ---------
+    ruta : str
+        Ruta del fichero de la base de datos.
+    tabla : str
+        Nombre de la tabla (una por registro: pacientes, medicos, ...).
+    capacidad_cache : int
+        Número máximo de objetos que se mantienen en la caché de lectura.
+    tamaño_lote : int
+        Número de escrituras pendientes a partir del cual se vuelcan a disco en una sola transacción.
+    indices : Dict[str, Callable]
+        Índices secundarios: cada campo se guarda en una columna 'idx_<campo>' indexada junto con el id.
+
+    Notas
+    -----
+    - Las lecturas frecuentes se sirven desde la caché LRU sin tocar el disco.
+    - Las escrituras se acumulan en memoria y se vuelcan por lotes (también al llamar a `sincronizar`,
+      `cerrar` o al terminar el proceso). Si un objeto se modifica en sitio hay que volver a asignarlo
+      (`repo[id] = objeto`) para que el cambio se persista (y se actualicen los índices secundarios).
+    - Todas las consultas usan parámetros (?), por lo que sqlite3 reutiliza las sentencias preparadas.
+    """
+
+    def __init__(self, ruta: str, tabla: str, capacidad_cache: int = 10_000, tamaño_lote: int = 500,
+                 serializar: Callable[[Any], bytes] = pickle.dumps,
+                 deserializar: Callable[[bytes], Any] = pickle.loads,
+                 indices: Optional[Extractores] = None):
+        """
+        Parámetros
+        ----------
+        ruta : str
+            Ruta del fichero SQLite (se crea si no existe).
+        tabla : str
+            Nombre de la tabla; solo letras, números y guiones bajos.
+        capacidad_cache : int, opcional
+            Tamaño de la caché de lectura. Por defecto 10000.
+        tamaño_lote : int, opcional
+            Escrituras pendientes que provocan un volcado. Por defecto 500.
+        serializar / deserializar : Callable, opcional
+            Conversión objeto <-> bytes. Por defecto pickle.
+        indices : Dict[str, Callable], opcional
+            Índices secundarios (campo -> función que extrae el valor del objeto) para `consultar`.
+
+        Excepciones
+        -----------
+        ValueError
+            Si el nombre de la tabla o de algún índice no es válido.
+        """
+        for nombre in (tabla, *(indices or {})):
+            if not nombre.replace('_', '').isalnum():
+                raise ValueError(f'Nombre de tabla o índice no válido: {nombre}')
+        self.ruta = ruta
+        self.tabla = tabla
+        self.capacidad_cache = capacidad_cache
+        self.tamaño_lote = tamaño_lote
+        self._serializar = serializar
+        self._deserializar = deserializar
+        self.indices: Extractores = dict(indices or {})
+        self._cache: 'OrderedDict[str, Any]' = OrderedDict()
+        self._pendientes: Dict[str, Any] = {}
+        self._cerrojo = threading.RLock()
+        self._conexion: Optional[sqlite3.Connection] = None
+        atexit.register(self.cerrar)
+
+    # --- Conexión ---
+    def _conectar(self) -> sqlite3.Connection:
+        # La conexión se abre en el primer uso para que importar la API no toque el disco
+        if self._conexion is None:
+            conexion = sqlite3.connect(self.ruta, check_same_thread=False, cached_statements=256)
+            conexion.execute('PRAGMA journal_mode=WAL')
+            conexion.execute('PRAGMA synchronous=NORMAL')
+            conexion.execute(f'CREATE TABLE IF NOT EXISTS {self.tabla} '
+                             f'(id TEXT PRIMARY KEY, username TEXT, datos BLOB NOT NULL) WITHOUT ROWID')
+            conexion.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.tabla}_username ON {self.tabla} (username)')
+            existentes = {fila[1] for fila in conexion.execute(f'PRAGMA table_info({self.tabla})')}
+            nuevas = [campo for campo in self.indices if f'idx_{campo}' not in existentes]
+            for campo in nuevas:
+                conexion.execute(f'ALTER TABLE {self.tabla} ADD COLUMN idx_{campo} TEXT')
+            for campo in self.indices:
+                conexion.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.tabla}_{campo} ON {self.tabla} (idx_{campo}, id)')
+            if nuevas:
+                self._rellenar_indices(conexion, nuevas)
+            conexion.commit()
+            self._conexion = conexion
+        return self._conexion
+
+    def _rellenar_indices(self, conexion: sqlite3.Connection, campos: list) -> None:
+        # Migración única: calcula las columnas de índice añadidas a una tabla que ya tenía datos
+        asignaciones = ', '.join(f'idx_{campo} = ?' for campo in campos)
+        ultimo = ''
+        while True:
+            filas = conexion.execute(
+                f'SELECT id, datos FROM {self.tabla} WHERE id > ? ORDER BY id LIMIT 1000', (ultimo,)).fetchall()
+            if not filas:
+                return
+            conexion.executemany(
+                f'UPDATE {self.tabla} SET {asignaciones} WHERE id = ?',
+                [(*(valor_indice(self.indices[campo](objeto)) for campo in campos), clave)
+                 for clave, objeto in ((clave, self._deserializar(datos)) for clave, datos in filas)])
+            ultimo = filas[-1][0]
+
+    # --- Caché ---
+    def _cachear(self, clave: str, objeto: Any) -> None:
+        self._cache[clave] = objeto
+        self._cache.move_to_end(clave)
+        if len(self._cache) > self.capacidad_cache:
+            self._cache.popitem(last=False)
+
+    # --- Interfaz de diccionario ---
+    def __getitem__(self, clave: str) -> Any:
+        with self._cerrojo:
+            if clave in self._pendientes:
+                objeto = self._pendientes[clave]
+                if objeto is _BORRADO:
+                    raise KeyError(clave)
+                return objeto
+            if clave in self._cache:
+                self._cache.move_to_end(clave)
+                return self._cache[clave]
+            fila = self._conectar().execute(f'SELECT datos FROM {self.tabla} WHERE id = ?', (clave,)).fetchone()
+            if fila is None:
+                raise KeyError(clave)
+            objeto = self._deserializar(fila[0])
+            self._cachear(clave, objeto)
+            return objeto
+
+    def __setitem__(self, clave: str, objeto: Any) -> None:
+        with self._cerrojo:
+            self._pendientes[clave] = objeto
+            self._cachear(clave, objeto)
+            if len(self._pendientes) >= self.tamaño_lote:
+                self.sincronizar()
+
+    def __delitem__(self, clave: str) -> None:
+        with self._cerrojo:
+            if clave not in self:
+                raise KeyError(clave)
+            self._pendientes[clave] = _BORRADO
+            self._cache.pop(clave, None)
+            if len(self._pendientes) >= self.tamaño_lote:
+                self.sincronizar()
+
+    def __contains__(self, clave: object) -> bool:
+        with self._cerrojo:
+            if clave in self._pendientes:
+                return self._pendientes[clave] is not _BORRADO
+            if clave in self._cache:
+                return True
+            return self._conectar().execute(
+                f'SELECT 1 FROM {self.tabla} WHERE id = ?', (clave,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._cerrojo:
+            self.sincronizar()
+            return self._conectar().execute(f'SELECT COUNT(*) FROM {self.tabla}').fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        for clave, _ in self._filas(solo_claves=True):
+            yield clave
+
+    def _filas(self, solo_claves: bool = False) -> Iterator[Tuple[str, Optional[bytes]]]:
+        # Recorre la tabla por bloques ordenados por id, sin cargarla entera en memoria
+        with self._cerrojo:
+            self.sincronizar()
+        columnas = 'id' if solo_claves else 'id, datos'
+        ultimo = ''
+        while True:
+            with self._cerrojo:
+                filas = self._conectar().execute(
+                    f'SELECT {columnas} FROM {self.tabla} WHERE id > ? ORDER BY id LIMIT 1000', (ultimo,)).fetchall()
+            if not filas:
+                return
+            for fila in filas:
+                yield fila[0], (None if solo_claves else fila[1])
+            ultimo = filas[-1][0]
+
+    def values(self) -> Iterator[Any]:
+        """
+        Recorre los objetos del repositorio bajo demanda. Los que están en caché se devuelven tal cual
+        (misma instancia); el resto se deserializan sin guardarlos en caché.
+        """
+        for clave, datos in self._filas():
+            objeto = self._cache.get(clave)
+            yield objeto if objeto is not None else self._deserializar(datos)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Recorre los pares (id, objeto) bajo demanda.
+        """
+        for clave, datos in self._filas():
+            objeto = self._cache.get(clave)
+            yield clave, (objeto if objeto is not None else self._deserializar(datos))
+
+    def registrar(self, operacion: str, clave: str, objeto: Any) -> None:
+        """
+        Guarda un objeto indicando la operación que lo modifica (solo relevante para el diario).
+        """
+        self[clave] = objeto
+
+    def buscar_por_username(self, username: str) -> Optional[Any]:
+        """
+        Busca un objeto por su username usando el índice de la tabla.
+        """
+        with self._cerrojo:
+            for objeto in self._pendientes.values():
+                if objeto is not _BORRADO and getattr(objeto, 'username', None) == username:
+                    return objeto
+            fila = self._conectar().execute(
+                f'SELECT id FROM {self.tabla} WHERE username = ? LIMIT 1', (username,)).fetchone()
+        if fila is None or fila[0] in self._pendientes:
+            return None
+        return self[fila[0]]
+
+    def consultar(self, filtros: Optional[Dict[str, Any]] = None, despues: Optional[str] = None,
+                  limite: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Recorre en orden de id los pares (id, objeto) que cumplen los filtros, usando los índices de la tabla.
+        Los resultados se leen por bloques, así que se puede usar para paginar o para ir enviando la respuesta.
+
+        Parámetros
+        ----------
+        filtros : Dict[str, Any], opcional
+            Campo indexado -> valor exigido (se compara como texto).
+        despues : str, opcional
+            Cursor: solo se devuelven ids mayores que este (el último id de la página anterior).
+        limite : int, opcional
+            Número máximo de resultados. Por defecto, todos.
+
+        Excepciones
+        -----------
+        ValueError
+            Si se filtra por un campo que no está indexado.
+        """
+        filtros = filtros or {}
+        for campo in filtros:
+            if campo not in self.indices:
+                raise ValueError(f'El campo {campo} no está indexado')
+        condiciones = ''.join(f' AND idx_{campo} = ?' for campo in filtros)
+        valores = tuple(valor_indice(valor) for valor in filtros.values())
+        with self._cerrojo:
+            self.sincronizar()
+        ultimo = '' if despues is None else despues
+        restantes = limite
+        while restantes is None or restantes > 0:
+            bloque = 1000 if restantes is None else min(restantes, 1000)
+            with self._cerrojo:
+                filas = self._conectar().execute(
+                    f'SELECT id, datos FROM {self.tabla} WHERE id > ?{condiciones} ORDER BY id LIMIT ?',
+                    (ultimo, *valores, bloque)).fetchall()
+            for clave, datos in filas:
+                objeto = self._cache.get(clave)
+                yield clave, (objeto if objeto is not None else self._deserializar(datos))
+            if len(filas) < bloque:
+                return
+            ultimo = filas[-1][0]
+            if restantes is not None:
+                restantes -= len(filas)
+
+    # --- Persistencia ---
+    def sincronizar(self) -> None:
+        """
+        Vuelca a disco, en una sola transacción, todas las escrituras pendientes.
+        """
+        with self._cerrojo:
+            if not self._pendientes:
+                return
+            guardar = []
+            borrar = []
+            for clave, objeto in self._pendientes.items():
+                if objeto is _BORRADO:
+                    borrar.append((clave,))
+                else:
+                    guardar.append((clave, getattr(objeto, 'username', None), self._serializar(objeto),
+                                    *(valor_indice(extraer(objeto)) for extraer in self.indices.values())))
+            columnas = ''.join(f', idx_{campo}' for campo in self.indices)
+            marcas = ', ?' * len(self.indices)
+            conexion = self._conectar()
+            with conexion:
+                if guardar:
+                    conexion.executemany(
+                        f'INSERT OR REPLACE INTO {self.tabla} (id, username, datos{columnas}) VALUES (?, ?, ?{marcas})',
+                        guardar)
+                if borrar:
+                    conexion.executemany(f'DELETE FROM {self.tabla} WHERE id = ?', borrar)
+            self._pendientes.clear()
+
+    def cerrar(self) -> None:
+        """
+        Vuelca las escrituras pendientes y cierra la conexión.
+        """
+        with self._cerrojo:
+            if self._conexion is None and not self._pendientes:
+                return
+            self.sincronizar()
+            self._conexion.close()
+            self._conexion = None
+
+
+def crear_repositorio(tabla: str, backend: Optional[str] = None, ruta: Optional[str] = None,
+                      indices: Optional[Extractores] = None):
+    """
+    Crea el repositorio de un registro según la configuración.
+
+    Parámetros
+    ----------
+    tabla : str
+        Nombre del registro (pacientes, medicos, ...).
+    backend : str, opcional
+        'sqlite', 'diario' o 'memoria'. Por defecto, la variable de entorno PROSALUD_ALMACENAMIENTO o 'sqlite'.
+    ruta : str, opcional
+        Fichero SQLite (por defecto PROSALUD_DB o 'prosalud.db') o directorio del diario
+        (por defecto PROSALUD_DIARIO o 'prosalud_diario').
+    indices : Dict[str, Callable], opcional
+        Índices secundarios (campo -> función que extrae el valor del objeto) que usa `consultar`.
+
+    Devuelve
+    --------
+    RepositorioSQLite, RegistroDiario o RepositorioMemoria
+        Repositorio con interfaz de diccionario.
+    """
+    backend = backend or os.environ.get('PROSALUD_ALMACENAMIENTO', 'sqlite')
+    if backend == 'memoria':
+        return RepositorioMemoria(indices)
+    if backend == 'diario':
+        return obtener_diario(ruta or os.environ.get('PROSALUD_DIARIO', 'prosalud_diario')).registro(tabla, indices)
+    if backend == 'sqlite':
+        return RepositorioSQLite(ruta or os.environ.get('PROSALUD_DB', 'prosalud.db'), tabla, indices=indices)
+    raise ValueError(f'Backend de almacenamiento no válido: {backend}')
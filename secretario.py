@@ -82,7 +82,7 @@ class Secretario(Trabajador, Documento):
         departamento : str
             El departamento al que pertenece el secretario.
         '''
-        Trabajador.__init__(self, id, nombre, apellido, edad, genero, turno, horas, salario, str, str)
+        Trabajador.__init__(self, id, nombre, apellido, edad, genero, turno, horas, salario)
         Documento.__init__(self, titulo, descripcion)
         self.antiguedad = antiguedad
         self.email = email
@@ -132,85 +132,3 @@ class Secretario(Trabajador, Documento):
             Un mensaje confirmando que el correo ha sido enviado.
         '''
         return f'Correo enviado a {destinatario} con asunto "{asunto}" y mensaje: {mensaje}'
-
-# Creación de los objetos de la clase Secretario
-
-secretario1 = Secretario(
-    id='SEC001',
-    nombre='Ana',
-    apellido='González',
-    edad=28,
-    genero='Femenino',
-    turno='mañana',
-    horas=40,
-    salario=1500,
-    titulo='Licenciatura en Administración',
-    descripcion='Gestión de documentos y tareas administrativas',
-    antiguedad=3,
-    email='ana.gonzalez@empresa.com',
-    departamento='Recursos Humanos'
-)
-
-secretario2 = Secretario(
-    id='SEC002',
-    nombre='Carlos',
-    apellido='López',
-    edad=35,
-    genero='Masculino',
-    turno='tarde',
-    horas=38,
-    salario=1600,
-    titulo='Diplomado en Gestión Empresarial',
-    descripcion='Atención al cliente y gestión de correspondencia',
-    antiguedad=5,
-    email='carlos.lopez@empresa.com',
-    departamento='Atención al Cliente'
-)
-
-secretario3 = Secretario(
-    id='SEC003',
-    nombre='Beatriz',
-    apellido='Martínez',
-    edad=40,
-    genero='Femenino',
-    turno='mañana',
-    horas=36,
-    salario=1550,
-    titulo='Licenciatura en Derecho',
-    descripcion='Gestión de contratos y documentos legales',
-    antiguedad=8,
-    email='beatriz.martinez@empresa.com',
-    departamento='Legal'
-)
-
-secretario4 = Secretario(
-    id='SEC004',
-    nombre='Luis',
-    apellido='Pérez',
-    edad=30,
-    genero='Masculino',
-    turno='noche',
-    horas=40,
-    salario=1700,
-    titulo='Técnico en Administración de Empresas',
-    descripcion='Soporte administrativo y gestión de agendas',
-    antiguedad=4,
-    email='luis.perez@empresa.com',
-    departamento='Operaciones'
-)
-
-secretario5 = Secretario(
-    id='SEC005',
-    nombre='Elena',
-    apellido='Rodríguez',
-    edad=25,
-    genero='Femenino',
-    turno='tarde',
-    horas=35,
-    salario=1450,
-    titulo='Bachillerato en Ciencias Sociales',
-    descripcion='Asistencia administrativa y organización de eventos',
-    antiguedad=2,
-    email='elena.rodriguez@empresa.com',
-    departamento='Marketing'
-)
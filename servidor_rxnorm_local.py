@@ -0,0 +1,166 @@
+"""
+Servidor HTTP local que sustituye a RxNorm reproduciendo respuestas grabadas, para probar el cliente
+(cliente_rxnorm.py) y la API sin depender de la red.
+
+Las grabaciones son un JSON {nombre en minúsculas: respuesta de drugs.json}. Los nombres sin grabación
+se responden como RxNorm responde a un medicamento desconocido ({"drugGroup": {"name": ...}}).
+
+Uso:
+    python servidor_rxnorm_local.py grabar grabaciones.json ibuprofen paracetamol ...
+    python servidor_rxnorm_local.py servir grabaciones.json [puerto]
+
+Desde Python:
+    with ServidorRxNormLocal(grabaciones) as servidor:
+        cliente = ClienteRxNorm(servidor.url)
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from cliente_rxnorm import URL_RXNORM
+
+
+def grabar(nombres: Iterable[str], fichero: str, url: str = URL_RXNORM) -> Dict[str, dict]:
+    """
+    Consulta los nombres en RxNorm y guarda las respuestas en un fichero de grabaciones.
+
+    Parámetros
+    ----------
+    nombres : Iterable[str]
+        Nombres de medicamentos.
+    fichero : str
+        Fichero JSON de destino.
+    url : str, opcional
+        Endpoint drugs.json. Por defecto el de la NLM.
+
+    Devuelve
+    --------
+    Dict[str, dict]
+        Grabaciones guardadas.
+    """
+    grabaciones = {}
+    with requests.Session() as sesion:
+        for nombre in nombres:
+            clave = nombre.strip().lower()
+            respuesta = sesion.get(url, params={'name': clave}, timeout=(3.05, 10))
+            respuesta.raise_for_status()
+            grabaciones[clave] = respuesta.json()
+    with open(fichero, 'w', encoding='utf-8') as salida:
+        json.dump(grabaciones, salida, ensure_ascii=False, indent=1)
+    return grabaciones
+
+
+class ServidorRxNormLocal:
+    """
+    Servidor local con el endpoint /REST/drugs.json de RxNorm.
+
+    Atributos
+    ---------
+    grabaciones : Dict[str, dict]
+        Nombre en minúsculas -> respuesta JSON.
+    peticiones : int
+        Número de peticiones atendidas (útil para comprobar la caché del cliente).
+    url : str
+        URL del endpoint drugs.json del servidor.
+    """
+
+    def __init__(self, grabaciones: Dict[str, dict], puerto: int = 0, retardo: float = 0.0):
+        """
+        Parámetros
+        ----------
+        grabaciones : Dict[str, dict]
+            Respuestas grabadas.
+        puerto : int, opcional
+            Puerto de escucha. Por defecto 0 (uno libre cualquiera).
+        retardo : float, opcional
+            Segundos de espera antes de cada respuesta, para simular la latencia de red. Por defecto 0.
+        """
+        self.grabaciones = {clave.lower(): valor for clave, valor in grabaciones.items()}
+        self.retardo = retardo
+        self.peticiones = 0
+        self._cerrojo = threading.Lock()
+        self._servidor = ThreadingHTTPServer(('127.0.0.1', puerto), self._manejador())
+        self._servidor.daemon_threads = True
+        self._hilo: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._servidor.server_address[1]}/REST/drugs.json'
+
+    def _manejador(self):
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, como RxNorm
+
+            def do_GET(self):
+                partes = urlparse(self.path)
+                if partes.path != '/REST/drugs.json':
+                    self.send_error(404)
+                    return
+                nombre = parse_qs(partes.query).get('name', [''])[0].strip().lower()
+                with servidor._cerrojo:
+                    servidor.peticiones += 1
+                if servidor.retardo:
+                    threading.Event().wait(servidor.retardo)
+                datos = servidor.grabaciones.get(nombre, {'drugGroup': {'name': nombre or None}})
+                cuerpo = json.dumps(datos).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                pass
+
+        return Manejador
+
+    def iniciar(self) -> 'ServidorRxNormLocal':
+        """
+        Arranca el servidor en un hilo en segundo plano.
+        """
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self) -> None:
+        """
+        Detiene el servidor y libera el puerto.
+        """
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self) -> 'ServidorRxNormLocal':
+        return self.iniciar()
+
+    def __exit__(self, *excepcion) -> None:
+        self.detener()
+
+
+def main() -> None:
+    if len(sys.argv) < 3 or sys.argv[1] not in ('grabar', 'servir'):
+        print(__doc__)
+        return
+    if sys.argv[1] == 'grabar':
+        grabaciones = grabar(sys.argv[3:], sys.argv[2])
+        print(f'{len(grabaciones)} respuestas grabadas en {sys.argv[2]}')
+        return
+    with open(sys.argv[2], encoding='utf-8') as fichero:
+        grabaciones = json.load(fichero)
+    servidor = ServidorRxNormLocal(grabaciones, int(sys.argv[3]) if len(sys.argv) > 3 else 8765)
+    print(f'Sirviendo {len(grabaciones)} grabaciones en {servidor.url} (PROSALUD_RXNORM_URL)')
+    try:
+        servidor._servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor._servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Vocabulario de síntomas: convierte el texto libre de los síntomas ('Fiebre, tos, dolor de cabeza') en
+identificadores enteros internados, para que enfermedades, medicamentos y recomendador comparen síntomas
+como enteros en lugar de como texto (o, peor, carácter a carácter).
+
+- `separar_sintomas` trocea el texto por comas, punto y coma, barras, saltos de línea y las conjunciones
+  'y' / 'e'.
+- `normalizar_sintoma` quita tildes y diéresis, pasa a minúsculas y compacta los espacios, así que
+  'Dolor de  Cabeza' y 'dolor de cabeza' son el mismo síntoma.
+- `VOCABULARIO` (compartido por todo el proceso) asigna un id a cada síntoma y sabe qué enfermedades
+  tienen cada uno.
+"""
+
+import re
+import unicodedata
+import weakref
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Union
+
+_SEPARADORES = re.compile(r'[,;/\n]+|\s+[ye]\s+')
+_ESPACIOS = re.compile(r'\s+')
+_PUNTUACION = '.:¡!¿?()"\''
+
+
+@lru_cache(maxsize=4096)
+def normalizar_sintoma(sintoma: str) -> str:
+    """
+    Forma normalizada de un síntoma: sin tildes, en minúsculas, sin puntuación en los extremos y con los
+    espacios compactados.
+
+    Ejemplo
+    -------
+    >>> normalizar_sintoma('  Dolor de   CABEZA. ')
+    'dolor de cabeza'
+    """
+    descompuesto = unicodedata.normalize('NFKD', sintoma)
+    sin_tildes = ''.join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
+    return _ESPACIOS.sub(' ', sin_tildes.casefold()).strip().strip(_PUNTUACION).strip()
+
+
+def separar_sintomas(sintomas: Union[str, Iterable[str]]) -> List[str]:
+    """
+    Trocea un texto de síntomas (o una lista de textos) en síntomas normalizados, sin repetidos y en el
+    orden en que aparecen.
+
+    Ejemplo
+    -------
+    >>> separar_sintomas('Fiebre, tos y dolor de cabeza')
+    ['fiebre', 'tos', 'dolor de cabeza']
+    """
+    textos = [sintomas] if isinstance(sintomas, str) else sintomas
+    resultado = {}
+    for texto in textos:
+        for trozo in _SEPARADORES.split(texto):
+            normalizado = normalizar_sintoma(trozo)
+            if normalizado:
+                resultado[normalizado] = None
+    return list(resultado)
+
+
+class VocabularioSintomas:
+    """
+    Síntomas internados con un id entero, y el índice síntoma -> enfermedades.
+
+    Atributos
+    ---------
+    nombres : List[str]
+        Nombre normalizado de cada síntoma, por id.
+    """
+
+    def __init__(self):
+        self.nombres: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # Referencias débiles: una enfermedad que ya no se usa desaparece del índice
+        self._enfermedades: List[weakref.WeakSet] = []
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def internar(self, sintoma: str) -> int:
+        """
+        Devuelve el id de un síntoma, asignándole uno nuevo si no estaba en el vocabulario.
+        """
+        normalizado = normalizar_sintoma(sintoma)
+        id_sintoma = self._ids.get(normalizado)
+        if id_sintoma is None:
+            id_sintoma = self._ids[normalizado] = len(self.nombres)
+            self.nombres.append(normalizado)
+            self._enfermedades.append(weakref.WeakSet())
+        return id_sintoma
+
+    def id_de(self, sintoma: str) -> Optional[int]:
+        """
+        Devuelve el id de un síntoma, o None si no está en el vocabulario (no lo añade).
+        """
+        return self._ids.get(normalizar_sintoma(sintoma))
+
+    def nombre(self, id_sintoma: int) -> str:
+        """
+        Devuelve el nombre normalizado de un síntoma a partir de su id.
+        """
+        return self.nombres[id_sintoma]
+
+    def ids(self, sintomas: Union[str, Iterable[str]]) -> FrozenSet[int]:
+        """
+        Ids de los síntomas de un texto (o lista de textos), añadiendo al vocabulario los nuevos.
+        """
+        return frozenset(self.internar(sintoma) for sintoma in separar_sintomas(sintomas))
+
+    def registrar_enfermedad(self, enfermedad) -> None:
+        """
+        Añade una enfermedad (con sus `sintomas_ids`) al índice síntoma -> enfermedades.
+        """
+        for id_sintoma in enfermedad.sintomas_ids:
+            self._enfermedades[id_sintoma].add(enfermedad)
+
+    def enfermedades_con(self, sintoma: Union[str, int]) -> Set:
+        """
+        Devuelve las enfermedades que tienen un síntoma (por nombre o por id).
+        """
+        id_sintoma = self.id_de(sintoma) if isinstance(sintoma, str) else sintoma
+        if id_sintoma is None or not 0 <= id_sintoma < len(self._enfermedades):
+            return set()
+        return set(self._enfermedades[id_sintoma])
+
+
+VOCABULARIO = VocabularioSintomas()
@@ -1,3 +1,4 @@
+from typing import Union
 from persona import Persona
 
 class Trabajador(Persona):
@@ -6,7 +7,8 @@ class Trabajador(Persona):
     Contiene información sobre su turno, horas diarias y salario mensual.
     '''
 
-    def __init__(self, id: str, nombre: str, apellido: str, edad: int, genero: str, turno: str, horas: int, salario: float = 0.0, password: str = "default_password"):
+    def __init__(self, id: str, nombre: str, apellido: str, edad: int, genero: str, turno: str, horas: int, salario: float = 0.0, password: str = "default_password",
+                 password_hash: Union[bytes, str, None] = None):
         '''
         Inicializa los atributos del trabajador.
 
@@ -30,6 +32,8 @@ class Trabajador(Persona):
             Salario mensual del trabajador. Por defecto es 0.0.
         password : str, opcional
             Contraseña del trabajador. Por defecto es "default_password".
+        password_hash : bytes o str, opcional
+            Hash bcrypt ya calculado; si se indica no se vuelve a hashear la contraseña (cargas masivas).
         '''
         if not isinstance(id, str) or not id.strip():
             raise ValueError("El ID debe ser una cadena no vacía.")
@@ -50,7 +54,7 @@ class Trabajador(Persona):
         if not isinstance(password, str) or not password.strip():
             raise ValueError("La contraseña debe ser una cadena no vacía.")
 
-        super().__init__(id, nombre, apellido, edad, genero, password=password)
+        super().__init__(id, nombre, apellido, edad, genero, password=password, password_hash=password_hash)
         self.turno = turno
         self.horas = horas
         self.salario = salario
@@ -0,0 +1,190 @@
+import heapq
+import itertools
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional
+
+# Nivel de prioridad (1: alta, 2: moderada, 3: baja), tanto para Paciente.estado como para CitaUrgencias.nivel_prioridad
+NIVELES_PRIORIDAD = {
+    'grave': 1, 'alta': 1,
+    'moderado': 2, 'moderada': 2, 'media': 2,
+    'leve': 3, 'baja': 3,
+}
+PRIORIDAD_DESCONOCIDA = 4
+
+
+def nivel_prioridad(paciente, cita=None) -> int:
+    '''
+    Calcula el nivel de prioridad en urgencias a partir del estado del paciente o, si no es reconocible,
+    del nivel de prioridad de la cita de urgencias.
+
+    Parámetros
+    ----------
+    paciente : Paciente
+        Paciente que llega a urgencias.
+    cita : CitaUrgencias, opcional
+        Cita de urgencias asociada.
+
+    Devuelve
+    --------
+    int
+        1 (alta), 2 (moderada), 3 (baja) o 4 si no se puede determinar.
+    '''
+    estado = str(getattr(paciente, 'estado', '') or '').lower()
+    if estado in NIVELES_PRIORIDAD:
+        return NIVELES_PRIORIDAD[estado]
+    nivel_cita = str(getattr(cita, 'nivel_prioridad', '') or '').lower()
+    return NIVELES_PRIORIDAD.get(nivel_cita, PRIORIDAD_DESCONOCIDA)
+
+
+class EntradaTriaje:
+    '''
+    Paciente en espera dentro de la cola de triaje.
+
+    Atributos
+    ---------
+    paciente : Paciente
+        Paciente en espera.
+    cita : CitaUrgencias o None
+        Cita de urgencias asociada, si la hay.
+    prioridad : int
+        Nivel de prioridad actual (1 es la más alta).
+    llegada : datetime
+        Momento de llegada; se conserva aunque cambie la prioridad.
+    '''
+
+    __slots__ = ('paciente', 'cita', 'prioridad', 'llegada', 'orden', 'activa')
+
+    def __init__(self, paciente, cita, prioridad: int, llegada: datetime, orden: int):
+        self.paciente = paciente
+        self.cita = cita
+        self.prioridad = prioridad
+        self.llegada = llegada
+        self.orden = orden
+        self.activa = True
+
+    def __lt__(self, otra: 'EntradaTriaje') -> bool:
+        return (self.prioridad, self.llegada, self.orden) < (otra.prioridad, otra.llegada, otra.orden)
+
+    def to_dict(self) -> dict:
+        '''
+        Devuelve la entrada como diccionario serializable.
+        '''
+        return {
+            'id_paciente': self.paciente.id,
+            'nombre': getattr(self.paciente, 'nombre', None),
+            'apellido': getattr(self.paciente, 'apellido', None),
+            'estado': getattr(self.paciente, 'estado', None),
+            'prioridad': self.prioridad,
+            'llegada': self.llegada.strftime('%Y-%m-%d %H:%M:%S'),
+            'id_cita': self.cita.id_cita if self.cita is not None else None,
+        }
+
+
+class ColaTriaje:
+    '''
+    Cola de triaje de urgencias implementada con un montículo (heap) ordenado por nivel de prioridad
+    y, a igualdad de prioridad, por hora de llegada. Insertar, sacar al siguiente paciente y cambiar
+    la prioridad cuestan O(log n): al cambiar la prioridad se invalida la entrada antigua y se inserta
+    una nueva, y las entradas inválidas se descartan al llegar a la cima.
+
+    Atributos
+    ---------
+    entradas : Dict[Hashable, EntradaTriaje]
+        ID del paciente -> entrada vigente en la cola.
+    '''
+
+    def __init__(self):
+        '''
+        Inicializa una cola vacía.
+        '''
+        self._monticulo: List[EntradaTriaje] = []
+        self._contador = itertools.count()
+        self.entradas: Dict[Hashable, EntradaTriaje] = {}
+
+    def añadir(self, paciente, cita=None, llegada: Optional[datetime] = None) -> EntradaTriaje:
+        '''
+        Añade un paciente a la cola de triaje.
+
+        Parámetros
+        ----------
+        paciente : Paciente
+            Paciente que llega a urgencias.
+        cita : CitaUrgencias, opcional
+            Cita de urgencias asociada.
+        llegada : datetime, opcional
+            Hora de llegada. Por defecto, la hora de la cita o, si no hay cita, la hora actual.
+
+        Excepciones
+        -----------
+        ValueError
+            Si el paciente ya está en la cola.
+        '''
+        if paciente.id in self.entradas:
+            raise ValueError(f'El paciente {paciente.nombre} ya está en la cola de triaje')
+        if llegada is None:
+            llegada = cita.fecha_hora_dt if cita is not None else datetime.now()
+        entrada = EntradaTriaje(paciente, cita, nivel_prioridad(paciente, cita), llegada, next(self._contador))
+        self.entradas[paciente.id] = entrada
+        heapq.heappush(self._monticulo, entrada)
+        paciente.prioridad_urgencias = entrada.prioridad
+        # El paciente avisa a la cola cuando cambia de estado (ver Paciente.cambiar_estado)
+        paciente.cola_triaje = self
+        return entrada
+
+    def reprioritizar(self, paciente) -> None:
+        '''
+        Recalcula la prioridad de un paciente que ya está en la cola (por ejemplo, tras cambiar_estado).
+        Si el paciente no está en la cola no hace nada.
+        '''
+        entrada = self.entradas.get(paciente.id)
+        if entrada is None:
+            return
+        prioridad = nivel_prioridad(paciente, entrada.cita)
+        paciente.prioridad_urgencias = prioridad
+        if prioridad == entrada.prioridad:
+            return
+        entrada.activa = False
+        nueva = EntradaTriaje(paciente, entrada.cita, prioridad, entrada.llegada, entrada.orden)
+        self.entradas[paciente.id] = nueva
+        heapq.heappush(self._monticulo, nueva)
+
+    def retirar(self, paciente) -> bool:
+        '''
+        Quita a un paciente de la cola (por ejemplo, si se cancela su cita). Devuelve True si estaba en ella.
+        '''
+        entrada = self.entradas.pop(paciente.id, None)
+        if entrada is None:
+            return False
+        entrada.activa = False
+        paciente.cola_triaje = None
+        return True
+
+    def _limpiar_cima(self) -> None:
+        while self._monticulo and not self._monticulo[0].activa:
+            heapq.heappop(self._monticulo)
+
+    def siguiente(self) -> Optional[EntradaTriaje]:
+        '''
+        Devuelve la entrada del siguiente paciente que debe ser atendido sin sacarlo de la cola.
+        '''
+        self._limpiar_cima()
+        return self._monticulo[0] if self._monticulo else None
+
+    def sacar_siguiente(self) -> Optional[EntradaTriaje]:
+        '''
+        Saca de la cola al siguiente paciente que debe ser atendido y devuelve su entrada, o None si la cola está vacía.
+        '''
+        self._limpiar_cima()
+        if not self._monticulo:
+            return None
+        entrada = heapq.heappop(self._monticulo)
+        del self.entradas[entrada.paciente.id]
+        entrada.activa = False
+        entrada.paciente.cola_triaje = None
+        return entrada
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def __contains__(self, paciente) -> bool:
+        return paciente.id in self.entradas